@@ -1,677 +1,1477 @@
-import datetime
-import os
-import tkinter as tk
-from tkinter import ttk, messagebox
-from tkcalendar import Calendar
-
-# Dosya yollarını tanımla
-DATABASE_FOLDER = "database"
-USERS_FILE = os.path.join(DATABASE_FOLDER, "users.txt")
-BOOKS_FILE = os.path.join(DATABASE_FOLDER, "books.txt")
-TABLES_FILE = os.path.join(DATABASE_FOLDER, "tables.txt")
-BOOK_RESERVATIONS_FILE = os.path.join(DATABASE_FOLDER, "book_reservations.txt")
-TABLE_RESERVATIONS_FILE = os.path.join(DATABASE_FOLDER, "table_reservations.txt")
-ADMIN_CREDENTIALS = ("admin", "admin123")
-
-
-def ensure_database_folder():
-    if not os.path.exists(DATABASE_FOLDER):
-        os.makedirs(DATABASE_FOLDER)
-
-
-def initialize_files():
-    ensure_database_folder()
-    files = [
-        USERS_FILE,
-        BOOKS_FILE,
-        TABLES_FILE,
-        BOOK_RESERVATIONS_FILE,
-        TABLE_RESERVATIONS_FILE,
-    ]
-    for file_path in files:
-        if not os.path.exists(file_path):
-            with open(file_path, "w") as f:
-                pass
-
-
-def load_data(file_path, parser):
-    data = []
-    with open(file_path, "r") as f:
-        for line in f:
-            data.append(parser(line.strip()))
-    return data
-
-
-def save_data(file_path, data, formatter):
-    with open(file_path, "w") as f:
-        for item in data:
-            f.write(formatter(item) + "\n")
-
-
-# Rezervasyon çakışma kontrolleri
-def check_book_conflict(book_name, date):
-    reservations = load_data(BOOK_RESERVATIONS_FILE, lambda line: line.split(","))
-    return any(res[1] == book_name and res[2] == str(date) for res in reservations)
-
-
-def check_table_conflict(table_id, date, start_time, end_time):
-    reservations = load_data(TABLE_RESERVATIONS_FILE, lambda line: line.split(","))
-    start = datetime.datetime.strptime(start_time, "%H:%M").time()
-    end = datetime.datetime.strptime(end_time, "%H:%M").time()
-    for res in reservations:
-        if res[1] == table_id and res[2] == str(date):
-            res_start = datetime.datetime.strptime(res[3], "%H:%M").time()
-            res_end = datetime.datetime.strptime(res[4], "%H:%M").time()
-            if (start < res_end) and (end > res_start):
-                return True
-    return False
-
-
-# Rezervasyon iptali
-def cancel_reservation(file_path, reservation_data):
-    data = load_data(file_path, lambda line: line.split(","))
-    updated_data = [d for d in data if d != reservation_data]
-    save_data(file_path, updated_data, lambda x: ",".join(x))
-
-
-# Admin paneli
-def admin_panel(window):
-    def delete_item(file_path, item):
-        data = load_data(file_path, lambda line: line.split(","))
-        updated_data = [d for d in data if d != item]
-        save_data(file_path, updated_data, lambda x: ",".join(x))
-        refresh_all()
-
-    def refresh_all():
-        books = load_data(BOOKS_FILE, lambda line: line.split(","))
-        book_list.delete(0, tk.END)
-        for book in books:
-            book_list.insert(tk.END, f"{book[0]} - {book[1]}")
-
-        tables = load_data(TABLES_FILE, lambda line: line.split(","))
-        table_list.delete(0, tk.END)
-        for table in tables:
-            table_list.insert(tk.END, f"Masa {table[0]} - Kapasite: {table[1]}")
-
-        book_res = load_data(BOOK_RESERVATIONS_FILE, lambda line: line.split(","))
-        table_res = load_data(TABLE_RESERVATIONS_FILE, lambda line: line.split(","))
-        reservation_list.delete(0, tk.END)
-        for res in book_res + table_res:
-            reservation_list.insert(tk.END, " | ".join(res))
-
-    admin_window = tk.Toplevel(window)
-    admin_window.title("Admin Paneli")
-    admin_window.geometry("800x600")
-
-    notebook = ttk.Notebook(admin_window)
-    notebook.pack(fill=tk.BOTH, expand=True)
-
-    # Kitaplar sekmesi
-    book_frame = ttk.Frame(notebook)
-    book_list = tk.Listbox(book_frame)
-    book_list.pack(fill=tk.BOTH, expand=True)
-    tk.Button(
-        book_frame,
-        text="Sil",
-        command=lambda: delete_item(
-            BOOKS_FILE, book_list.get(book_list.curselection()).split(" - ")
-        ),
-    ).pack()
-    notebook.add(book_frame, text="Kitaplar")
-
-    # Masalar sekmesi
-    table_frame = ttk.Frame(notebook)
-    table_list = tk.Listbox(table_frame)
-    table_list.pack(fill=tk.BOTH, expand=True)
-    tk.Button(
-        table_frame,
-        text="Sil",
-        command=lambda: delete_item(
-            TABLES_FILE, table_list.get(table_list.curselection()).split(" - ")
-        ),
-    ).pack()
-    notebook.add(table_frame, text="Masalar")
-
-    # Rezervasyonlar sekmesi
-    res_frame = ttk.Frame(notebook)
-    reservation_list = tk.Listbox(res_frame)
-    reservation_list.pack(fill=tk.BOTH, expand=True)
-    tk.Button(
-        res_frame,
-        text="Sil",
-        command=lambda: [
-            cancel_reservation(
-                BOOK_RESERVATIONS_FILE,
-                reservation_list.get(reservation_list.curselection()).split(" | "),
-            ),
-            cancel_reservation(
-                TABLE_RESERVATIONS_FILE,
-                reservation_list.get(reservation_list.curselection()).split(" | "),
-            ),
-        ],
-    ).pack()
-    notebook.add(res_frame, text="Tüm Rezervasyonlar")
-
-    refresh_all()
-
-
-def admin_login(window):
-    def check_admin():
-        if (
-            username_entry.get() == ADMIN_CREDENTIALS[0]
-            and password_entry.get() == ADMIN_CREDENTIALS[1]
-        ):
-            admin_panel(login_window)
-            login_window.destroy()
-        else:
-            messagebox.showerror("Hata", "Geçersiz admin bilgileri!")
-
-    login_window = tk.Toplevel(window)
-    login_window.title("Admin Girişi")
-    login_window.geometry("300x150")
-
-    tk.Label(login_window, text="Kullanıcı Adı:").grid(
-        row=0, column=0, padx=10, pady=5
-    )
-    username_entry = tk.Entry(login_window)
-    username_entry.grid(row=0, column=1, padx=10, pady=5)
-
-    tk.Label(login_window, text="Şifre:").grid(row=1, column=0, padx=10, pady=5)
-    password_entry = tk.Entry(login_window, show="*")
-    password_entry.grid(row=1, column=1, padx=10, pady=5)
-
-    tk.Button(login_window, text="Giriş Yap", command=check_admin).grid(
-        row=2, column=0, columnspan=2, pady=10
-    )
-
-
-def register_user(window):
-    def register():
-        student_id = student_id_entry.get()
-        password = password_entry.get()
-        if not student_id or not password:
-            messagebox.showerror("Hata", "Öğrenci numarası ve şifre gerekli.")
-            return
-        users = load_data(USERS_FILE, lambda line: line.split(","))
-        if any(user[0] == student_id for user in users):
-            messagebox.showerror("Hata", "Kullanıcı zaten kayıtlı.")
-            return
-        users.append((student_id, password))
-        save_data(USERS_FILE, users, lambda user: ",".join(user))
-        messagebox.showinfo("Başarılı", "Kayıt başarılı.")
-        register_window.destroy()
-
-    register_window = tk.Toplevel(window)
-    register_window.title("Kaydol")
-    register_window.geometry("300x200")
-
-    tk.Label(register_window, text="Öğrenci Numarası:").grid(
-        row=0, column=0, padx=10, pady=10
-    )
-    student_id_entry = tk.Entry(register_window)
-    student_id_entry.grid(row=0, column=1, padx=10, pady=10)
-
-    tk.Label(register_window, text="Şifre:").grid(row=1, column=0, padx=10, pady=10)
-    password_entry = tk.Entry(register_window, show="*")
-    password_entry.grid(row=1, column=1, padx=10, pady=10)
-
-    tk.Button(register_window, text="Kaydol", command=register).grid(
-        row=2, column=0, columnspan=2, pady=10
-    )
-    tk.Button(
-        register_window, text="Giriş Ekranına Dön", command=register_window.destroy
-    ).grid(row=3, column=0, columnspan=2, pady=10)
-
-
-def login_user(window):
-    def login():
-        global logged_in_user
-        student_id = student_id_entry.get()
-        password = password_entry.get()
-        users = load_data(USERS_FILE, lambda line: line.split(","))
-        if any(user[0] == student_id and user[1] == password for user in users):
-            logged_in_user = student_id
-            window.destroy()
-            main_menu(tk.Tk())
-        else:
-            messagebox.showerror("Hata", "Hatalı öğrenci numarası veya şifre.")
-
-    login_window = tk.Toplevel(window)
-    login_window.title("Giriş Yap")
-    login_window.geometry("300x200")
-
-    tk.Label(login_window, text="Öğrenci Numarası:").grid(
-        row=0, column=0, padx=10, pady=10
-    )
-    student_id_entry = tk.Entry(login_window)
-    student_id_entry.grid(row=0, column=1, padx=10, pady=10)
-
-    tk.Label(login_window, text="Şifre:").grid(row=1, column=0, padx=10, pady=10)
-    password_entry = tk.Entry(login_window, show="*")
-    password_entry.grid(row=1, column=1, padx=10, pady=10)
-
-    tk.Button(login_window, text="Giriş Yap", command=login).grid(
-        row=2, column=0, columnspan=2, pady=10
-    )
-
-
-def add_book(window):
-    def add():
-        book_name = book_name_entry.get()
-        author_name = author_name_entry.get()
-        if not book_name or not author_name:
-            messagebox.showerror("Hata", "Kitap adı ve yazar adı gerekli.")
-            return
-        books = load_data(BOOKS_FILE, lambda line: line.split(","))
-        books.append((book_name, author_name))
-        save_data(BOOKS_FILE, books, lambda book: ",".join(book))
-        messagebox.showinfo("Başarılı", "Kitap başarıyla eklendi.")
-        add_book_window.destroy()
-
-    add_book_window = tk.Toplevel(window)
-    add_book_window.title("Kitap Ekle")
-    add_book_window.geometry("300x200")
-
-    tk.Label(add_book_window, text="Kitap Adı:").grid(
-        row=0, column=0, padx=10, pady=10
-    )
-    book_name_entry = tk.Entry(add_book_window)
-    book_name_entry.grid(row=0, column=1, padx=10, pady=10)
-
-    tk.Label(add_book_window, text="Yazar Adı:").grid(
-        row=1, column=0, padx=10, pady=10
-    )
-    author_name_entry = tk.Entry(add_book_window)
-    author_name_entry.grid(row=1, column=1, padx=10, pady=10)
-
-    tk.Button(add_book_window, text="Ekle", command=add).grid(
-        row=2, column=0, columnspan=2, pady=10
-    )
-
-
-def add_table(window):
-    def add():
-        capacity = capacity_entry.get()
-        if not capacity:
-            messagebox.showerror("Hata", "Masa kapasitesi gerekli.")
-            return
-        try:
-            capacity = int(capacity)
-        except ValueError:
-            messagebox.showerror("Hata", "Kapasite sayı olmalıdır.")
-            return
-        tables = load_data(TABLES_FILE, lambda line: line.split(","))
-        tables.append((len(tables) + 1, str(capacity)))
-        save_data(TABLES_FILE, tables, lambda table: ",".join(map(str, table)))
-        messagebox.showinfo("Başarılı", "Masa başarıyla eklendi.")
-        add_table_window.destroy()
-
-    add_table_window = tk.Toplevel(window)
-    add_table_window.title("Masa Ekle")
-    add_table_window.geometry("300x200")
-
-    tk.Label(add_table_window, text="Kapasite:").grid(
-        row=0, column=0, padx=10, pady=10
-    )
-    capacity_entry = tk.Entry(add_table_window)
-    capacity_entry.grid(row=0, column=1, padx=10, pady=10)
-
-    tk.Button(add_table_window, text="Ekle", command=add).grid(
-        row=1, column=0, columnspan=2, pady=10
-    )
-
-
-def book_reservation(window):
-    def select_date():
-        def on_date_selected():
-            nonlocal date_str
-            date_str = cal.get_date()
-            date_label.config(text="Seçilen Tarih: " + date_str)
-            top.destroy()
-            reserve(date_str)
-
-        top = tk.Toplevel(book_reservation_window)
-        top.title("Tarih Seç")
-        cal = Calendar(
-            top,
-            selectmode="day",
-            year=datetime.date.today().year,
-            month=datetime.date.today().month,
-            day=datetime.date.today().day,
-            mindate=datetime.date.today(),
-            maxdate=datetime.date.today() + datetime.timedelta(days=14),
-            date_pattern='dd.mm.yyyy'  # Tarih formatı burada belirlendi
-        )
-        cal.pack(pady=20)
-        tk.Button(top, text="Onayla", command=on_date_selected).pack()
-
-    def reserve(date_str):
-        try:
-            selected_index = listbox.curselection()[0]
-            selected_book = books[selected_index]
-            if check_book_conflict(selected_book[0], date_str):
-                messagebox.showerror("Hata", "Bu kitap zaten o tarihte rezerve edilmiş!")
-                return
-            # Aşağıdaki satırı düzeltin:
-            reservation_date = datetime.datetime.strptime(date_str, "%d.%m.%Y").date()
-            reservations = load_data(BOOK_RESERVATIONS_FILE, lambda line: line.split(","))
-            reservations.append((logged_in_user, selected_book[0], str(reservation_date)))
-            save_data(BOOK_RESERVATIONS_FILE, reservations, lambda res: ",".join(res))
-            messagebox.showinfo("Başarılı", "Kitap rezervasyonu başarılı.")
-            book_reservation_window.destroy()
-        except IndexError:
-            messagebox.showerror("Hata", "Lütfen bir kitap seçin.")
-
-    book_reservation_window = tk.Toplevel(window)
-    book_reservation_window.title("Kitap Rezervasyonu")
-    book_reservation_window.geometry("400x450")
-
-    books = load_data(BOOKS_FILE, lambda line: line.split(","))
-    if not books:
-        messagebox.showinfo("Bilgi", "Uygun kitap yok.")
-        book_reservation_window.destroy()
-        return
-
-    tk.Label(book_reservation_window, text="Uygun Kitaplar:").pack(pady=5)
-    listbox = tk.Listbox(book_reservation_window)
-    for book in books:
-        listbox.insert(tk.END, f"{book[0]} ({book[1]})")
-    listbox.pack(pady=5)
-
-    date_str = ""
-    date_button = tk.Button(
-        book_reservation_window, text="Tarih Seç", command=select_date
-    )
-    date_button.pack(pady=10)
-    date_label = tk.Label(book_reservation_window, text="Seçilen Tarih: ")
-    date_label.pack(pady=5)
-
-    tk.Button(
-        book_reservation_window,
-        text="Rezervasyon Yap",
-        command=lambda: reserve(date_str),
-    ).pack(pady=10)
-
-
-def table_reservation(window):
-    def select_date():
-        def on_date_selected():
-            nonlocal date_str
-            date_str = cal.get_date()
-            date_label.config(text="Seçilen Tarih: " + date_str)
-            top.destroy()
-
-        top = tk.Toplevel(table_reservation_window)
-        top.title("Tarih Seç")
-        cal = Calendar(
-            top,
-            selectmode="day",
-            year=datetime.date.today().year,
-            month=datetime.date.today().month,
-            day=datetime.date.today().day,
-            mindate=datetime.date.today(),
-            maxdate=datetime.date.today() + datetime.timedelta(days=14),
-            date_pattern='dd.mm.yyyy'  # Tarih formatı burada belirlendi
-        )
-        cal.pack(pady=20)
-        tk.Button(top, text="Onayla", command=on_date_selected).pack()
-
-    def reserve(date_str):
-        try:
-            selected_index = listbox.curselection()[0]
-            selected_table = tables[selected_index]
-            start_time = start_time_entry.get()
-            end_time = end_time_entry.get()
-            if check_table_conflict(selected_table[0], date_str, start_time, end_time):
-                messagebox.showerror(
-                    "Hata", "Bu masa zaten belirtilen saat aralığında dolu!"
-                )
-                return
-            try:
-                start_hour, start_minute = map(int, start_time.split(":"))
-                end_hour, end_minute = map(int, end_time.split(":"))
-                if not (
-                    0 <= start_hour <= 23
-                    and 0 <= start_minute <= 59
-                    and 0 <= end_hour <= 23
-                    and 0 <= end_minute <= 59
-                ):
-                    raise ValueError
-                if start_hour > end_hour or (
-                    start_hour == end_hour and start_minute >= end_minute
-                ):
-                    raise ValueError
-            except ValueError:
-                messagebox.showerror(
-                    "Hata",
-                    "Geçersiz saat formatı veya aralığı. Lütfen HH:MM formatında girin ve başlangıç saatinin bitiş saatinden önce olduğundan emin olun.",
-                )
-                return
-            reservation_date = datetime.datetime.strptime(date_str, "%d.%m.%Y").date()
-            reservations = load_data(
-                TABLE_RESERVATIONS_FILE, lambda line: line.split(",")
-            )
-            reservations.append(
-                (logged_in_user, selected_table[0], str(reservation_date), start_time, end_time)
-            )
-            save_data(
-                TABLE_RESERVATIONS_FILE, reservations, lambda res: ",".join(res)
-            )
-            messagebox.showinfo("Başarılı", "Masa rezervasyonu başarılı.")
-            table_reservation_window.destroy()
-        except IndexError:
-            messagebox.showerror("Hata", "Lütfen bir masa seçin.")
-
-    table_reservation_window = tk.Toplevel(window)
-    table_reservation_window.title("Masa Rezervasyonu")
-    table_reservation_window.geometry("400x500")
-
-    tables = load_data(TABLES_FILE, lambda line: line.split(","))
-    if not tables:
-        messagebox.showinfo("Bilgi", "Uygun masa yok.")
-        table_reservation_window.destroy()
-        return
-
-    tk.Label(table_reservation_window, text="Uygun Masalar:").pack(pady=5)
-    listbox = tk.Listbox(table_reservation_window)
-    for table in tables:
-        listbox.insert(tk.END, f"Masa {table[0]} (Kapasite: {table[1]})")
-    listbox.pack(pady=5)
-
-    date_str = ""
-    date_button = tk.Button(
-        table_reservation_window, text="Tarih Seç", command=select_date
-    )
-    date_button.pack(pady=10)
-    date_label = tk.Label(table_reservation_window, text="Seçilen Tarih: ")
-    date_label.pack(pady=5)
-
-    tk.Label(table_reservation_window, text="Başlangıç Saati (HH:MM):").pack(pady=5)
-    start_time_entry = tk.Entry(table_reservation_window)
-    start_time_entry.pack(pady=5)
-
-    tk.Label(table_reservation_window, text="Bitiş Saati (HH:MM):").pack(pady=5)
-    end_time_entry = tk.Entry(table_reservation_window)
-    end_time_entry.pack(pady=5)
-
-    tk.Button(
-        table_reservation_window,
-        text="Rezervasyon Yap",
-        command=lambda: reserve(date_str),
-    ).pack(pady=10)
-
-
-def view_book_reservations(window):
-    reservations = load_data(BOOK_RESERVATIONS_FILE, lambda line: line.split(","))
-    user_reservations = [res for res in reservations if res[0] == logged_in_user]
-    if not user_reservations:
-        messagebox.showinfo("Bilgi", "Kitap rezervasyonunuz yok.")
-        return
-
-    view_reservations_window = tk.Toplevel(window)
-    view_reservations_window.title("Kitap Rezervasyonları")
-
-    tk.Label(view_reservations_window, text="Kitap Rezervasyonlarınız:").pack(pady=5)
-    listbox = tk.Listbox(view_reservations_window)
-    for res in user_reservations:
-        listbox.insert(tk.END, f"Kitap: {res[1]}, Tarih: {res[2]}")
-    listbox.pack(pady=5)
-
-    def cancel_selected():
-        selected = listbox.curselection()
-        if selected:
-            cancel_reservation(BOOK_RESERVATIONS_FILE, user_reservations[selected[0]])
-            listbox.delete(selected[0])
-            messagebox.showinfo("Başarılı", "Rezervasyon iptal edildi.")
-
-    tk.Button(
-        view_reservations_window, text="İptal Et", command=cancel_selected
-    ).pack(pady=10)
-
-
-def view_table_reservations(window):
-    reservations = load_data(TABLE_RESERVATIONS_FILE, lambda line: line.split(","))
-    user_reservations = [res for res in reservations if res[0] == logged_in_user]
-    if not user_reservations:
-        messagebox.showinfo("Bilgi", "Masa rezervasyonunuz yok.")
-        return
-
-    view_reservations_window = tk.Toplevel(window)
-    view_reservations_window.title("Masa Rezervasyonları")
-
-    tk.Label(view_reservations_window, text="Masa Rezervasyonlarınız:").pack(pady=5)
-    listbox = tk.Listbox(view_reservations_window)
-    for res in user_reservations:
-        listbox.insert(
-            tk.END, f"Masa: {res[1]}, Tarih: {res[2]}, Saat: {res[3]}-{res[4]}"
-        )
-    listbox.pack(pady=5)
-
-    def cancel_selected():
-        selected = listbox.curselection()
-        if selected:
-            cancel_reservation(TABLE_RESERVATIONS_FILE, user_reservations[selected[0]])
-            listbox.delete(selected[0])
-            messagebox.showinfo("Başarılı", "Rezervasyon iptal edildi.")
-
-    tk.Button(
-        view_reservations_window, text="İptal Et", command=cancel_selected
-    ).pack(pady=10)
-
-
-def book_menu(window):
-    book_menu_window = tk.Toplevel(window)
-    book_menu_window.title("Kitap İşlemleri")
-
-    add_book_button = tk.Button(
-        book_menu_window, text="Kitap Ekle", command=lambda: add_book(book_menu_window)
-    )
-    add_book_button.pack(pady=10)
-
-    back_button = tk.Button(
-        book_menu_window, text="Ana Menüye Dön", command=book_menu_window.destroy
-    )
-    back_button.pack(pady=10)
-
-
-def table_menu(window):
-    table_menu_window = tk.Toplevel(window)
-    table_menu_window.title("Masa İşlemleri")
-
-    add_table_button = tk.Button(
-        table_menu_window,
-        text="Masa Ekle",
-        command=lambda: add_table(table_menu_window),
-    )
-    add_table_button.pack(pady=10)
-
-    back_button = tk.Button(
-        table_menu_window, text="Ana Menüye Dön", command=table_menu_window.destroy
-    )
-    back_button.pack(pady=10)
-
-
-def reservation_menu(window):
-    reservation_menu_window = tk.Toplevel(window)
-    reservation_menu_window.title("Rezervasyon İşlemleri")
-
-    book_reservation_button = tk.Button(
-        reservation_menu_window,
-        text="Kitap Rezervasyonu",
-        command=lambda: book_reservation(reservation_menu_window),
-    )
-    book_reservation_button.pack(pady=5)
-
-    table_reservation_button = tk.Button(
-        reservation_menu_window,
-        text="Masa Rezervasyonu",
-        command=lambda: table_reservation(reservation_menu_window),
-    )
-    table_reservation_button.pack(pady=5)
-
-    view_book_reservations_button = tk.Button(
-        reservation_menu_window,
-        text="Kitap Rezervasyonlarımı Görüntüle",
-        command=lambda: view_book_reservations(reservation_menu_window),
-    )
-    view_book_reservations_button.pack(pady=5)
-
-    view_table_reservations_button = tk.Button(
-        reservation_menu_window,
-        text="Masa Rezervasyonlarımı Görüntüle",
-        command=lambda: view_table_reservations(reservation_menu_window),
-    )
-    view_table_reservations_button.pack(pady=5)
-
-    back_button = tk.Button(
-        reservation_menu_window,
-        text="Ana Menüye Dön",
-        command=reservation_menu_window.destroy,
-    )
-    back_button.pack(pady=5)
-
-
-def main_menu(window):
-    window.title("Kütüphane Rezervasyon Sistemi")
-    window.geometry("300x400")
-    window.resizable(False, False)
-
-    if logged_in_user:
-        tk.Button(
-            window, text="Kitap İşlemleri", command=lambda: book_menu(window)
-        ).pack(pady=10)
-        tk.Button(
-            window, text="Masa İşlemleri", command=lambda: table_menu(window)
-        ).pack(pady=10)
-        tk.Button(
-            window, text="Rezervasyon", command=lambda: reservation_menu(window)
-        ).pack(pady=10)
-        tk.Button(window, text="Çıkış Yap", command=lambda: logout(window)).pack(
-            pady=10
-        )
-    else:
-        tk.Button(window, text="Kaydol", command=lambda: register_user(window)).pack(
-            pady=10
-        )
-        tk.Button(window, text="Giriş Yap", command=lambda: login_user(window)).pack(
-            pady=10
-        )
-        tk.Button(window, text="Admin Girişi", command=lambda: admin_login(window)).pack(
-            pady=10
-        )
-        tk.Button(window, text="Çıkış", command=window.destroy).pack(pady=10)
-
-
-def logout(window):
-    global logged_in_user
-    logged_in_user = None
-    window.destroy()
-    main_menu(tk.Tk())
-
-
-if __name__ == "__main__":
-    initialize_files()
-    logged_in_user = None
-    root = tk.Tk()
-    main_menu(root)
-    root.mainloop()
\ No newline at end of file
+import datetime
+import itertools
+import os
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+
+import analytics
+import events
+import metrics
+import search
+import service
+import storage
+import worker
+
+# Dosya yollarını tanımla
+DATABASE_FOLDER = "database"
+USERS_FILE = os.path.join(DATABASE_FOLDER, "users.txt")
+BOOKS_FILE = os.path.join(DATABASE_FOLDER, "books.txt")
+TABLES_FILE = os.path.join(DATABASE_FOLDER, "tables.txt")
+BOOK_RESERVATIONS_FILE = os.path.join(DATABASE_FOLDER, "book_reservations.txt")
+TABLE_RESERVATIONS_FILE = os.path.join(DATABASE_FOLDER, "table_reservations.txt")
+PAGE_SIZE = 100  # admin listelerinde sayfa başına satır
+SEARCH_LIMIT = 200  # kitap aramasında listelenecek en fazla sonuç
+
+# Depolama türü: "text" (varsayılan .txt dosyaları), "sqlite" veya "binary"
+STORAGE_BACKEND = os.environ.get("LIBRARY_STORAGE", "text")
+# Ayarlanırsa uygulama yerel veritabanı yerine bu sunucuya bağlanır
+API_URL = os.environ.get("LIBRARY_API_URL")
+
+# SQLite / ikili depo ilk kez açılıyorsa mevcut .txt verileri bir kez aktarılır
+store = storage.open_store(DATABASE_FOLDER, STORAGE_BACKEND, import_text=not API_URL)
+
+
+def open_service():
+    if API_URL:
+        import client
+
+        return client.RemoteService(API_URL)
+    return service.LibraryService(store)
+
+
+library = open_service()
+
+
+def ensure_database_folder():
+    if not os.path.exists(DATABASE_FOLDER):
+        os.makedirs(DATABASE_FOLDER)
+
+
+def initialize_files():
+    ensure_database_folder()
+    files = [
+        USERS_FILE,
+        BOOKS_FILE,
+        TABLES_FILE,
+        BOOK_RESERVATIONS_FILE,
+        TABLE_RESERVATIONS_FILE,
+    ]
+    for file_path in files:
+        if not os.path.exists(file_path):
+            with open(file_path, "w") as f:
+                pass
+
+
+def show_error(error):
+    messagebox.showerror("Hata", str(error))
+
+
+# Bugünden itibaren 14 günlük takvim. tkcalendar ağır bir modüldür;
+# açılışı yavaşlatmasın diye ilk tarih seçiminde yüklenir.
+def calendar(parent):
+    from tkcalendar import Calendar
+
+    today = datetime.date.today()
+    return Calendar(
+        parent,
+        selectmode="day",
+        year=today.year,
+        month=today.month,
+        day=today.day,
+        mindate=today,
+        maxdate=today + datetime.timedelta(days=14),
+        date_pattern="dd.mm.yyyy",  # Tarih formatı burada belirlendi
+    )
+
+
+# Açılışta depolama iş parçacığında çalışır: önbellek geçerliyse veriler
+# ondan gelir. Bakım işleri girişi bekletmesin diye burada yapılmaz.
+def warm_up():
+    store.load_cache()
+
+
+maintained = False
+
+
+# Geçmiş kovaların atılması ve eski rezervasyonların arşivlenmesi. İlk
+# başarılı girişten sonra, açılan ekranın ilk yüklemelerinin arkasına
+# kuyruklanır; süreç başına bir kez çalışır.
+def maintain(widget):
+    global maintained
+    if API_URL or maintained:
+        return
+    maintained = True
+
+    def maintenance():
+        store.evict_past()
+        library.archive_past()
+
+    worker.run(widget, maintenance, on_error=show_error)
+
+
+# Rezervasyon iptali ("book" veya "table"); kaydın son alanı kimliğidir
+def cancel_reservation(kind, reservation_data):
+    library.cancel_reservation(kind, reservation_data[-1])
+
+
+# Çakışmada öğrenciye bekleme listesini önerir; kabul ederse wait() depolama
+# iş parçacığında çalışır. Yer açılınca rezervasyon otomatik yapılır.
+def offer_waitlist(window, error, wait, on_done):
+    if not isinstance(error, service.ConflictError):
+        show_error(error)
+        return
+    if not messagebox.askyesno(
+        "Dolu",
+        f"{error}\n\nBekleme listesine eklensin mi? Yer açıldığında "
+        "rezervasyonunuz sıranızla otomatik olarak yapılır.",
+    ):
+        return
+
+    def waited(result):
+        if result["reservation"] is not None:
+            messagebox.showinfo("Başarılı", "Yer açılmış; rezervasyon yapıldı.")
+        else:
+            messagebox.showinfo("Bekleme Listesi", "Bekleme listesine eklendiniz.")
+        on_done()
+
+    worker.run_with_progress(window, wait, waited, show_error)
+
+
+# Pencere açık kaldıkça koleksiyon değişiklikleri (bu ve diğer kiosklardan)
+# on_changes'e gelir; uzak sunucuda olay yoktur, yalnızca ilk yükleme yapılır
+def watch(widget, topics, load, on_load, on_changes):
+    return worker.watch(
+        widget,
+        topics,
+        load,
+        on_load,
+        on_changes,
+        show_error,
+        poll=None if API_URL else store.poll_changes,
+    )
+
+
+# Sayfalı liste: yalnızca görünen sayfanın satırları servisten istenir.
+# Silme ve diğer kiosklardaki değişikliklerde tüm liste yeniden yüklenmez;
+# satırlar kalıcı kimlikleriyle tutulur, yalnızca ilgili satır değişir.
+def paged_list(parent, name, columns, delete):
+    def show_page():
+        worker.run_with_progress(
+            frame, lambda: library.page(name, offset, PAGE_SIZE), fill_page, show_error
+        )
+
+    def fill_page(page):
+        rows.clear()
+        tree.delete(*tree.get_children())
+        for record in page["rows"]:
+            rows[tree.insert("", tk.END, iid=record[-1], values=record)] = record
+        total[0] = page["total"]
+        update_label()
+
+    # Kendi silmemizin sonucu ve olayı ikisi de gelir; kayıt bir kez düşülür
+    def removed(record):
+        if record[-1] in gone:
+            return
+        gone.add(record[-1])
+        if tree.exists(record[-1]):
+            rows.pop(record[-1], None)
+            tree.delete(record[-1])
+        total[0] -= 1
+
+    # Yeni kayıt sona eklenir; son sayfa gösteriliyorsa ve yer varsa görünür
+    def added(record):
+        if tree.exists(record[-1]):
+            return
+        total[0] += 1
+        if offset + len(rows) == total[0] - 1 and len(rows) < PAGE_SIZE:
+            rows[tree.insert("", tk.END, iid=record[-1], values=record)] = record
+
+    def apply_changes(changes):
+        for _, op, record in changes:
+            (added if op == events.INSERT else removed)(record)
+        update_label()
+
+    def update_label():
+        last_page = max(0, total[0] - 1) // PAGE_SIZE
+        page_label.config(
+            text=f"Sayfa {offset // PAGE_SIZE + 1}/{last_page + 1} ({total[0]} kayıt)"
+        )
+
+    def move(step):
+        nonlocal offset
+        new_offset = offset + step * PAGE_SIZE
+        if 0 <= new_offset < max(total[0], 1):
+            offset = new_offset
+            show_page()
+
+    def delete_selected():
+        selected = [rows[iid] for iid in tree.selection()]
+
+        def deleted(_):
+            for record in selected:
+                removed(record)
+            update_label()
+
+        worker.run(
+            frame,
+            lambda: [delete(record) for record in selected],
+            deleted,
+            show_error,
+        )
+
+    frame = ttk.Frame(parent)
+    tree = ttk.Treeview(frame, columns=[c for c, _ in columns], show="headings")
+    for column, heading in columns:
+        tree.heading(column, text=heading)
+    scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
+    tree.configure(yscrollcommand=scrollbar.set)
+    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+    tree.pack(fill=tk.BOTH, expand=True)
+
+    controls = ttk.Frame(frame)
+    controls.pack(fill=tk.X)
+    tk.Button(controls, text="◀ Önceki", command=lambda: move(-1)).pack(side=tk.LEFT)
+    page_label = tk.Label(controls)
+    page_label.pack(side=tk.LEFT, expand=True)
+    tk.Button(controls, text="Sonraki ▶", command=lambda: move(1)).pack(side=tk.LEFT)
+    tk.Button(frame, text="Sil", command=delete_selected).pack()
+
+    rows, total, offset, gone = {}, [0], 0, set()
+    watch(
+        frame,
+        (name,),
+        lambda: library.page(name, offset, PAGE_SIZE),
+        fill_page,
+        apply_changes,
+    )
+    return frame
+
+
+# Arşivlenmiş (geçmiş) rezervasyonları tarih aralığına göre listeler
+def archive_view(parent):
+    def show():
+        kind = "book" if kind_box.get() == "Kitap" else "table"
+        date_from, date_to = from_entry.get(), to_entry.get()
+        worker.run_with_progress(
+            frame,
+            lambda: library.archived_reservations(kind, date_from, date_to, None, 1000),
+            fill,
+            show_error,
+            buttons=[show_button],
+        )
+
+    def fill(records):
+        tree.delete(*tree.get_children())
+        for record in records:
+            # Kitap kayıtlarında saat yoktur; kalıcı kimlik gösterilmez
+            values = record[:5] if len(record) > 4 else record[:3]
+            tree.insert("", tk.END, values=values)
+        count_label.config(text=f"{len(records)} kayıt (en fazla 1000 gösterilir)")
+
+    def archive_now():
+        worker.run_with_progress(
+            frame,
+            library.archive_past,
+            lambda moved: messagebox.showinfo(
+                "Arşiv",
+                f"{moved['book_reservations']} kitap ve "
+                f"{moved['table_reservations']} masa rezervasyonu arşivlendi.",
+            ),
+            show_error,
+            buttons=[archive_button],
+        )
+
+    frame = ttk.Frame(parent)
+    controls = ttk.Frame(frame)
+    controls.pack(fill=tk.X, pady=5)
+    kind_box = ttk.Combobox(
+        controls, values=("Kitap", "Masa"), state="readonly", width=8
+    )
+    kind_box.set("Kitap")
+    kind_box.pack(side=tk.LEFT, padx=5)
+    tk.Label(controls, text="Başlangıç (gg.aa.yyyy):").pack(side=tk.LEFT)
+    from_entry = tk.Entry(controls, width=12)
+    from_entry.pack(side=tk.LEFT, padx=5)
+    tk.Label(controls, text="Bitiş:").pack(side=tk.LEFT)
+    to_entry = tk.Entry(controls, width=12)
+    to_entry.pack(side=tk.LEFT, padx=5)
+    show_button = tk.Button(controls, text="Listele", command=show)
+    show_button.pack(side=tk.LEFT, padx=5)
+    archive_button = tk.Button(controls, text="Şimdi Arşivle", command=archive_now)
+    archive_button.pack(side=tk.RIGHT, padx=5)
+
+    columns = ("student", "item", "date", "start", "end")
+    tree = ttk.Treeview(frame, columns=columns, show="headings")
+    for column, heading in zip(
+        columns, ("Öğrenci", "Kitap / Masa", "Tarih", "Başlangıç", "Bitiş")
+    ):
+        tree.heading(column, text=heading)
+    scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
+    tree.configure(yscrollcommand=scrollbar.set)
+    scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+    tree.pack(fill=tk.BOTH, expand=True)
+    count_label = tk.Label(frame)
+    count_label.pack()
+    return frame
+
+
+# Pahalı sekmeler (istatistik, ölçümler) admin paneli açılırken değil,
+# sekme ilk kez gösterildiğinde yüklenir; sonrası Yenile düğmesiyle.
+# Aksi hâlde panel açmak depolama kuyruğunu kiosk işlerinin önünde tutar.
+def load_when_shown(frame, load):
+    def shown(_):
+        frame.unbind("<Map>")
+        load()
+
+    frame.bind("<Map>", shown)
+
+
+# İşlem süreleri, ret oranları, dosya boyutları ve isteğe bağlı cProfile
+def metrics_view(parent):
+    def refresh():
+        worker.run_with_progress(
+            frame, library.metrics, fill, show_error, buttons=[refresh_button]
+        )
+
+    def fill(snapshot):
+        operations.delete(*operations.get_children())
+        for name, data in snapshot["operations"].items():
+            operations.insert(
+                "",
+                tk.END,
+                values=(
+                    name,
+                    data["count"],
+                    f"{data['mean_ms']:.3f}",
+                    f"{data['rejection_rate']:.1%}",
+                ),
+            )
+        files.delete(*files.get_children())
+        for name, data in snapshot["files"].items():
+            files.insert("", tk.END, values=(name, data["bytes"], data["rows"]))
+        show_profiling(snapshot["profiling"])
+
+    def show_profiling(enabled):
+        profiling[0] = enabled
+        profile_button.config(text="Profili Durdur" if enabled else "Profili Başlat")
+
+    def toggle_profile():
+        enabled = not profiling[0]
+        worker.run_with_progress(
+            frame,
+            lambda: library.profile(enabled),
+            lambda report: profiled(enabled, report),
+            show_error,
+            buttons=[profile_button],
+        )
+
+    def profiled(enabled, report):
+        show_profiling(enabled)
+        if report:
+            output.delete("1.0", tk.END)
+            output.insert(tk.END, report)
+
+    def export():
+        path = filedialog.asksaveasfilename(
+            parent=frame,
+            defaultextension=".prom",
+            filetypes=[("Prometheus", "*.prom"), ("JSON", "*.json")],
+        )
+        if not path:
+            return
+
+        def write():
+            if path.endswith(".json"):
+                text = metrics.to_json(library.metrics())
+            else:
+                text = library.metrics_text()
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+
+        worker.run(
+            frame,
+            write,
+            lambda _: messagebox.showinfo("Ölçümler", f"Kaydedildi: {path}"),
+            show_error,
+        )
+
+    frame = ttk.Frame(parent)
+    controls = ttk.Frame(frame)
+    controls.pack(fill=tk.X, pady=5)
+    refresh_button = tk.Button(controls, text="Yenile", command=refresh)
+    refresh_button.pack(side=tk.LEFT, padx=5)
+    profile_button = tk.Button(controls, text="Profili Başlat", command=toggle_profile)
+    profile_button.pack(side=tk.LEFT, padx=5)
+    tk.Button(controls, text="Dışa Aktar", command=export).pack(side=tk.RIGHT, padx=5)
+
+    operations = ttk.Treeview(
+        frame, columns=("name", "count", "mean", "rejected"), show="headings"
+    )
+    for column, heading in zip(
+        ("name", "count", "mean", "rejected"),
+        ("İşlem", "Çağrı", "Ort. ms", "Ret / Hata"),
+    ):
+        operations.heading(column, text=heading)
+    operations.pack(fill=tk.BOTH, expand=True)
+    files = ttk.Treeview(
+        frame, columns=("name", "bytes", "rows"), show="headings", height=5
+    )
+    for column, heading in zip(("name", "bytes", "rows"), ("Dosya", "Bayt", "Satır")):
+        files.heading(column, text=heading)
+    files.pack(fill=tk.X, pady=5)
+    output = tk.Text(frame, height=10)
+    output.pack(fill=tk.X)
+
+    profiling = [False]
+    load_when_shown(frame, refresh)
+    return frame
+
+
+# Rezervasyon geçmişi (sıcak dosyalar + arşiv): en çok ayrılan kitaplar,
+# saat / gün masa doluluğu, en etkin kullanıcılar ve iptal oranları
+def analytics_view(parent):
+    def refresh():
+        worker.run_with_progress(
+            frame, library.analytics, fill, show_error, buttons=[refresh_button]
+        )
+
+    def fill(report):
+        first, last = report["period"]
+        period = f"{first} – {last}" if first else "kayıt yok"
+        summary_label.config(
+            text=(
+                f"Masa dönemi: {period}   "
+                f"Kitap: {report['totals']['book']} "
+                f"(iptal {report['cancellation_rate']['book']:.1%})   "
+                f"Masa: {report['totals']['table']} "
+                f"(iptal {report['cancellation_rate']['table']:.1%})"
+            )
+        )
+        books.delete(*books.get_children())
+        for row in report["top_books"]:
+            books.insert("", tk.END, values=row)
+        users.delete(*users.get_children())
+        for row in report["users"]:
+            users.insert("", tk.END, values=row)
+        occupancy.delete(*occupancy.get_children())
+        for day, row in zip(analytics.WEEKDAYS, report["occupancy"]):
+            occupancy.insert(
+                "", tk.END, values=[day] + [f"{value:.0%}" for value in row]
+            )
+
+    def export():
+        path = filedialog.asksaveasfilename(
+            parent=frame, defaultextension=".csv", filetypes=[("CSV", "*.csv")]
+        )
+        if not path:
+            return
+
+        def write():
+            text = library.analytics_csv()
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                f.write(text)
+
+        worker.run(
+            frame,
+            write,
+            lambda _: messagebox.showinfo("İstatistikler", f"Kaydedildi: {path}"),
+            show_error,
+        )
+
+    frame = ttk.Frame(parent)
+    controls = ttk.Frame(frame)
+    controls.pack(fill=tk.X, pady=5)
+    refresh_button = tk.Button(controls, text="Yenile", command=refresh)
+    refresh_button.pack(side=tk.LEFT, padx=5)
+    tk.Button(controls, text="CSV Dışa Aktar", command=export).pack(
+        side=tk.RIGHT, padx=5
+    )
+    summary_label = tk.Label(frame, anchor="w")
+    summary_label.pack(fill=tk.X, padx=5)
+
+    hours = [f"{hour:02d}" for hour in analytics.HOURS]
+    occupancy = ttk.Treeview(frame, columns=["day"] + hours, show="headings", height=7)
+    occupancy.heading("day", text="Gün")
+    occupancy.column("day", width=40, stretch=False)
+    for hour in hours:
+        occupancy.heading(hour, text=hour)
+        occupancy.column(hour, width=40, stretch=False, anchor="e")
+    occupancy_scroll = ttk.Scrollbar(
+        frame, orient=tk.HORIZONTAL, command=occupancy.xview
+    )
+    occupancy.configure(xscrollcommand=occupancy_scroll.set)
+    occupancy.pack(fill=tk.X, pady=(5, 0))
+    occupancy_scroll.pack(fill=tk.X)
+
+    lists = ttk.Frame(frame)
+    lists.pack(fill=tk.BOTH, expand=True, pady=5)
+    books = ttk.Treeview(lists, columns=("book", "count"), show="headings")
+    books.heading("book", text="Kitap")
+    books.heading("count", text="Rezervasyon")
+    books.column("count", width=90, anchor="e")
+    books.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+    columns = ("student", "books", "tables", "hours", "cancels")
+    users = ttk.Treeview(lists, columns=columns, show="headings")
+    for column, heading in zip(
+        columns, ("Öğrenci", "Kitap", "Masa", "Masa Saati", "İptal")
+    ):
+        users.heading(column, text=heading)
+        users.column(column, width=70, anchor="e")
+    users.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(5, 0))
+
+    load_when_shown(frame, refresh)
+    return frame
+
+
+# Admin paneli
+def admin_panel(window):
+    admin_window = tk.Toplevel(window)
+    admin_window.title("Admin Paneli")
+    admin_window.geometry("800x600")
+
+    notebook = ttk.Notebook(admin_window)
+    notebook.pack(fill=tk.BOTH, expand=True)
+
+    notebook.add(
+        paged_list(
+            notebook,
+            "books",
+            [("name", "Kitap Adı"), ("author", "Yazar")],
+            library.delete_book,
+        ),
+        text="Kitaplar",
+    )
+    notebook.add(
+        paged_list(
+            notebook,
+            "tables",
+            [("table", "Masa"), ("capacity", "Kapasite")],
+            library.delete_table,
+        ),
+        text="Masalar",
+    )
+    notebook.add(
+        paged_list(
+            notebook,
+            "book_reservations",
+            [("student", "Öğrenci"), ("book", "Kitap"), ("date", "Tarih")],
+            lambda res: cancel_reservation("book", res),
+        ),
+        text="Kitap Rezervasyonları",
+    )
+    notebook.add(
+        paged_list(
+            notebook,
+            "table_reservations",
+            [
+                ("student", "Öğrenci"),
+                ("table", "Masa"),
+                ("date", "Tarih"),
+                ("start", "Başlangıç"),
+                ("end", "Bitiş"),
+            ],
+            lambda res: cancel_reservation("table", res),
+        ),
+        text="Masa Rezervasyonları",
+    )
+    notebook.add(archive_view(notebook), text="Arşiv")
+    notebook.add(analytics_view(notebook), text="İstatistikler")
+    notebook.add(metrics_view(notebook), text="Ölçümler")
+
+
+# Admin hesapları özetli olarak database/admins.txt dosyasındadır;
+# "python security.py admin <kullanıcı>" ile eklenir / değiştirilir
+def admin_login(window):
+    def check_admin():
+        username = username_entry.get()
+        password = password_entry.get()
+        worker.run_with_progress(
+            login_window,
+            lambda: library.admin_login(username, password),
+            logged_in,
+            show_error,
+            buttons=[login_button],
+        )
+
+    def logged_in(_):
+        admin_panel(window)
+        login_window.destroy()
+        maintain(window)
+
+    login_window = tk.Toplevel(window)
+    login_window.title("Admin Girişi")
+    login_window.geometry("300x150")
+
+    tk.Label(login_window, text="Kullanıcı Adı:").grid(
+        row=0, column=0, padx=10, pady=5
+    )
+    username_entry = tk.Entry(login_window)
+    username_entry.grid(row=0, column=1, padx=10, pady=5)
+
+    tk.Label(login_window, text="Şifre:").grid(row=1, column=0, padx=10, pady=5)
+    password_entry = tk.Entry(login_window, show="*")
+    password_entry.grid(row=1, column=1, padx=10, pady=5)
+
+    login_button = tk.Button(login_window, text="Giriş Yap", command=check_admin)
+    login_button.grid(row=2, column=0, columnspan=2, pady=10)
+
+
+def register_user(window):
+    def register():
+        student_id = student_id_entry.get()
+        password = password_entry.get()
+        worker.run_with_progress(
+            register_window,
+            lambda: library.register_user(student_id, password),
+            registered,
+            show_error,
+            buttons=[register_button],
+        )
+
+    def registered(_):
+        messagebox.showinfo("Başarılı", "Kayıt başarılı.")
+        register_window.destroy()
+
+    register_window = tk.Toplevel(window)
+    register_window.title("Kaydol")
+    register_window.geometry("300x200")
+
+    tk.Label(register_window, text="Öğrenci Numarası:").grid(
+        row=0, column=0, padx=10, pady=10
+    )
+    student_id_entry = tk.Entry(register_window)
+    student_id_entry.grid(row=0, column=1, padx=10, pady=10)
+
+    tk.Label(register_window, text="Şifre:").grid(row=1, column=0, padx=10, pady=10)
+    password_entry = tk.Entry(register_window, show="*")
+    password_entry.grid(row=1, column=1, padx=10, pady=10)
+
+    register_button = tk.Button(register_window, text="Kaydol", command=register)
+    register_button.grid(row=2, column=0, columnspan=2, pady=10)
+    tk.Button(
+        register_window, text="Giriş Ekranına Dön", command=register_window.destroy
+    ).grid(row=3, column=0, columnspan=2, pady=10)
+
+
+def login_user(window):
+    def login():
+        student_id = student_id_entry.get()
+        password = password_entry.get()
+        worker.run_with_progress(
+            login_window,
+            lambda: library.login(student_id, password),
+            logged_in,
+            show_error,
+            buttons=[login_button],
+        )
+
+    def logged_in(student_id):
+        global logged_in_user
+        logged_in_user = student_id
+        window.destroy()
+        menu = tk.Tk()
+        main_menu(menu)
+        maintain(menu)
+
+    login_window = tk.Toplevel(window)
+    login_window.title("Giriş Yap")
+    login_window.geometry("300x200")
+
+    tk.Label(login_window, text="Öğrenci Numarası:").grid(
+        row=0, column=0, padx=10, pady=10
+    )
+    student_id_entry = tk.Entry(login_window)
+    student_id_entry.grid(row=0, column=1, padx=10, pady=10)
+
+    tk.Label(login_window, text="Şifre:").grid(row=1, column=0, padx=10, pady=10)
+    password_entry = tk.Entry(login_window, show="*")
+    password_entry.grid(row=1, column=1, padx=10, pady=10)
+
+    login_button = tk.Button(login_window, text="Giriş Yap", command=login)
+    login_button.grid(row=2, column=0, columnspan=2, pady=10)
+
+
+def add_book(window):
+    def add():
+        book_name = book_name_entry.get()
+        author_name = author_name_entry.get()
+        worker.run_with_progress(
+            add_book_window,
+            lambda: library.add_book(book_name, author_name),
+            added,
+            show_error,
+            buttons=[add_button],
+        )
+
+    def added(_):
+        messagebox.showinfo("Başarılı", "Kitap başarıyla eklendi.")
+        add_book_window.destroy()
+
+    add_book_window = tk.Toplevel(window)
+    add_book_window.title("Kitap Ekle")
+    add_book_window.geometry("300x200")
+
+    tk.Label(add_book_window, text="Kitap Adı:").grid(
+        row=0, column=0, padx=10, pady=10
+    )
+    book_name_entry = tk.Entry(add_book_window)
+    book_name_entry.grid(row=0, column=1, padx=10, pady=10)
+
+    tk.Label(add_book_window, text="Yazar Adı:").grid(
+        row=1, column=0, padx=10, pady=10
+    )
+    author_name_entry = tk.Entry(add_book_window)
+    author_name_entry.grid(row=1, column=1, padx=10, pady=10)
+
+    add_button = tk.Button(add_book_window, text="Ekle", command=add)
+    add_button.grid(row=2, column=0, columnspan=2, pady=10)
+
+
+def add_table(window):
+    def add():
+        capacity = capacity_entry.get()
+        worker.run_with_progress(
+            add_table_window,
+            lambda: library.add_table(capacity),
+            added,
+            show_error,
+            buttons=[add_button],
+        )
+
+    def added(_):
+        messagebox.showinfo("Başarılı", "Masa başarıyla eklendi.")
+        add_table_window.destroy()
+
+    add_table_window = tk.Toplevel(window)
+    add_table_window.title("Masa Ekle")
+    add_table_window.geometry("300x200")
+
+    tk.Label(add_table_window, text="Kapasite:").grid(
+        row=0, column=0, padx=10, pady=10
+    )
+    capacity_entry = tk.Entry(add_table_window)
+    capacity_entry.grid(row=0, column=1, padx=10, pady=10)
+
+    add_button = tk.Button(add_table_window, text="Ekle", command=add)
+    add_button.grid(row=1, column=0, columnspan=2, pady=10)
+
+
+def book_reservation(window):
+    def select_date():
+        def on_date_selected():
+            nonlocal date_str
+            date_str = cal.get_date()
+            date_label.config(text="Seçilen Tarih: " + date_str)
+            top.destroy()
+            reserve(date_str)
+
+        top = tk.Toplevel(book_reservation_window)
+        top.title("Tarih Seç")
+        cal = calendar(top)
+        cal.pack(pady=20)
+        tk.Button(top, text="Onayla", command=on_date_selected).pack()
+
+    def reserve(date_str):
+        selected = listbox.curselection()
+        if not selected:
+            messagebox.showerror("Hata", "Lütfen bir kitap seçin.")
+            return
+        selected_book = books[selected[0]]
+        # Kontrol ve kayıt diğer kiosklara karşı tek adımda yapılır
+        worker.run_with_progress(
+            book_reservation_window,
+            lambda: library.reserve_book(logged_in_user, selected_book[0], date_str),
+            reserved,
+            lambda error: offer_waitlist(
+                book_reservation_window,
+                error,
+                lambda: library.wait_for_book(
+                    logged_in_user, selected_book[0], date_str
+                ),
+                book_reservation_window.destroy,
+            ),
+            buttons=[reserve_button],
+        )
+
+    def reserved(_):
+        messagebox.showinfo("Başarılı", "Kitap rezervasyonu başarılı.")
+        book_reservation_window.destroy()
+
+    # Yazarken arama; yalnızca son sorgunun sonucu listeye yansır
+    def search(event=None):
+        nonlocal query
+        query = search_entry.get()
+        current = query
+        worker.run(
+            book_reservation_window,
+            lambda: library.search_books(current, SEARCH_LIMIT),
+            lambda result: show_books(current, result),
+            show_error,
+        )
+
+    def show_books(current, result):
+        nonlocal total
+        if current != query:
+            return
+        books[:] = result["rows"]
+        total = result["total"]
+        listbox.delete(0, tk.END)
+        for book in books:
+            listbox.insert(tk.END, f"{book[0]} ({book[1]})")
+        update_count()
+
+    def update_count():
+        count_label.config(text=f"Bulunan: {total} (gösterilen {len(books)})")
+
+    def first_page(loaded):
+        current, result = loaded
+        if not result["total"] and not current:
+            messagebox.showinfo("Bilgi", "Uygun kitap yok.")
+            book_reservation_window.destroy()
+            return
+        show_books(current, result)
+
+    # Eklenen / silinen kitaplar yalnızca sorguya uyuyorsa listeye yansır
+    def apply_changes(changes):
+        nonlocal total
+        for _, op, book in changes:
+            if not search.matches(query, book):
+                continue
+            if op == events.INSERT:
+                total += 1
+                if len(books) < SEARCH_LIMIT:
+                    books.append(book)
+                    listbox.insert(tk.END, f"{book[0]} ({book[1]})")
+            else:
+                total -= 1
+                if book in books:
+                    listbox.delete(books.index(book))
+                    books.remove(book)
+        update_count()
+
+    book_reservation_window = tk.Toplevel(window)
+    book_reservation_window.title("Kitap Rezervasyonu")
+    book_reservation_window.geometry("400x520")
+
+    books = []
+    query, total = "", 0
+    tk.Label(book_reservation_window, text="Kitap veya Yazar Ara:").pack(pady=5)
+    search_entry = tk.Entry(book_reservation_window, width=40)
+    search_entry.pack(pady=5)
+    search_entry.bind("<KeyRelease>", search)
+    tk.Label(book_reservation_window, text="Uygun Kitaplar:").pack(pady=5)
+    listbox = tk.Listbox(book_reservation_window, width=50, exportselection=False)
+    listbox.pack(pady=5)
+    count_label = tk.Label(book_reservation_window, text="")
+    count_label.pack()
+
+    date_str = ""
+    date_button = tk.Button(
+        book_reservation_window, text="Tarih Seç", command=select_date
+    )
+    date_button.pack(pady=10)
+    date_label = tk.Label(book_reservation_window, text="Seçilen Tarih: ")
+    date_label.pack(pady=5)
+
+    reserve_button = tk.Button(
+        book_reservation_window,
+        text="Rezervasyon Yap",
+        command=lambda: reserve(date_str),
+    )
+    reserve_button.pack(pady=10)
+
+    watch(
+        book_reservation_window,
+        ("books",),
+        lambda: (query, library.search_books(query, SEARCH_LIMIT)),
+        first_page,
+        apply_changes,
+    )
+    search_entry.focus_set()
+
+
+# Günlük doluluk ısı haritası: satırlar masalar, sütunlar zaman dilimleri.
+# Ardışık aynı durumdaki dilimler tek dikdörtgen olarak çizilir.
+def draw_heatmap(canvas, availability, on_click):
+    canvas.delete("all")
+    cell, row_height, left, top = 3, 14, 70, 16
+    per_hour = 60 // availability["slot_minutes"]
+    for hour in range(0, 24, 2):
+        x = left + hour * per_hour * cell
+        canvas.create_text(x, 8, text=f"{hour:02d}", anchor="w", font=("Arial", 7))
+    for row, (table_id, capacity, busy) in enumerate(availability["rows"]):
+        y = top + row * row_height
+        tag = f"table-{table_id}"
+        canvas.create_text(
+            2,
+            y + row_height / 2,
+            text=f"Masa {table_id} ({capacity})",
+            anchor="w",
+            font=("Arial", 8),
+            tags=tag,
+        )
+        slot = 0
+        for state, run in itertools.groupby(busy):
+            length = len(list(run))
+            canvas.create_rectangle(
+                left + slot * cell,
+                y,
+                left + (slot + length) * cell,
+                y + row_height - 2,
+                fill="#e57373" if state == "1" else "#81c784",
+                outline="",
+                tags=tag,
+            )
+            slot += length
+        canvas.tag_bind(tag, "<Button-1>", lambda event, t=table_id: on_click(t))
+    width = left + 24 * per_hour * cell
+    canvas.config(scrollregion=(0, 0, width, top + len(availability["rows"]) * row_height))
+
+
+def table_reservation(window):
+    def select_date():
+        def on_date_selected():
+            nonlocal date_str
+            date_str = cal.get_date()
+            date_label.config(text="Seçilen Tarih: " + date_str)
+            top.destroy()
+            show_free_slots()
+            show_heatmap()
+
+        top = tk.Toplevel(table_reservation_window)
+        top.title("Tarih Seç")
+        cal = calendar(top)
+        cal.pack(pady=20)
+        tk.Button(top, text="Onayla", command=on_date_selected).pack()
+
+    def reserve(date_str):
+        selected = listbox.curselection()
+        if not selected:
+            messagebox.showerror("Hata", "Lütfen bir masa seçin.")
+            return
+        selected_table = tables[selected[0]]
+        start_time = start_time_entry.get()
+        end_time = end_time_entry.get()
+        days = int(days_spinbox.get())
+        if days == 1:
+            slot = (selected_table[0], date_str, start_time, end_time)
+            worker.run_with_progress(
+                table_reservation_window,
+                lambda: library.reserve_table(logged_in_user, *slot),
+                reserved,
+                lambda error: offer_waitlist(
+                    table_reservation_window,
+                    error,
+                    lambda: library.wait_for_table(logged_in_user, *slot),
+                    table_reservation_window.destroy,
+                ),
+                buttons=[reserve_button],
+            )
+            return
+        if not date_str:
+            messagebox.showerror("Hata", "Lütfen bir tarih seçin.")
+            return
+        # Seçilen günden başlayarak art arda günler (takvim sınırı 14 gün)
+        first = datetime.datetime.strptime(date_str, "%d.%m.%Y").date()
+        last = datetime.date.today() + datetime.timedelta(days=14)
+        items = [
+            (selected_table[0], day.strftime("%d.%m.%Y"), start_time, end_time)
+            for day in (first + datetime.timedelta(days=i) for i in range(days))
+            if day <= last
+        ]
+        worker.run_with_progress(
+            table_reservation_window,
+            lambda: library.reserve_batch(logged_in_user, "table", items),
+            lambda result: batch_reserved(items, result),
+            show_error,
+            buttons=[reserve_button],
+        )
+
+    def reserved(_):
+        messagebox.showinfo("Başarılı", "Masa rezervasyonu başarılı.")
+        table_reservation_window.destroy()
+
+    def batch_reserved(items, result):
+        if result["conflicts"]:
+            dates = ", ".join(items[i][1] for i in result["conflicts"])
+            messagebox.showerror(
+                "Hata", f"Masa şu tarihlerde dolu, hiçbir rezervasyon yapılmadı: {dates}"
+            )
+            return
+        messagebox.showinfo(
+            "Başarılı", f"{len(result['reservations'])} günlük masa rezervasyonu başarılı."
+        )
+        table_reservation_window.destroy()
+
+    # Seçili masanın seçili tarihteki boş saatlerini göster
+    def show_free_slots(event=None):
+        selected = listbox.curselection()
+        if not selected or not date_str:
+            return
+        table_id, date = tables[selected[0]][0], date_str
+        worker.run(
+            table_reservation_window,
+            lambda: library.free_table_slots(table_id, date),
+            lambda slots: free_label.config(
+                text="Boş Saatler: "
+                + (", ".join(f"{start}-{end}" for start, end in slots) or "Yok")
+            ),
+            show_error,
+        )
+
+    def show_heatmap():
+        date = date_str
+        worker.run(
+            table_reservation_window,
+            lambda: library.table_availability(date),
+            lambda result: draw_heatmap(heatmap, result, select_table),
+            show_error,
+        )
+
+    # Isı haritasında tıklanan masayı listede seç
+    def select_table(table_id):
+        for i, table in enumerate(tables):
+            if table[0] == table_id:
+                listbox.selection_clear(0, tk.END)
+                listbox.selection_set(i)
+                listbox.see(i)
+                show_free_slots()
+                return
+
+    # Seçili gün ve saat aralığında boş, yeterli kapasiteli masaları listele
+    def find_free_tables():
+        if not date_str:
+            messagebox.showerror("Hata", "Lütfen bir tarih seçin.")
+            return
+        date, capacity = date_str, capacity_spinbox.get()
+        start_time, end_time = start_time_entry.get(), end_time_entry.get()
+        worker.run_with_progress(
+            table_reservation_window,
+            lambda: library.free_tables(date, start_time, end_time, capacity),
+            show_free_tables,
+            show_error,
+            buttons=[find_button],
+        )
+
+    # Masayı sistem seçer: kişi sayısına yeten en küçük boş masa ayrılır
+    def reserve_best():
+        if not date_str:
+            messagebox.showerror("Hata", "Lütfen bir tarih seçin.")
+            return
+        date, group_size = date_str, capacity_spinbox.get()
+        start_time, end_time = start_time_entry.get(), end_time_entry.get()
+        worker.run_with_progress(
+            table_reservation_window,
+            lambda: library.reserve_best_table(
+                logged_in_user, date, start_time, end_time, group_size
+            ),
+            best_reserved,
+            show_error,
+            buttons=[best_button, reserve_button],
+        )
+
+    def best_reserved(reservation):
+        messagebox.showinfo("Başarılı", f"Masa {reservation[1]} sizin için ayrıldı.")
+        table_reservation_window.destroy()
+
+    def show_free_tables(free_ids):
+        nonlocal filtered
+        free = set(free_ids)
+        shown = [table for table in all_tables if table[0] in free]
+        if not shown:
+            messagebox.showinfo("Bilgi", "Bu saat aralığında uygun masa yok.")
+        fill_tables(shown)
+        filtered = True
+
+    def describe(table):
+        return f"Masa {table[0]} (Kapasite: {table[1]})"
+
+    def fill_tables(rows):
+        tables[:] = rows
+        listbox.delete(0, tk.END)
+        for table in tables:
+            listbox.insert(tk.END, describe(table))
+
+    def show_tables(loaded):
+        nonlocal filtered
+        if not loaded and not all_tables:
+            messagebox.showinfo("Bilgi", "Uygun masa yok.")
+            table_reservation_window.destroy()
+            return
+        all_tables[:] = loaded
+        fill_tables(loaded)
+        filtered = False
+        if date_str:
+            show_heatmap()
+            show_free_slots()
+
+    # Masa listesi satır satır güncellenir; seçili gün etkilendiyse ısı
+    # haritası ve boş saatler yeniden istenir. Süzülmüş listeye ("Boş
+    # Masaları Bul") yeni masa eklenmez, silinen masa ise her yerden kalkar.
+    def apply_changes(changes):
+        day = storage.normalize_date(date_str) if date_str else None
+        redraw = False
+        for topic, op, record in changes:
+            if topic == "table_reservations":
+                redraw = redraw or record[2] == day
+                continue
+            redraw = redraw or day is not None
+            if op == events.INSERT:
+                all_tables.append(record)
+                if not filtered:
+                    tables.append(record)
+                    listbox.insert(tk.END, describe(record))
+            else:
+                if record in all_tables:
+                    all_tables.remove(record)
+                if record in tables:
+                    listbox.delete(tables.index(record))
+                    tables.remove(record)
+        if redraw:
+            show_heatmap()
+            show_free_slots()
+
+    table_reservation_window = tk.Toplevel(window)
+    table_reservation_window.title("Masa Rezervasyonu")
+    table_reservation_window.geometry("840x640")
+
+    # Sağda seçili günün ısı haritası (kırmızı: dolu, yeşil: boş)
+    heatmap_frame = tk.Frame(table_reservation_window)
+    heatmap_frame.pack(side=tk.RIGHT, fill=tk.Y, padx=5, pady=5)
+    tk.Label(heatmap_frame, text="Günlük Doluluk (tıklayarak masa seçin):").pack()
+    heatmap_scroll = tk.Scrollbar(heatmap_frame, orient=tk.VERTICAL)
+    heatmap_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+    heatmap = tk.Canvas(
+        heatmap_frame, width=370, bg="white", yscrollcommand=heatmap_scroll.set
+    )
+    heatmap.pack(side=tk.LEFT, fill=tk.Y, expand=True)
+    heatmap_scroll.config(command=heatmap.yview)
+
+    tables = []  # listede gösterilen masalar
+    all_tables = []
+    filtered = False  # liste boş masalara göre süzüldü mü
+    tk.Label(table_reservation_window, text="Uygun Masalar:").pack(pady=5)
+    listbox = tk.Listbox(table_reservation_window, exportselection=False)
+    listbox.pack(pady=5)
+    listbox.bind("<<ListboxSelect>>", show_free_slots)
+
+    date_str = ""
+    date_button = tk.Button(
+        table_reservation_window, text="Tarih Seç", command=select_date
+    )
+    date_button.pack(pady=10)
+    date_label = tk.Label(table_reservation_window, text="Seçilen Tarih: ")
+    date_label.pack(pady=5)
+    free_label = tk.Label(table_reservation_window, text="Boş Saatler: ", wraplength=380)
+    free_label.pack(pady=5)
+
+    tk.Label(table_reservation_window, text="Başlangıç Saati (HH:MM):").pack(pady=5)
+    start_time_entry = tk.Entry(table_reservation_window)
+    start_time_entry.pack(pady=5)
+
+    tk.Label(table_reservation_window, text="Bitiş Saati (HH:MM):").pack(pady=5)
+    end_time_entry = tk.Entry(table_reservation_window)
+    end_time_entry.pack(pady=5)
+
+    capacity_frame = tk.Frame(table_reservation_window)
+    capacity_frame.pack(pady=5)
+    tk.Label(capacity_frame, text="Kişi Sayısı:").pack(side=tk.LEFT)
+    capacity_spinbox = tk.Spinbox(
+        capacity_frame, from_=1, to=20, width=5, state="readonly"
+    )
+    capacity_spinbox.pack(side=tk.LEFT, padx=5)
+    find_button = tk.Button(
+        capacity_frame, text="Boş Masaları Bul", command=find_free_tables
+    )
+    find_button.pack(side=tk.LEFT)
+    best_button = tk.Button(
+        capacity_frame, text="En Uygun Masayı Ayır", command=reserve_best
+    )
+    best_button.pack(side=tk.LEFT, padx=5)
+
+    tk.Label(table_reservation_window, text="Kaç Gün (art arda):").pack(pady=5)
+    days_spinbox = tk.Spinbox(
+        table_reservation_window, from_=1, to=15, width=5, state="readonly"
+    )
+    days_spinbox.pack(pady=5)
+
+    reserve_button = tk.Button(
+        table_reservation_window,
+        text="Rezervasyon Yap",
+        command=lambda: reserve(date_str),
+    )
+    reserve_button.pack(pady=10)
+
+    watch(
+        table_reservation_window,
+        ("tables", "table_reservations"),
+        library.list_tables,
+        show_tables,
+        apply_changes,
+    )
+
+
+# Kullanıcının rezervasyonlarını listeleyen ve iptal ettiren pencere.
+# Başka bir kioskta yapılan rezervasyon ve iptaller listeye satır olarak
+# eklenir / listeden kalkar. waiting: rezervasyonlar yerine bekleme kayıtları.
+def view_reservations(
+    window, kind, title, empty_message, format_reservation, waiting=False
+):
+    if waiting:
+        topic, load, cancel = (
+            f"{kind}_waitlist",
+            library.user_waitlist,
+            lambda kind, entry: library.leave_waitlist(kind, entry[-1]),
+        )
+    else:
+        topic, load, cancel = (
+            f"{kind}_reservations",
+            library.user_reservations,
+            cancel_reservation,
+        )
+
+    def show(loaded):
+        if not loaded and not user_reservations:
+            messagebox.showinfo("Bilgi", empty_message)
+            view_reservations_window.destroy()
+            return
+        user_reservations[:] = loaded
+        listbox.delete(0, tk.END)
+        for res in user_reservations:
+            listbox.insert(tk.END, format_reservation(res))
+
+    def cancel_selected():
+        selected = listbox.curselection()
+        if not selected:
+            return
+        reservation = user_reservations[selected[0]]
+        worker.run_with_progress(
+            view_reservations_window,
+            lambda: cancel(kind, reservation),
+            lambda _: cancelled(reservation),
+            show_error,
+            buttons=[cancel_button],
+        )
+
+    # İptal olayı sonuçtan önce gelmiş olabilir; satır yalnızca bir kez silinir
+    def removed(reservation):
+        if reservation in user_reservations:
+            listbox.delete(user_reservations.index(reservation))
+            user_reservations.remove(reservation)
+
+    def cancelled(reservation):
+        removed(reservation)
+        messagebox.showinfo("Başarılı", "Rezervasyon iptal edildi.")
+
+    def apply_changes(changes):
+        for _, op, res in changes:
+            if res[0] != student_id:
+                continue
+            if op == events.INSERT:
+                user_reservations.append(res)
+                listbox.insert(tk.END, format_reservation(res))
+            else:
+                removed(res)
+
+    view_reservations_window = tk.Toplevel(window)
+    view_reservations_window.title(title)
+
+    tk.Label(view_reservations_window, text=title + "nız:").pack(pady=5)
+    listbox = tk.Listbox(view_reservations_window)
+    listbox.pack(pady=5)
+
+    cancel_button = tk.Button(
+        view_reservations_window, text="İptal Et", command=cancel_selected
+    )
+    cancel_button.pack(pady=10)
+
+    user_reservations = []
+    student_id = logged_in_user
+    watch(
+        view_reservations_window,
+        (topic,),
+        lambda: list(load(kind, student_id)),
+        show,
+        apply_changes,
+    )
+
+
+def view_book_reservations(window):
+    view_reservations(
+        window,
+        "book",
+        "Kitap Rezervasyonları",
+        "Kitap rezervasyonunuz yok.",
+        lambda res: f"Kitap: {res[1]}, Tarih: {res[2]}",
+    )
+
+
+def view_table_reservations(window):
+    view_reservations(
+        window,
+        "table",
+        "Masa Rezervasyonları",
+        "Masa rezervasyonunuz yok.",
+        lambda res: f"Masa: {res[1]}, Tarih: {res[2]}, Saat: {res[3]}-{res[4]}",
+    )
+
+
+def view_book_waitlist(window):
+    view_reservations(
+        window,
+        "book",
+        "Kitap Bekleme Kayıtları",
+        "Bekleme listesinde kitabınız yok.",
+        lambda res: f"Kitap: {res[1]}, Tarih: {res[2]}",
+        waiting=True,
+    )
+
+
+def view_table_waitlist(window):
+    view_reservations(
+        window,
+        "table",
+        "Masa Bekleme Kayıtları",
+        "Bekleme listesinde masanız yok.",
+        lambda res: f"Masa: {res[1]}, Tarih: {res[2]}, Saat: {res[3]}-{res[4]}",
+        waiting=True,
+    )
+
+
+def book_menu(window):
+    book_menu_window = tk.Toplevel(window)
+    book_menu_window.title("Kitap İşlemleri")
+
+    add_book_button = tk.Button(
+        book_menu_window, text="Kitap Ekle", command=lambda: add_book(book_menu_window)
+    )
+    add_book_button.pack(pady=10)
+
+    back_button = tk.Button(
+        book_menu_window, text="Ana Menüye Dön", command=book_menu_window.destroy
+    )
+    back_button.pack(pady=10)
+
+
+def table_menu(window):
+    table_menu_window = tk.Toplevel(window)
+    table_menu_window.title("Masa İşlemleri")
+
+    add_table_button = tk.Button(
+        table_menu_window,
+        text="Masa Ekle",
+        command=lambda: add_table(table_menu_window),
+    )
+    add_table_button.pack(pady=10)
+
+    back_button = tk.Button(
+        table_menu_window, text="Ana Menüye Dön", command=table_menu_window.destroy
+    )
+    back_button.pack(pady=10)
+
+
+def reservation_menu(window):
+    reservation_menu_window = tk.Toplevel(window)
+    reservation_menu_window.title("Rezervasyon İşlemleri")
+
+    book_reservation_button = tk.Button(
+        reservation_menu_window,
+        text="Kitap Rezervasyonu",
+        command=lambda: book_reservation(reservation_menu_window),
+    )
+    book_reservation_button.pack(pady=5)
+
+    table_reservation_button = tk.Button(
+        reservation_menu_window,
+        text="Masa Rezervasyonu",
+        command=lambda: table_reservation(reservation_menu_window),
+    )
+    table_reservation_button.pack(pady=5)
+
+    view_book_reservations_button = tk.Button(
+        reservation_menu_window,
+        text="Kitap Rezervasyonlarımı Görüntüle",
+        command=lambda: view_book_reservations(reservation_menu_window),
+    )
+    view_book_reservations_button.pack(pady=5)
+
+    view_table_reservations_button = tk.Button(
+        reservation_menu_window,
+        text="Masa Rezervasyonlarımı Görüntüle",
+        command=lambda: view_table_reservations(reservation_menu_window),
+    )
+    view_table_reservations_button.pack(pady=5)
+
+    tk.Button(
+        reservation_menu_window,
+        text="Kitap Bekleme Listem",
+        command=lambda: view_book_waitlist(reservation_menu_window),
+    ).pack(pady=5)
+    tk.Button(
+        reservation_menu_window,
+        text="Masa Bekleme Listem",
+        command=lambda: view_table_waitlist(reservation_menu_window),
+    ).pack(pady=5)
+
+    back_button = tk.Button(
+        reservation_menu_window,
+        text="Ana Menüye Dön",
+        command=reservation_menu_window.destroy,
+    )
+    back_button.pack(pady=5)
+
+
+def main_menu(window):
+    window.title("Kütüphane Rezervasyon Sistemi")
+    window.geometry("300x400")
+    window.resizable(False, False)
+
+    if logged_in_user:
+        tk.Button(
+            window, text="Kitap İşlemleri", command=lambda: book_menu(window)
+        ).pack(pady=10)
+        tk.Button(
+            window, text="Masa İşlemleri", command=lambda: table_menu(window)
+        ).pack(pady=10)
+        tk.Button(
+            window, text="Rezervasyon", command=lambda: reservation_menu(window)
+        ).pack(pady=10)
+        tk.Button(window, text="Çıkış Yap", command=lambda: logout(window)).pack(
+            pady=10
+        )
+    else:
+        tk.Button(window, text="Kaydol", command=lambda: register_user(window)).pack(
+            pady=10
+        )
+        tk.Button(window, text="Giriş Yap", command=lambda: login_user(window)).pack(
+            pady=10
+        )
+        tk.Button(window, text="Admin Girişi", command=lambda: admin_login(window)).pack(
+            pady=10
+        )
+        tk.Button(window, text="Çıkış", command=window.destroy).pack(pady=10)
+
+
+# Uzak sunucudaki oturum da kapatılır (depolama iş parçacığında)
+def logout(window):
+    global logged_in_user
+    logged_in_user = None
+    if API_URL:
+        worker.EXECUTOR.submit(library.logout)
+    window.destroy()
+    main_menu(tk.Tk())
+
+
+if __name__ == "__main__":
+    initialize_files()
+    logged_in_user = None
+    root = tk.Tk()
+    # Veriler arka planda yüklenir; giriş penceresi beklemeden açılır.
+    # Uzak sunucu kullanılıyorsa yükleme ve arşivlemeyi sunucu yapar.
+    if not API_URL:
+        worker.run(root, warm_up, on_error=show_error)
+    main_menu(root)
+    root.mainloop()
+    # Sonraki açılış dosyaları ayrıştırmak yerine önbellekten başlasın
+    if not API_URL:
+        worker.EXECUTOR.submit(store.save_cache).result()
\ No newline at end of file
@@ -0,0 +1,148 @@
+import bisect
+
+import intervals
+
+# pack() yerleştirme sıraları
+STRATEGIES = ("first_fit", "best_fit", "optimized")
+
+
+# Bir masanın gün içindeki durumu: kapasite ve başlangıca göre sıralı
+# dolu aralıklar (dakika). Eski dosyalardaki çakışan rezervasyonlar
+# birleştirilir ki yalnızca komşuya bakmak yetsin.
+class Schedule:
+    def __init__(self, capacity, busy=()):
+        self.capacity = capacity
+        self.busy = []
+        for start, end in sorted(busy):
+            if self.busy and start < self.busy[-1][1]:
+                self.busy[-1] = (self.busy[-1][0], max(self.busy[-1][1], end))
+            else:
+                self.busy.append((start, end))
+
+    def fits(self, start, end):
+        i = bisect.bisect_left(self.busy, (end,))
+        return i == 0 or self.busy[i - 1][1] <= start
+
+    # Aralığın önünde ve arkasında kalacak boşluk (dakika). Küçük boşluk
+    # bırakan masa seçilirse günün geri kalanında uzun aralıklar için yer kalır.
+    def gap(self, start, end):
+        i = bisect.bisect_left(self.busy, (end,))
+        before = start - (self.busy[i - 1][1] if i else intervals.DAY_START)
+        after = (self.busy[i][0] if i < len(self.busy) else intervals.DAY_END) - end
+        return before + after
+
+    def add(self, start, end):
+        bisect.insort(self.busy, (start, end))
+
+
+# Deponun day_tables() çıktısından: masa -> Schedule
+def schedules(day_tables):
+    return {
+        table_id: Schedule(capacity, busy)
+        for table_id, (capacity, busy) in day_tables.items()
+    }
+
+
+# Grubun sığdığı boş masalardan en uygunu: önce en küçük yeterli kapasite
+# (büyük masalar gruplara kalsın), eşitlikte en az boşluk bırakan, sonra
+# masa sırası. schedules: masa -> Schedule, masa sırasıyla. Yoksa None.
+def best_fit(schedules, group_size, start, end):
+    best, best_key = None, None
+    for order, (table_id, schedule) in enumerate(schedules.items()):
+        if schedule.capacity < group_size or not schedule.fits(start, end):
+            continue
+        key = (schedule.capacity, schedule.gap(start, end), order)
+        if best_key is None or key < best_key:
+            best, best_key = table_id, key
+    return best
+
+
+# Elle seçime benzer: kapasitesi yeten ilk boş masa
+def first_fit(schedules, group_size, start, end):
+    for table_id, schedule in schedules.items():
+        if schedule.capacity >= group_size and schedule.fits(start, end):
+            return table_id
+    return None
+
+
+# Bir günün isteklerini masalara yerleştirir. requests: [(grup, başlangıç,
+# bitiş)] (dakika). "first_fit" ve "best_fit" istekleri geliş sırasıyla,
+# "optimized" ise önce büyük grupları ve uzun aralıkları (yerleşmesi en zor
+# olanları) best_fit ile yerleştirir; kullanım oranı (dolu koltuk-dakika)
+# artar. schedules yerinde güncellenir. ({istek no: masa}, reddedilenler)
+def pack(schedules, requests, strategy="optimized"):
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Bilinmeyen yerleştirme: {strategy}")
+    order = range(len(requests))
+    if strategy == "optimized":
+        order = sorted(
+            order,
+            key=lambda i: (
+                -requests[i][0],
+                requests[i][1] - requests[i][2],
+                requests[i][1],
+            ),
+        )
+    choose = first_fit if strategy == "first_fit" else best_fit
+    assigned, rejected = {}, []
+    for i in order:
+        group_size, start, end = requests[i]
+        table_id = choose(schedules, group_size, start, end)
+        if table_id is None:
+            rejected.append(i)
+        else:
+            schedules[table_id].add(start, end)
+            assigned[i] = table_id
+    return assigned, sorted(rejected)
+
+
+# Dolu koltuk-dakikanın, açık saatlerdeki toplam koltuk-dakikaya oranı
+def utilization(capacities, requests, assigned, open_minutes):
+    used = sum(requests[i][0] * (requests[i][2] - requests[i][1]) for i in assigned)
+    total = sum(capacities) * open_minutes
+    return used / total if total else 0.0
+
+
+# Depo üzerinden (metin, ikili ya da SQLite): grubun sığdığı en uygun masa.
+# Adaylar depo indeksinden (free_tables) gelir; yalnızca onların günü okunur.
+# Tarihler depodaki biçimdedir (yyyy-mm-dd).
+def best_table(store, date, start_time, end_time, group_size):
+    candidates = store.free_tables(date, start_time, end_time, group_size)
+    if not candidates:
+        return None
+    return best_fit(
+        schedules(store.day_tables(date, candidates)),
+        group_size,
+        intervals.to_minutes(start_time),
+        intervals.to_minutes(end_time),
+    )
+
+
+# Seçim ve kayıt diğer kiosklara karşı tek adımda yapılır; masa yoksa None
+def reserve_best_table(store, student_id, date, start_time, end_time, group_size):
+    with store.transaction():
+        table_id = best_table(store, date, start_time, end_time, group_size)
+        if table_id is None:
+            return None
+        return store.table_reservations.insert(
+            (student_id, table_id, date, start_time, end_time)
+        )
+
+
+# Bir günün isteklerini [(öğrenci, grup, başlangıç, bitiş)] mevcut
+# rezervasyonların etrafına yerleştirip tek grup olarak yazar.
+# (rezervasyonlar istek sırasıyla, reddedilen istek numaraları) döner.
+def allocate_day(store, date, requests, strategy="optimized"):
+    spans = [
+        (group_size, intervals.to_minutes(start), intervals.to_minutes(end))
+        for _, group_size, start, end in requests
+    ]
+    with store.transaction():
+        assigned, rejected = pack(schedules(store.day_tables(date)), spans, strategy)
+        records = [
+            (requests[i][0], table_id, date, requests[i][2], requests[i][3])
+            for i, table_id in sorted(assigned.items())
+        ]
+        if not records:
+            return [], rejected
+        return store.table_reservations.insert_group(records), rejected
@@ -0,0 +1,336 @@
+import collections
+import csv
+import datetime
+import functools
+import heapq
+import io
+import os
+import pickle
+
+import archive
+import intervals
+import storage
+
+CACHE_VERSION = 1
+WEEKDAYS = ("Pzt", "Sal", "Çar", "Per", "Cum", "Cmt", "Paz")
+HOURS = range(intervals.DAY_START // 60, intervals.DAY_END // 60 + 1)
+KINDS = ("book", "table")
+
+
+# En büyük top değer; eşitlikte anahtar sırası, birleştirme sırası önemsiz
+def most_common(counter, top):
+    return heapq.nsmallest(top, counter.items(), key=lambda item: (-item[1], item[0]))
+
+
+@functools.lru_cache(maxsize=None)
+def weekday(date):
+    return datetime.date.fromisoformat(date).weekday()
+
+
+@functools.lru_cache(maxsize=None)
+def minutes(time_str):
+    return intervals.to_minutes(time_str)
+
+
+# Bir kaynağın (arşiv ayı, iptal günlüğü ya da sıcak dosya) toplamları.
+# Kaynaklar ayrı ayrı özetlenip birleştirilir; değişmeyen kaynağın özeti
+# önbellekten gelir.
+class Summary:
+    COUNTERS = (
+        "totals",
+        "cancelled",
+        "books",
+        "occupancy",
+        "user_books",
+        "user_tables",
+        "user_minutes",
+        "user_cancels",
+    )
+
+    def __init__(self):
+        self.totals = collections.Counter()  # tür -> rezervasyon
+        self.cancelled = collections.Counter()  # tür -> iptal
+        self.books = collections.Counter()  # kitap -> rezervasyon
+        self.occupancy = collections.Counter()  # (haftanın günü, saat) -> dakika
+        self.user_books = collections.Counter()
+        self.user_tables = collections.Counter()
+        self.user_minutes = collections.Counter()
+        self.user_cancels = collections.Counter()
+        self.first = self.last = None  # masa rezervasyonlarının tarih aralığı
+
+    # Kayıtlar sütunlara ayrılır (zip) ve Counter ile C tarafında sayılır;
+    # Python döngüsü yalnızca farklı (tarih, başlangıç, bitiş) değerleri
+    # üzerinden döner, satır sayısı üzerinden değil.
+    def add_books(self, records):
+        columns = list(zip(*records))
+        if not columns:
+            return
+        students, books = columns[0], columns[1]
+        self.totals["book"] += len(students)
+        self.books.update(books)
+        self.user_books.update(students)
+
+    def add_tables(self, records):
+        columns = list(zip(*records))
+        if not columns:
+            return
+        students, dates, starts, ends = columns[0], columns[2], columns[3], columns[4]
+        self.totals["table"] += len(students)
+        self.user_tables.update(students)
+        slots = collections.Counter(zip(dates, starts, ends))
+        for (date, start, end), count in slots.items():
+            day, start, end = weekday(date), minutes(start), minutes(end)
+            for hour in range(start // 60, (end - 1) // 60 + 1):
+                spent = min(end, hour * 60 + 60) - max(start, hour * 60)
+                self.occupancy[(day, hour)] += spent * count
+        spans = collections.Counter(zip(students, starts, ends))
+        for (student, start, end), count in spans.items():
+            self.user_minutes[student] += (minutes(end) - minutes(start)) * count
+        self._span(min(dates), max(dates))
+
+    # İptal günlüğü satırı: (iptal tarihi, rezervasyon alanları...)
+    def add_cancellations(self, kind, records):
+        students = [record[1] for record in records]
+        self.cancelled[kind] += len(students)
+        self.user_cancels.update(students)
+
+    def _span(self, first, last):
+        self.first = first if self.first is None else min(self.first, first)
+        self.last = last if self.last is None else max(self.last, last)
+
+    # Sayaçlar boş Counter'a C tarafında kopyalanır
+    def copy(self):
+        other = Summary()
+        for name in self.COUNTERS:
+            setattr(other, name, collections.Counter(getattr(self, name)))
+        other.first, other.last = self.first, self.last
+        return other
+
+    def merge(self, other):
+        for name in self.COUNTERS:
+            getattr(self, name).update(getattr(other, name))
+        if other.first is not None:
+            self._span(other.first, other.last)
+        return self
+
+
+def _stamp(paths):
+    stamps = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            stamps.append(None)
+        else:
+            stamps.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(stamps)
+
+
+# Rezervasyon geçmişi özetleri. Her kaynağın özeti dosya damgasıyla
+# (mtime, boyut) birlikte tutulur; yalnızca damgası değişen kaynak yeniden
+# okunur. Arşiv aylarının özetleri bir kez birleştirilip taban olarak
+# tutulur ve bu makinenin önbellek klasörüne yazılır (yeniden başlatınca
+# aylar okunmaz; bkz. storage.local_cache_path).
+# İptal yalnızca sıcak dosyayı ve iptal günlüğünü geçersiz kılar; rapor
+# tabanın kopyasına bu küçük özetler eklenerek çıkar.
+class Analytics:
+    def __init__(self, store):
+        self.store = store
+        self.folder = archive.folder_for(store)
+        self.cache_path = storage.local_cache_path(self.folder, "analytics.cache")
+        self._parts = None  # kaynak -> (damga, Summary)
+        self._base_key = self._base = None
+
+    # Ay özetleri ve birleştirilmiş taban; taban da saklanır çünkü büyük
+    # sayaçları birleştirmek ayları okumaktan sonra en pahalı adımdır
+    def _load(self):
+        self._parts = {}
+        try:
+            with open(self.cache_path, "rb") as f:
+                version, parts, base_key, base = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+            return
+        if version == CACHE_VERSION:
+            self._parts, self._base_key, self._base = parts, base_key, base
+
+    def _save(self, parts):
+        os.makedirs(os.path.dirname(self.cache_path), mode=0o700, exist_ok=True)
+        tmp_path = self.cache_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(
+                (CACHE_VERSION, parts, self._base_key, self._base),
+                f,
+                pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_path, self.cache_path)
+
+    # Arşiv ayları: yol -> (tür, özetleyici adı)
+    def _months(self):
+        months = {}
+        for kind in KINDS:
+            name = f"{kind}_reservations"
+            add = "add_books" if kind == "book" else "add_tables"
+            for month in archive.months(self.store, name):
+                months[archive.month_path(self.folder, name, month)] = add
+        return months
+
+    # Sıcak kaynaklar: (kaynak, damga, özetleyici) üçlüleri; iptal günlükleri
+    # ve sıcak dosyalar
+    def _hot_sources(self):
+        for kind in KINDS:
+            name = f"{kind}_reservations"
+            add = "add_books" if kind == "book" else "add_tables"
+            path = archive.cancellations_path(self.store, name)
+            yield path, _stamp([path]), self._cancelled(kind, name)
+            collection = getattr(self.store, name)
+            yield name, _stamp(collection.files()), self._reader(add, collection)
+
+    def _reader(self, add, records):
+        def summarize():
+            summary = Summary()
+            getattr(summary, add)(records)
+            return summary
+
+        return summarize
+
+    def _cancelled(self, kind, name):
+        def summarize():
+            summary = Summary()
+            summary.add_cancellations(kind, archive.cancellations(self.store, name))
+            return summary
+
+        return summarize
+
+    # Arşiv aylarının özetleri; aylar atomik olarak yerine konduğundan
+    # kilitsiz okunur. Damga okumadan önce alınır: okuma sırasında dosya
+    # değişirse damga tutmaz ve ay bir sonraki çağrıda yeniden okunur.
+    def _read_months(self, months):
+        parts, changed = {}, False
+        for path, add in months.items():
+            stamp = _stamp([path])
+            cached = self._parts.get(path)
+            if cached is None or cached[0] != stamp:
+                cached = (stamp, self._reader(add, archive.read_month(path))())
+                changed = True
+            parts[path] = cached
+        return parts, changed
+
+    # Tüm geçmişin özeti. Arşiv ayları depo kilidi dışında okunur; kilit
+    # yalnızca sıcak dosyalar ve iptal günlükleri için tutulur ki damga ile
+    # okunan kayıtlar birbirini tutsun. Arada arşivleme çalıştıysa (ayların
+    # damgası kilit altında farklıysa) aylar yeniden okunur; böylece taşınan
+    # kayıtlar ne iki kez sayılır ne kaybolur.
+    def summary(self):
+        if self._parts is None:
+            self._load()
+        changed = False
+        while True:
+            months = self._months()
+            parts, read = self._read_months(months)
+            changed = changed or read
+            self._parts.update(parts)
+            with self.store.transaction():
+                stamps = {path: _stamp([path]) for path in self._months()}
+                if stamps != {path: parts[path][0] for path in months}:
+                    continue
+                for kind in KINDS:
+                    collection = getattr(self.store, f"{kind}_reservations")
+                    collection.load()
+                    collection.refresh()
+                for source, stamp, summarize in self._hot_sources():
+                    cached = self._parts.get(source)
+                    if cached is None or cached[0] != stamp:
+                        cached = (stamp, summarize())
+                    parts[source] = cached
+            break
+        months = list(months)
+        # Arşivden silinen ay da tabanı değiştirir
+        changed = changed or any(source not in parts for source in self._parts)
+        self._parts = parts
+        base_key = tuple((source, parts[source][0]) for source in months)
+        if base_key != self._base_key:
+            self._base = Summary()
+            for source in months:
+                self._base.merge(parts[source][1])
+            self._base_key = base_key
+        if changed:
+            self._save({source: parts[source] for source in months})
+        total = self._base.copy()
+        for source, (_, summary) in parts.items():
+            if source not in months:
+                total.merge(summary)
+        return total
+
+
+# Özetten rapor: en çok ayrılan kitaplar, haftanın günü x saat masa
+# doluluğu (dolu masa-dakika / masa sayısı x o güne düşen gün sayısı x 60),
+# en etkin kullanıcılar ve tür başına iptal oranı (iptal / yapılan).
+def report(summary, table_count, top=20):
+    weekdays = collections.Counter()
+    if summary.first is not None:
+        day = datetime.date.fromisoformat(summary.first)
+        last = datetime.date.fromisoformat(summary.last)
+        while day <= last:
+            weekdays[day.weekday()] += 1
+            day += datetime.timedelta(days=1)
+    occupancy = []
+    for day in range(len(WEEKDAYS)):
+        capacity = table_count * weekdays[day] * 60
+        occupancy.append(
+            [
+                summary.occupancy[(day, hour)] / capacity if capacity else 0.0
+                for hour in HOURS
+            ]
+        )
+    activity = summary.user_books + summary.user_tables
+    users = [
+        [
+            student,
+            summary.user_books[student],
+            summary.user_tables[student],
+            round(summary.user_minutes[student] / 60, 2),
+            summary.user_cancels[student],
+        ]
+        for student, _ in most_common(activity, top)
+    ]
+    rates = {}
+    for kind in KINDS:
+        made = summary.totals[kind] + summary.cancelled[kind]
+        rates[kind] = summary.cancelled[kind] / made if made else 0.0
+    return {
+        "period": [summary.first, summary.last],
+        "totals": {kind: summary.totals[kind] for kind in KINDS},
+        "cancelled": {kind: summary.cancelled[kind] for kind in KINDS},
+        "cancellation_rate": rates,
+        "top_books": [list(item) for item in most_common(summary.books, top)],
+        "hours": list(HOURS),
+        "occupancy": occupancy,
+        "users": users,
+    }
+
+
+# Raporu bölümler hâlinde tek CSV metnine yazar; bölümler boş satırla ayrılır
+def to_csv(report):
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["tür", "rezervasyon", "iptal", "iptal oranı"])
+    for kind in KINDS:
+        writer.writerow(
+            [
+                kind,
+                report["totals"][kind],
+                report["cancelled"][kind],
+                f"{report['cancellation_rate'][kind]:.4f}",
+            ]
+        )
+    writer.writerow([])
+    writer.writerow(["kitap", "rezervasyon"])
+    writer.writerows(report["top_books"])
+    writer.writerow([])
+    writer.writerow(["gün"] + [f"{hour:02d}:00" for hour in report["hours"]])
+    for day, row in zip(WEEKDAYS, report["occupancy"]):
+        writer.writerow([day] + [f"{value:.4f}" for value in row])
+    writer.writerow([])
+    writer.writerow(["öğrenci", "kitap", "masa", "masa saati", "iptal"])
+    writer.writerows(report["users"])
+    return out.getvalue()
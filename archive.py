@@ -0,0 +1,151 @@
+import argparse
+import datetime
+import glob
+import gzip
+import os
+
+import storage
+
+KINDS = ("book_reservations", "table_reservations")
+
+
+# Arşiv klasörü veritabanı klasörünün içindedir: archive/<tür>/<yyyy-mm>.txt.gz
+def folder_for(store):
+    return os.path.join(os.path.dirname(store.users.path), "archive")
+
+
+def month_path(folder, kind, month):
+    return os.path.join(folder, kind, month + ".txt.gz")
+
+
+def read_month(path):
+    if not os.path.exists(path):
+        return
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield storage.parse_line(line)
+
+
+# Ayın arşivine yeni kayıtları ekler. Dosya birleştirilip atomik olarak
+# yeniden yazılır; zaten arşivde olan kayıtlar tekrar yazılmaz, böylece
+# yarıda kalan bir arşivleme tekrar çalıştırıldığında çift kayıt oluşmaz.
+# (Bir rezervasyon aynı kitap/masa ve zamanda iki kez var olamaz.)
+def write_month(folder, kind, month, records):
+    path = month_path(folder, kind, month)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    existing = list(read_month(path))
+    known = set(existing)
+    added = [record for record in records if record not in known]
+    if not added:
+        return 0
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as raw:
+        with gzip.open(raw, "wt", encoding="utf-8") as f:
+            for record in existing + added:
+                f.write(storage.format_record(record) + "\n")
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(tmp_path, path)
+    return len(added)
+
+
+# Bugünden önceki rezervasyonları aylık arşivlere taşır. Kayıtlar önce
+# arşive yazılır, sonra sıcak dosyalardan tek yazmayla silinir; hepsi
+# depo kilidi altında yapılır. Tür başına taşınan kayıt sayısını döndürür.
+def archive_past(store, today=None):
+    today = storage.normalize_date(today or datetime.date.today())
+    folder = folder_for(store)
+    moved = {}
+    with store.transaction():
+        for kind in KINDS:
+            collection = getattr(store, kind)
+            past = store.reservations_before(collection, today)
+            by_month = {}
+            for record in past:
+                by_month.setdefault(record[2][:7], []).append(record)
+            for month, records in sorted(by_month.items()):
+                write_month(folder, kind, month, records)
+            collection.remove_many(past)
+            moved[kind] = len(past)
+    return moved
+
+
+def months(store, kind):
+    paths = glob.glob(month_path(folder_for(store), kind, "*"))
+    return sorted(os.path.basename(path)[: -len(".txt.gz")] for path in paths)
+
+
+# Arşivden [date_from, date_to] aralığındaki kayıtları okur; yalnızca
+# aralığa düşen aylık dosyalar açılır
+def query(store, kind, date_from=None, date_to=None, student_id=None):
+    date_from = storage.normalize_date(date_from) if date_from else None
+    date_to = storage.normalize_date(date_to) if date_to else None
+    folder = folder_for(store)
+    for month in months(store, kind):
+        if (date_from and month < date_from[:7]) or (date_to and month > date_to[:7]):
+            continue
+        for record in read_month(month_path(folder, kind, month)):
+            if date_from and record[2] < date_from or date_to and record[2] > date_to:
+                continue
+            if student_id and record[0] != student_id:
+                continue
+            yield record
+
+
+def cancellations_path(store, kind):
+    return os.path.join(folder_for(store), kind, "cancelled.txt")
+
+
+# İptal edilen rezervasyonlar raporlar için (iptal tarihi, kayıt...) satırı
+# olarak eklenir. Tek write() çağrısı O_APPEND ile eklendiğinden kiosklar
+# arasında satırlar karışmaz.
+def record_cancellation(store, kind, record, today=None):
+    path = cancellations_path(store, kind)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    today = storage.normalize_date(today or datetime.date.today())
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(storage.format_record((today,) + tuple(record)) + "\n")
+
+
+def cancellations(store, kind):
+    path = cancellations_path(store, kind)
+    if not os.path.exists(path):
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield storage.parse_line(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Geçmiş rezervasyonların arşivi")
+    parser.add_argument("--database", default="database")
+    parser.add_argument(
+        "--storage",
+        choices=storage.BACKENDS,
+        default=os.environ.get("LIBRARY_STORAGE", "text"),
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("run", help="bugünden önceki rezervasyonları arşivle")
+    report = commands.add_parser("query", help="arşivdeki rezervasyonları listele")
+    report.add_argument("kind", choices=("book", "table"))
+    report.add_argument("--from", dest="date_from")
+    report.add_argument("--to", dest="date_to")
+    report.add_argument("--student")
+    args = parser.parse_args()
+
+    store = storage.open_store(args.database, args.storage)
+    if args.command == "run":
+        for kind, count in archive_past(store).items():
+            print(f"{kind}: {count} kayıt arşivlendi")
+    else:
+        kind = args.kind + "_reservations"
+        for record in query(store, kind, args.date_from, args.date_to, args.student):
+            print(storage.format_record(record))
+
+
+if __name__ == "__main__":
+    main()
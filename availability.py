@@ -0,0 +1,133 @@
+import intervals
+
+SLOT_MINUTES = 15
+SLOTS = 24 * 60 // SLOT_MINUTES
+
+
+# Aralığın değdiği dilimler: [ilk, son)
+def slot_range(start, end):
+    return start // SLOT_MINUTES, -(-end // SLOT_MINUTES)
+
+
+def iter_bits(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+# Masa kimliği <-> bit konumu. Konumlar ilk görüldüğünde verilir ve
+# masa silinse de değişmez; böylece tüm bit kümeleri aynı sırayı kullanır.
+class TableBits:
+    def __init__(self):
+        self._bits = {}
+        self._tables = []
+
+    def bit(self, table_id):
+        bit = self._bits.get(table_id)
+        if bit is None:
+            bit = self._bits[table_id] = len(self._tables)
+            self._tables.append(table_id)
+        return 1 << bit
+
+    def tables(self, mask):
+        return [self._tables[i] for i in iter_bits(mask)]
+
+
+def capacity(record):
+    try:
+        return int(record[1])
+    except ValueError:
+        return 0
+
+
+# Masalar koleksiyonu indeksi: kapasite -> o kapasitedeki masaların bit kümesi
+class CapacityIndex:
+    def __init__(self, bits):
+        self._table_bits = bits
+        self._by_capacity = {}
+
+    def add(self, seq, record):
+        value = capacity(record)
+        bit = self._table_bits.bit(record[0])
+        self._by_capacity[value] = self._by_capacity.get(value, 0) | bit
+
+    def discard(self, seq, record):
+        value = capacity(record)
+        mask = self._by_capacity.get(value, 0) & ~self._table_bits.bit(record[0])
+        if mask:
+            self._by_capacity[value] = mask
+        else:
+            self._by_capacity.pop(value, None)
+
+    def at_least(self, minimum):
+        mask = 0
+        for value, tables in self._by_capacity.items():
+            if value >= minimum:
+                mask |= tables
+        return mask
+
+
+# Masa rezervasyonları indeksi: tarih -> dilim başına dolu masaların bit
+# kümesi. "D günü A-B arası boş masalar", aralıktaki dilimlerin OR'u ile
+# tüm masalar için tek seferde bulunur. Bir dilime değen rezervasyon dilimi
+# dolu sayar; yalnızca kısmen örtülen uç dilimler IntervalIndex ile kesinleştirilir.
+class AvailabilityGrid:
+    def __init__(self, bits, interval_index):
+        self._table_bits = bits
+        self._intervals = interval_index
+        self._days = {}
+
+    def _mark(self, day, table_id, start, end, lo=0, hi=SLOTS):
+        bit = self._table_bits.bit(table_id)
+        first, last = slot_range(start, end)
+        for slot in range(max(first, lo), min(last, hi)):
+            day[slot] |= bit
+
+    def add(self, seq, record):
+        day = self._days.setdefault(record[2], [0] * SLOTS)
+        start, end = intervals.to_minutes(record[3]), intervals.to_minutes(record[4])
+        self._mark(day, record[1], start, end)
+
+    # Aynı dilime değen başka rezervasyonlar olabileceğinden, boşaltılan
+    # dilimler masanın kalan aralıklarından yeniden işaretlenir
+    def discard(self, seq, record):
+        day = self._days.get(record[2])
+        if day is None:
+            return
+        table_id, date = record[1], record[2]
+        bit = self._table_bits.bit(table_id)
+        first, last = slot_range(
+            intervals.to_minutes(record[3]), intervals.to_minutes(record[4])
+        )
+        for slot in range(first, last):
+            day[slot] &= ~bit
+        for start, end in self._intervals.intervals(table_id, date):
+            self._mark(day, table_id, start, end, first, last)
+
+    # (kesin dolu, uç dilimlerde dolu) masa bit kümeleri
+    def busy(self, date, start, end):
+        day = self._days.get(date)
+        if day is None:
+            return 0, 0
+        first, last = slot_range(start, end)
+        inner_first = -(-start // SLOT_MINUTES)
+        inner_last = end // SLOT_MINUTES
+        sure = 0
+        for slot in range(inner_first, inner_last):
+            sure |= day[slot]
+        edges = 0
+        for slot in {first, last - 1} - set(range(inner_first, inner_last)):
+            edges |= day[slot]
+        return sure, edges & ~sure
+
+    # Isı haritası için: masa -> dolu dilimler ("0"/"1" dizisi)
+    def day_rows(self, date, table_ids):
+        day = self._days.get(date) or [0] * SLOTS
+        return {
+            table_id: "".join(
+                "1" if day[slot] & self._table_bits.bit(table_id) else "0"
+                for slot in range(SLOTS)
+            )
+            for table_id in table_ids
+        }
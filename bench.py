@@ -0,0 +1,412 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import allocation
+import analytics
+import archive
+import datagen
+import intervals
+import security
+import service
+import storage
+
+
+def timed(fn, repeat):
+    samples = []
+    for i in range(repeat):
+        started = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - started)
+    return {
+        "runs": repeat,
+        "mean_ms": statistics.mean(samples) * 1000,
+        "p50_ms": statistics.median(samples) * 1000,
+        "max_ms": max(samples) * 1000,
+    }
+
+
+def elapsed_ms(fn):
+    started = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - started) * 1000, result
+
+
+# N kullanıcılı bir users.txt üretir. Ölçülen kullanıcı gerçek iş yüküyle,
+# geri kalanlar (arama maliyetini etkilemedikleri için) ucuz özetle yazılır.
+def bench_login(users, iterations, repeat):
+    results = {"users": users, "iterations": iterations}
+    with tempfile.TemporaryDirectory() as folder:
+        filler = security.hash_password("sifre", 1)
+        with open(os.path.join(folder, "users.txt"), "w") as f:
+            for i in range(users):
+                f.write(f"{i},{filler}\n")
+            f.write(f"ogrenci,{security.hash_password('sifre', iterations)}\n")
+
+        store = storage.open_store(folder)
+        results["load_ms"], _ = elapsed_ms(store.users.load)
+
+        library = service.LibraryService(
+            store, password_iterations=iterations, limits=False
+        )
+
+        def cold_login(i):
+            library.login_cache.clear()
+            library.login("ogrenci", "sifre")
+
+        def wrong_password(i):
+            try:
+                library.login("ogrenci", "yanlis")
+            except service.ServiceError:
+                pass
+
+        results["login_cold"] = timed(cold_login, repeat)
+        results["login_cached"] = timed(lambda i: library.login("ogrenci", "sifre"), repeat)
+        results["login_wrong_password"] = timed(wrong_password, repeat)
+    return results
+
+
+# Sentetik veritabanı üzerinde temel işlemleri arayüzsüz ölçer.
+# Parola iş yükü 1 tutulur; burada ölçülen depolama yoludur (bkz. "login").
+def bench_operations(scale, repeat, backend="text", seed=0):
+    rng = random.Random(seed)
+    today = datetime.date.today()
+    horizon = [(today + datetime.timedelta(days=d)).isoformat() for d in range(15)]
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        results["generate_ms"], counts = elapsed_ms(
+            lambda: datagen.generate(folder, scale, seed, today)
+        )
+        store = storage.open_store(folder, backend)
+        if backend != "text":
+            results["import_ms"], _ = elapsed_ms(store.import_text_files)
+        results["load_ms"], _ = elapsed_ms(
+            lambda: [getattr(store, name).load() for name in counts]
+        )
+        library = service.LibraryService(store, password_iterations=1, limits=False)
+        books = [datagen.book_name(i) for i in range(counts["books"])]
+        student = lambda: str(20000000 + rng.randrange(counts["users"]))
+
+        def login(i):
+            library.login_cache.clear()
+            library.login(student(), "sifre")
+
+        def attempt(fn, *args):
+            try:
+                return fn(*args)
+            except service.ConflictError:
+                return None
+
+        made = []
+
+        def reserve_book(i):
+            res = attempt(
+                library.reserve_book, student(), rng.choice(books), rng.choice(horizon)
+            )
+            if res:
+                made.append(("book", res))
+
+        def reserve_table(i):
+            start = rng.randrange(8 * 60, 21 * 60, 15)
+            res = attempt(
+                library.reserve_table,
+                student(),
+                str(rng.randrange(counts["tables"]) + 1),
+                rng.choice(horizon),
+                f"{start // 60:02d}:{start % 60:02d}",
+                f"{(start + 60) // 60:02d}:{start % 60:02d}",
+            )
+            if res:
+                made.append(("table", res))
+
+        # Bir masayı 14 günün her birinde aynı saat için ayırır
+        def reserve_batch(i):
+            start = rng.randrange(8 * 60, 21 * 60, 15)
+            times = (
+                intervals.format_minutes(start),
+                intervals.format_minutes(start + 60),
+            )
+            table = str(rng.randrange(counts["tables"]) + 1)
+            result = library.reserve_batch(
+                student(), "table", [(table, day) + times for day in horizon[1:]]
+            )
+            made.extend(("table", res) for res in result["reservations"])
+
+        def cancel(i):
+            if made:
+                kind, reservation = made.pop()
+                library.cancel_reservation(kind, reservation[-1])
+
+        def refresh_all(i):
+            library.list_books()
+            library.list_tables()
+            library.list_reservations("book")
+            library.list_reservations("table")
+
+        ops = {
+            "login": login,
+            "register": lambda i: library.register_user(f"yeni-{i}", "sifre"),
+            "book_conflict": lambda i: library.check_book_conflict(
+                rng.choice(books), rng.choice(horizon)
+            ),
+            "table_conflict": lambda i: library.check_table_conflict(
+                str(rng.randrange(counts["tables"]) + 1),
+                rng.choice(horizon),
+                "10:00",
+                "11:00",
+            ),
+            "free_tables": lambda i: library.free_tables(
+                rng.choice(horizon), "10:00", "11:30", rng.choice((1, 2, 4))
+            ),
+            "search_books": lambda i: library.search_books(
+                rng.choice(books)[: rng.randint(1, 12)]
+            ),
+            "user_reservations": lambda i: library.user_reservations(
+                rng.choice(("book", "table")), student()
+            ),
+            "reserve_book": reserve_book,
+            "reserve_table": reserve_table,
+            "reserve_batch": reserve_batch,
+            "cancel": cancel,
+            "refresh_all": refresh_all,
+        }
+        for name, fn in ops.items():
+            results[name] = timed(fn, repeat)
+    return {"counts": counts, "backend": backend, "results": results}
+
+
+# Kiosk açılışı: modül içe aktarma (ayrı süreçte), 1.py'deki sırayla ilk
+# girişe kadar geçen süre (önbelleksiz ve önbellekten), tüm verinin
+# dosyalardan yüklenmesi ve girişten sonra çalışan bakım işleri
+def bench_startup(scale, backend="text", seed=0):
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        counts = datagen.generate(folder, scale, seed)
+        # İkili depo ilk açılışta metin dosyalarından bir kez aktarılır (1.py)
+        if backend != "text":
+            storage.open_store(folder, backend).import_text_files()
+        script = (
+            "import time; started = time.perf_counter(); "
+            "import service, storage, worker; "
+            "print((time.perf_counter() - started) * 1000)"
+        )
+        results["process_ms"], output = elapsed_ms(
+            lambda: subprocess.run(
+                [sys.executable, "-c", script],
+                cwd=os.path.dirname(os.path.abspath(__file__)),
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+        )
+        results["import_ms"] = float(output)
+
+        # 1.py: depo ve servis açılır, warm_up önbelleği yükler, giriş aynı
+        # depolama kuyruğunda onun arkasından çalışır
+        def login_ready():
+            store = storage.open_store(folder, backend)
+            library = service.LibraryService(store, password_iterations=1)
+            store.load_cache()
+            library.login(str(20000000), "sifre")
+            return store, library
+
+        results["login_ready_ms"], (store, _) = elapsed_ms(login_ready)
+        results["full_load_ms"], _ = elapsed_ms(
+            lambda: [getattr(store, name).load() for name in counts]
+        )
+        results["cache_save_ms"], _ = elapsed_ms(store.save_cache)
+        if os.path.exists(store.cache_path):
+            results["cache_bytes"] = os.path.getsize(store.cache_path)
+        fresh = storage.open_store(folder, backend)
+        results["cache_load_ms"], results["cache_hit"] = elapsed_ms(fresh.load_cache)
+        results["cached_login_ready_ms"], (store, library) = elapsed_ms(login_ready)
+
+        # Girişten sonra kuyruklanan bakım (maintain)
+        def maintenance():
+            store.evict_past()
+            library.archive_past()
+
+        results["maintenance_ms"], _ = elapsed_ms(maintenance)
+    return {"counts": counts, "backend": backend, "results": results}
+
+
+# Sentetik günlük yüklerde masa yerleştirme stratejileri: kabul edilen
+# istek oranı, kullanım (dolu koltuk-dakika / açık saatlerdeki koltuk-dakika),
+# ayrılan masalarda boş kalan koltuk oranı ve pack() süresi; gün ortalaması.
+# Son olarak bir günün istekleri depo üzerinden (yazma dahil) yerleştirilir.
+def bench_allocation(tables, requests, days, backend="text", seed=0):
+    rng = random.Random(seed)
+    open_minutes = 14 * 60
+    samples = {strategy: [] for strategy in allocation.STRATEGIES}
+    for _ in range(days):
+        capacities = {str(i + 1): rng.choice((1, 2, 4, 6, 8)) for i in range(tables)}
+        day = datagen.table_requests(rng, requests)
+        spans = [
+            (group_size, intervals.to_minutes(start), intervals.to_minutes(end))
+            for _, group_size, start, end in day
+        ]
+        for strategy in allocation.STRATEGIES:
+            schedules = {
+                table_id: allocation.Schedule(capacity)
+                for table_id, capacity in capacities.items()
+            }
+            ms, (assigned, _) = elapsed_ms(
+                lambda: allocation.pack(schedules, spans, strategy)
+            )
+            held = sum(
+                capacities[table_id] * (spans[i][2] - spans[i][1])
+                for i, table_id in assigned.items()
+            )
+            used = sum(spans[i][0] * (spans[i][2] - spans[i][1]) for i in assigned)
+            samples[strategy].append(
+                (
+                    len(assigned) / len(spans),
+                    allocation.utilization(
+                        capacities.values(), spans, assigned, open_minutes
+                    ),
+                    1 - used / held if held else 0.0,
+                    ms,
+                )
+            )
+    results = {
+        strategy: dict(
+            zip(
+                ("accepted", "utilization", "empty_seats", "pack_ms"),
+                (statistics.mean(values) for values in zip(*rows)),
+            )
+        )
+        for strategy, rows in samples.items()
+    }
+    with tempfile.TemporaryDirectory() as folder:
+        datagen.generate(folder, tables * 1000, seed)
+        store = storage.open_store(folder, backend)
+        if backend != "text":
+            store.import_text_files()
+        store.tables.load()
+        store.table_reservations.load()
+        library = service.LibraryService(store)
+        tomorrow = (datetime.date.today() + datetime.timedelta(days=1)).isoformat()
+        results["allocate_day_ms"], result = elapsed_ms(
+            lambda: library.allocate_tables(
+                tomorrow, datagen.table_requests(rng, requests)
+            )
+        )
+        results["allocate_day_accepted"] = len(result["reservations"]) / requests
+    return {"tables": tables, "requests": requests, "days": days, "results": results}
+
+
+# İstatistik raporu: önbelleksiz (tüm geçmiş okunur), önbellekten, bir
+# iptalden sonra (yalnızca sıcak dosya ve iptal günlüğü yeniden okunur) ve
+# yeni süreçte diskteki önbellekten. Geçmiş önce aylık arşivlere taşınır.
+def bench_analytics(scale, backend="text", seed=0):
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        counts = datagen.generate(folder, scale, seed)
+        store = storage.open_store(folder, backend)
+        if backend != "text":
+            store.import_text_files()
+        library = service.LibraryService(store, password_iterations=1)
+        results["archive_ms"], _ = elapsed_ms(library.archive_past)
+        results["cold_ms"], report = elapsed_ms(library.analytics)
+        results["rows_per_s"] = sum(report["totals"].values()) / (
+            results["cold_ms"] / 1000
+        )
+        results["cached_ms"], _ = elapsed_ms(library.analytics)
+        reservation = next(iter(store.table_reservations))
+        library.cancel_reservation("table", reservation[-1])
+        results["after_cancel_ms"], _ = elapsed_ms(library.analytics)
+        fresh = analytics.Analytics(storage.open_store(folder, backend))
+        results["restart_ms"], _ = elapsed_ms(fresh.summary)
+        results["cache_bytes"] = os.path.getsize(fresh.cache_path)
+        results["archived_months"] = len(archive.months(store, "table_reservations"))
+    return {"counts": counts, "backend": backend, "results": results}
+
+
+def report(benchmark, params, data):
+    return {
+        "benchmark": benchmark,
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        **params,
+        **data,
+    }
+
+
+def emit(record, output):
+    if output:
+        # JSON Lines: her çalıştırma bir satır, zaman içinde karşılaştırılabilir
+        with open(output, "a") as f:
+            f.write(json.dumps(record) + "\n")
+    else:
+        json.dump(record, sys.stdout, indent=2)
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rezervasyon sistemi performans ölçümü")
+    parser.add_argument("--output", help="sonuçların ekleneceği .jsonl dosyası")
+    suites = parser.add_subparsers(dest="suite", required=True)
+
+    ops = suites.add_parser("operations", help="temel işlemler, ölçek başına")
+    ops.add_argument("--scale", type=int, nargs="+", default=[1000, 10000, 100000])
+    ops.add_argument("--repeat", type=int, default=50)
+    ops.add_argument("--backend", choices=storage.BACKENDS, default="text")
+    ops.add_argument("--seed", type=int, default=0)
+
+    login = suites.add_parser("login", help="parola özetli giriş")
+    login.add_argument("--users", type=int, default=100000)
+    login.add_argument("--iterations", type=int, default=security.DEFAULT_ITERATIONS)
+    login.add_argument("--repeat", type=int, default=20)
+
+    startup = suites.add_parser("startup", help="açılış ve önbellekten yükleme")
+    startup.add_argument("--scale", type=int, nargs="+", default=[10000, 100000])
+    startup.add_argument("--backend", choices=("text", "binary"), default="text")
+    startup.add_argument("--seed", type=int, default=0)
+
+    alloc = suites.add_parser("allocation", help="kapasiteye göre masa yerleştirme")
+    alloc.add_argument("--tables", type=int, default=40)
+    alloc.add_argument("--requests", type=int, nargs="+", default=[100, 200, 400])
+    alloc.add_argument("--days", type=int, default=20)
+    alloc.add_argument("--backend", choices=storage.BACKENDS, default="text")
+    alloc.add_argument("--seed", type=int, default=0)
+
+    stats = suites.add_parser("analytics", help="istatistik raporu ve önbelleği")
+    stats.add_argument("--scale", type=int, nargs="+", default=[100000, 1000000])
+    stats.add_argument("--backend", choices=storage.BACKENDS, default="text")
+    stats.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args()
+    if args.suite == "operations":
+        for scale in args.scale:
+            data = bench_operations(scale, args.repeat, args.backend, args.seed)
+            emit(report("operations", {"scale": scale}, data), args.output)
+    elif args.suite == "allocation":
+        for requests in args.requests:
+            data = bench_allocation(
+                args.tables, requests, args.days, args.backend, args.seed
+            )
+            emit(report("allocation", {}, data), args.output)
+    elif args.suite == "analytics":
+        for scale in args.scale:
+            data = bench_analytics(scale, args.backend, args.seed)
+            emit(report("analytics", {"scale": scale}, data), args.output)
+    elif args.suite == "startup":
+        for scale in args.scale:
+            data = bench_startup(scale, args.backend, args.seed)
+            emit(report("startup", {"scale": scale}, data), args.output)
+    else:
+        data = bench_login(args.users, args.iterations, args.repeat)
+        emit(report("login", {}, {"results": data}), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+import os
+import struct
+import sys
+
+import metrics
+import storage
+
+MAGIC = b"KRB1"
+# Başlık: sihirli sayı, yuva boyu, yuva sayısı, değişiklik sayacı, son kimlik
+HEADER = struct.Struct("<4sIQQQ")
+ALIVE, DELETED = 1, 0
+
+# Koleksiyon başına alanların bayt genişlikleri (UTF-8). Kimlik yuvanın
+# başında ayrıca tutulur; kayıtlarda metin biçimindeki gibi son alandır.
+WIDTHS = {
+    "users": (64, 160),
+    "books": (240, 120),
+    "tables": (16, 8),
+    "book_reservations": (64, 240, 10),
+    "table_reservations": (64, 16, 10, 5, 5),
+    "book_waitlist": (64, 240, 10, 4),
+    "table_waitlist": (64, 16, 10, 5, 5, 4),
+}
+
+
+# Sabit genişlikli yuvalardan oluşan kayıt dosyası. Her yuva:
+# kimlik (8 bayt), durum (1 bayt), alanlar (sıfırla doldurulmuş).
+# Yuva numarası bilindiğinde kayıt seek ile okunur, yerinde güncellenir
+# veya silindi olarak işaretlenir; dosyanın geri kalanı yeniden yazılmaz.
+class RecordFile:
+    def __init__(self, path, widths):
+        self.path = path
+        self.widths = widths
+        self.slot = struct.Struct("<QB" + "".join(f"{width}s" for width in widths))
+
+    # struct.Struct pickle edilemez; önbellekten dönerken yeniden kurulur
+    def __getstate__(self):
+        return self.path, self.widths
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    # Kilit altında çağrılır: dosya yoksa boş başlıkla oluşturulur
+    def create(self):
+        if not os.path.exists(self.path):
+            write_atomic(self.path, [self.pack_header(0, 0, 0)])
+
+    def pack_header(self, count, changes, last_id):
+        return HEADER.pack(MAGIC, self.slot.size, count, changes, last_id)
+
+    # (yuva sayısı, değişiklik sayacı, son kimlik)
+    def header(self, f):
+        f.seek(0)
+        magic, size, count, changes, last_id = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or size != self.slot.size:
+            raise ValueError(f"{self.path}: beklenmeyen ikili dosya biçimi")
+        return count, changes, last_id
+
+    def write_header(self, f, count, changes, last_id):
+        f.seek(0)
+        f.write(self.pack_header(count, changes, last_id))
+        f.flush()
+        os.fsync(f.fileno())
+
+    def _offset(self, slot):
+        return HEADER.size + slot * self.slot.size
+
+    def pack(self, record_id, record, state=ALIVE):
+        fields = []
+        for value, width in zip(record, self.widths):
+            data = value.encode()
+            if len(data) > width or b"\0" in data:
+                raise ValueError(f"alan ikili biçime sığmıyor: {value!r}")
+            fields.append(data)
+        return self.slot.pack(int(record_id), state, *fields)
+
+    # [first, count) aralığındaki yuvalar: (yuva no, kimlik, durum, kayıt)
+    def read(self, f, first, count):
+        f.seek(self._offset(first))
+        data = f.read((count - first) * self.slot.size)
+        data = data[: len(data) - len(data) % self.slot.size]
+        for slot, (record_id, state, *fields) in enumerate(
+            self.slot.iter_unpack(data), first
+        ):
+            yield slot, record_id, state, _decode(fields)
+
+    # overwrite() için yazma adımları: yuvanın tamamı / yalnızca durum baytı
+    def update(self, slot, record_id, record):
+        return self._offset(slot), self.pack(record_id, record)
+
+    def tombstone(self, slot):
+        return self._offset(slot) + 8, bytes([DELETED])
+
+    # Yuvaları son yuvadan sonra yazar ve yeni yuva sayısını döndürür.
+    # Sayı başlığa ayrıca yazılır (write_header); başlık güncellenmeden
+    # çökülürse yarım grup hiç görünmez, sonraki ekleme üzerine yazar.
+    @metrics.timed("storage.binary_append")
+    def append(self, f, slots, count):
+        f.seek(self._offset(count))
+        for data in slots:
+            f.write(data)
+            count += 1
+        f.flush()
+        os.fsync(f.fileno())
+        return count
+
+    # Yuvaları yerinde değiştirir (güncelleme ya da silindi işareti).
+    # Değişiklik sayacı artar; diğer süreçler bunu görünce baştan okur.
+    @metrics.timed("storage.binary_overwrite")
+    def overwrite(self, f, writes, count, changes, last_id):
+        for offset, data in writes:
+            f.seek(offset)
+            f.write(data)
+        self.write_header(f, count, changes + 1, last_id)
+        return changes + 1
+
+
+def _decode(fields):
+    return tuple(field.rstrip(b"\0").decode() for field in fields)
+
+
+def write_atomic(path, chunks):
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+
+
+# storage.Collection arayüzünü sabit genişlikli ikili dosya üzerinde sunar.
+# Bellekteki kayıtlar ve indeksler metin koleksiyonundaki gibidir (ortak
+# taban storage.MemoryCollection); dosyada silme ve güncelleme ilgili
+# yuvanın yerinde değiştirilmesiyle yapılır.
+class BinaryCollection(storage.MemoryCollection):
+    def __init__(self, path, widths, key=None, lock=None):
+        super().__init__(path, key, lock)
+        self.fields = len(widths)
+        self._file = RecordFile(path, widths)
+        self._slots = {}  # sıra numarası -> yuva no
+        self._count = 0
+        self._changes = 0
+        self._last_id = 0
+
+    def _open(self):
+        return open(self.path, "r+b")
+
+    def _reset(self):
+        super()._reset()
+        self._count = self._changes = self._last_id = 0
+
+    def _discard(self, seq):
+        self._slots.pop(seq, None)
+        return super()._discard(seq)
+
+    def _scan(self):
+        self._file.create()
+        identity = storage._file_identity(self.path)[0]
+        with self._open() as f:
+            count, changes, last_id = self._file.header(f)
+            if identity != self._identity or changes != self._changes:
+                self._reset()
+                self._identity = identity
+            slots = self._file.read(f, self._count, count)
+            for slot, record_id, state, record in slots:
+                if state == ALIVE:
+                    self._slots[self._add(record + (str(record_id),))] = slot
+        self._count, self._changes, self._last_id = count, changes, last_id
+
+    # Kimliği olmayan kayda yeni kimlik verir; kimlikli kayıtlar (içe aktarma)
+    # olduğu gibi kalır ve sayaç onların ötesine taşınır
+    def _prepare(self, record):
+        record = tuple(map(str, record))
+        if len(record) == self.fields:
+            self._last_id += 1
+            return record + (str(self._last_id),)
+        self._last_id = max(self._last_id, int(record[-1]))
+        return record
+
+    def _append(self, records, added):
+        first = self._count
+        for i, record in enumerate(records):
+            record = self._prepare(record)
+            seq = self._add(record)
+            added.append(seq)
+            self._slots[seq] = first + i
+            yield self._file.pack(record[-1], record)
+
+    def _insert(self, records):
+        added = []
+        with self._lock:
+            self.sync()
+            try:
+                with self._open() as f:
+                    slots = self._append(records, added)
+                    count = self._file.append(f, slots, self._count)
+                    self._file.write_header(f, count, self._changes, self._last_id)
+                    self._count = count
+            except BaseException:
+                for seq in added:
+                    self._discard(seq)
+                raise
+        return [self._records[seq] for seq in added]
+
+    def insert(self, record):
+        return self._insert([record])[0]
+
+    # Grup tek başlık güncellemesiyle görünür olur: ya hepsi ya hiçbiri
+    def insert_group(self, records):
+        return self._insert(records)
+
+    # records tembel bir dizi olabilir; kilit altında tüketilir
+    def insert_many(self, records):
+        return len(self._insert(records))
+
+    def _overwrite(self, writes):
+        with self._open() as f:
+            self._changes = self._file.overwrite(
+                f, writes, self._count, self._changes, self._last_id
+            )
+
+    def remove_many(self, records):
+        with self._lock:
+            self.sync()
+            writes = []
+            for record in records:
+                for seq in list(self._by_row.get(tuple(map(str, record)), ())):
+                    writes.append(self._file.tombstone(self._slots[seq]))
+                    self._discard(seq)
+            if writes:
+                self._overwrite(writes)
+        return len(writes)
+
+    def remove(self, record):
+        return self.remove_many([record]) > 0
+
+    # Aynı kimlikli kaydı yuvasında günceller
+    def replace(self, old, new):
+        old, new = tuple(map(str, old)), tuple(map(str, new))
+        with self._lock:
+            self.sync()
+            seqs = self._by_row.get(old)
+            if not seqs:
+                return None
+            if len(new) == self.fields or new[-1] != old[-1]:
+                return super().replace(old, new)
+            seq = min(seqs)
+            slot = self._slots[seq]
+            self._overwrite([self._file.update(slot, new[-1], new)])
+            self._discard(seq)
+            self._slots[self._add(new)] = slot
+        return new
+
+    # Silinmiş yuvaları atarak dosyayı atomik olarak yeniden yazar
+    def compact(self):
+        with self._lock:
+            self.sync()
+            records = list(self._records.values())
+            write_atomic(
+                self.path,
+                [self._file.pack_header(len(records), self._changes + 1, self._last_id)]
+                + [self._file.pack(record[-1], record) for record in records],
+            )
+            self._reset()
+            self._identity = None
+            self._scan()
+
+
+# Metin veritabanıyla aynı klasörde, aynı adlı .bin dosyalarını kullanan depo
+class BinaryStore(storage.Store):
+    def __init__(self, **paths):
+        self.text_paths = paths
+        super().__init__(
+            **{name: os.path.splitext(path)[0] + ".bin" for name, path in paths.items()}
+        )
+
+    def _collection(self, name, path, key, fields):
+        return BinaryCollection(path, WIDTHS[name], key=key, lock=self.lock)
+
+    # Mevcut .txt dosyalarını kimlikleriyle birlikte boş koleksiyonlara aktarır.
+    # Metin deposu kendi dosya kilidini kullandığından kayıtlar önce okunur.
+    def import_text_files(self):
+        source = storage.Store(**self.text_paths)
+        counts = {}
+        for name in WIDTHS:
+            records = getattr(source, name).all()
+            target = getattr(self, name)
+            with self.transaction():
+                counts[name] = 0 if len(target) else target.insert_many(records)
+        return counts
+
+
+if __name__ == "__main__":
+    # Kullanım: python binfile.py [veritabanı klasörü]
+    folder = sys.argv[1] if len(sys.argv) > 1 else "database"
+    store = storage.open_store(folder, "binary")
+    for name, count in store.import_text_files().items():
+        print(f"{name}: {count} aktarıldı")
@@ -0,0 +1,203 @@
+import argparse
+import concurrent.futures
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+
+import security
+import storage
+
+# Her tür için dosyadaki sütunlar (CSV başlığı / JSONL alanları)
+FIELDS = {
+    "books": ("name", "author"),
+    "tables": ("table_id", "capacity"),
+    "users": ("student_id", "password"),
+}
+HASH_CHUNK = 64  # paralel özetlenen parola sayısı
+
+
+def detect_format(path, fmt=None):
+    if fmt:
+        return fmt
+    return "jsonl" if os.path.splitext(path)[1] in (".jsonl", ".json") else "csv"
+
+
+# Dosyayı satır satır okur; (satır no, {alan: değer}) üretir
+def read_rows(path, fmt):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        if fmt == "csv":
+            for number, row in enumerate(csv.DictReader(f), start=2):
+                yield number, row
+        else:
+            for number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield number, json.loads(line)
+                except ValueError:
+                    raise ValueError(f"satır {number}: geçersiz JSON")
+
+
+def write_rows(path, fmt, fields, records):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(fields)
+            writer.writerows(records)
+        else:
+            for record in records:
+                f.write(json.dumps(dict(zip(fields, record)), ensure_ascii=False) + "\n")
+
+
+def _field(row, name, required=True):
+    value = str(row.get(name) or "").strip()
+    if required and not value:
+        raise ValueError(f"{name} boş")
+    return value
+
+
+def validate(kind, row):
+    if not isinstance(row, dict):
+        raise ValueError("satır bir nesne değil")
+    if kind == "books":
+        return _field(row, "name"), _field(row, "author")
+    if kind == "tables":
+        capacity = _field(row, "capacity")
+        if not capacity.isdigit() or not int(capacity):
+            raise ValueError("capacity pozitif bir tam sayı olmalı")
+        return _field(row, "table_id", required=False), capacity
+    return _field(row, "student_id"), _field(row, "password")
+
+
+# PBKDF2 GIL'i bıraktığından parolalar iş parçacıklarında özetlenir.
+# Girdi küçük parçalar hâlinde işlenir; bellek kullanımı sabit kalır.
+def _hash_passwords(users, iterations):
+    workers = os.cpu_count() or 1
+    with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+        while True:
+            chunk = list(itertools.islice(users, HASH_CHUNK))
+            if not chunk:
+                return
+            hashed = pool.map(
+                lambda user: user[1]
+                if security.is_hashed(user[1])
+                else security.hash_password(user[1], iterations),
+                chunk,
+            )
+            yield from ((user[0], password) for user, password in zip(chunk, hashed))
+
+
+def _import_stream(store, kind, rows, stats, strict, password_iterations):
+    collection = getattr(store, kind)
+    seen = set()  # bu dosyada görülen anahtarlar (kayıtlar değil)
+    next_table = storage.next_table_id(collection) if kind == "tables" else None
+
+    def accepted():
+        nonlocal next_table
+        for number, row in rows:
+            stats["read"] += 1
+            try:
+                record = validate(kind, row)
+            except ValueError as e:
+                if strict:
+                    raise ValueError(f"satır {number}: {e}")
+                stats["invalid"] += 1
+                continue
+            if kind == "tables" and not record[0]:
+                # Kimliksiz masalara add_table gibi sıradaki boş numara verilir
+                while collection.contains(str(next_table)) or str(next_table) in seen:
+                    next_table += 1
+                record = (str(next_table), record[1])
+            if record[0] in seen or collection.contains(record[0]):
+                stats["duplicate"] += 1
+                continue
+            seen.add(record[0])
+            yield record
+
+    records = accepted()
+    if kind == "users":
+        records = _hash_passwords(records, password_iterations)
+    for record in records:
+        stats["imported"] += 1
+        yield record
+
+
+# Dosyayı doğrular, mevcut kayıtlarla (anahtara göre) tekilleştirir ve tek
+# toplu yazmayla ekler. strict ise hatalı ilk satırda hiçbir şey yazılmaz.
+def import_file(store, kind, path, fmt=None, strict=False, password_iterations=None):
+    stats = {"read": 0, "imported": 0, "duplicate": 0, "invalid": 0}
+    rows = read_rows(path, detect_format(path, fmt))
+    started = time.perf_counter()
+    with store.transaction():
+        getattr(store, kind).insert_many(
+            _import_stream(store, kind, rows, stats, strict, password_iterations)
+        )
+    return _throughput(stats, "read", started)
+
+
+def export_file(store, kind, path, fmt=None):
+    stats = {"exported": 0}
+    started = time.perf_counter()
+
+    def counted(records):
+        for record in records:
+            stats["exported"] += 1
+            yield record[: len(FIELDS[kind])]
+
+    with store.transaction():
+        write_rows(
+            path, detect_format(path, fmt), FIELDS[kind], counted(getattr(store, kind))
+        )
+    return _throughput(stats, "exported", started)
+
+
+def _throughput(stats, counter, started):
+    stats["seconds"] = time.perf_counter() - started
+    stats["rows_per_sec"] = stats[counter] / stats["seconds"] if stats["seconds"] else 0
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Toplu içe/dışa aktarma (CSV/JSONL)")
+    parser.add_argument("--database", default="database")
+    parser.add_argument(
+        "--storage",
+        choices=storage.BACKENDS,
+        default=os.environ.get("LIBRARY_STORAGE", "text"),
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name in ("import", "export"):
+        command = commands.add_parser(name)
+        command.add_argument("kind", choices=sorted(FIELDS))
+        command.add_argument("path")
+        command.add_argument("--format", choices=("csv", "jsonl"))
+    commands.choices["import"].add_argument(
+        "--strict", action="store_true", help="hatalı satırda hiç kayıt ekleme"
+    )
+    commands.choices["import"].add_argument("--password-iterations", type=int)
+    args = parser.parse_args()
+
+    store = storage.open_store(args.database, args.storage)
+    try:
+        if args.command == "import":
+            stats = import_file(
+                store,
+                args.kind,
+                args.path,
+                args.format,
+                args.strict,
+                args.password_iterations,
+            )
+        else:
+            stats = export_file(store, args.kind, args.path, args.format)
+    except (OSError, ValueError) as e:
+        sys.exit(f"Hata: {e}")
+    for name, value in stats.items():
+        print(f"{name}: {value:.2f}" if isinstance(value, float) else f"{name}: {value}")
+
+
+if __name__ == "__main__":
+    main()
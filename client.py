@@ -0,0 +1,72 @@
+import inspect
+import json
+import urllib.error
+import urllib.request
+
+import service
+
+
+# LibraryService ile aynı metotları HTTP/JSON sunucusu üzerinden çağırır;
+# Tkinter uygulaması yerel servis yerine bunu kullanabilir. login /
+# admin_login'in verdiği oturum belirteci sonraki çağrılarda gönderilir.
+class RemoteService:
+    def __init__(self, base_url, timeout=10):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.token = None
+
+    def _call(self, method, **params):
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        request = urllib.request.Request(
+            f"{self.base_url}/api/{method}",
+            data=json.dumps(params).encode(),
+            headers=headers,
+            method="POST",
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                payload = json.load(response)
+        except urllib.error.HTTPError as e:
+            payload = json.load(e)
+            error = {
+                401: service.AuthError,
+                403: service.ForbiddenError,
+                409: service.ConflictError,
+                429: service.RateLimitError,
+            }.get(e.code, service.ServiceError)
+            raise error(payload.get("error", str(e)))
+        except urllib.error.URLError as e:
+            raise service.ServiceError(f"Sunucuya bağlanılamadı: {e.reason}")
+        if "token" in payload:
+            self.token = payload["token"]
+        return _tuples(payload["result"])
+
+    def logout(self):
+        if self.token:
+            self._call("logout")
+            self.token = None
+
+    def __getattr__(self, method):
+        if method not in service.LibraryService.API:
+            raise AttributeError(method)
+        signature = inspect.signature(getattr(service.LibraryService, method))
+
+        def call(*args, **kwargs):
+            params = signature.bind(None, *args, **kwargs).arguments
+            params.pop("self")
+            return self._call(method, **params)
+
+        return call
+
+
+# JSON dizileri yerel servisteki kayıt demetlerine geri çevrilir
+def _tuples(value):
+    if isinstance(value, dict):
+        return {key: _tuples(item) for key, item in value.items()}
+    if isinstance(value, list):
+        if value and not isinstance(value[0], list):
+            return tuple(value)
+        return [tuple(v) for v in value]
+    return value
@@ -0,0 +1,127 @@
+import argparse
+import datetime
+import os
+import random
+
+import intervals
+import security
+
+FIRST_WORDS = ["Kayıp", "Sessiz", "Kırmızı", "Eski", "Son", "Uzak", "Gizli", "Büyük"]
+SECOND_WORDS = ["Şehir", "Deniz", "Yol", "Bahçe", "Kule", "Ada", "Rüya", "Işık"]
+
+
+# Ölçek: rezervasyon satırı sayısı. Diğer dosyalar bununla orantılı büyür.
+def sizes(scale):
+    return {
+        "users": max(10, scale // 10),
+        "books": max(10, scale // 20),
+        "tables": max(5, min(500, scale // 1000)),
+        "book_reservations": scale,
+        "table_reservations": scale,
+    }
+
+
+def book_name(i):
+    return f"{FIRST_WORDS[i % 8]} {SECOND_WORDS[i // 8 % 8]} {i}"
+
+
+# Veritabanı klasörünü satır satır yazarak doldurur (bellek kullanımı sabit).
+# Tarihler en az bir yıllık geçmişe ve önümüzdeki 14 güne yayılır; masa
+# rezervasyonları her (masa, gün) için çakışmadan art arda dizilir.
+def generate(folder, scale, seed=0, today=None, password_iterations=1):
+    rng = random.Random(seed)
+    today = today or datetime.date.today()
+    counts = sizes(scale)
+    os.makedirs(folder, exist_ok=True)
+    path = lambda name: os.path.join(folder, name + ".txt")
+    # Günde masa başına en fazla 6 rezervasyon; gerekirse geçmiş uzatılır
+    per_cell = 6
+    history = max(365, -(-counts["table_reservations"] // (counts["tables"] * per_cell)))
+    days = [
+        (today + datetime.timedelta(days=offset)).isoformat()
+        for offset in range(-history, 15)
+    ]
+
+    # Her kaydın son alanı kalıcı kimliktir; "#lsn" başlığı sonraki
+    # kimliklerin nereden devam edeceğini söyler
+    filler = security.hash_password("sifre", password_iterations)
+    with open(path("users"), "w") as f:
+        f.write(f"#lsn,{counts['users']}\n")
+        for i in range(counts["users"]):
+            f.write(f"{20000000 + i},{filler},{i + 1}\n")
+
+    with open(path("books"), "w") as f:
+        f.write(f"#lsn,{counts['books']}\n")
+        for i in range(counts["books"]):
+            f.write(f"{book_name(i)},Yazar {i % 997},{i + 1}\n")
+
+    with open(path("tables"), "w") as f:
+        f.write(f"#lsn,{counts['tables']}\n")
+        for i in range(counts["tables"]):
+            f.write(f"{i + 1},{rng.choice((1, 2, 4, 6, 8))},{i + 1}\n")
+
+    # Her (kitap, gün) çifti en fazla bir kez kullanılır
+    with open(path("book_reservations"), "w") as f:
+        f.write(f"#lsn,{counts['book_reservations']}\n")
+        for i in range(counts["book_reservations"]):
+            book = i % counts["books"]
+            day = days[(i // counts["books"] * 7 + book) % len(days)]
+            student = 20000000 + rng.randrange(counts["users"])
+            f.write(f"{student},{book_name(book)},{day},{i + 1}\n")
+
+    with open(path("table_reservations"), "w") as f:
+        f.write(f"#lsn,{counts['table_reservations']}\n")
+        remaining = counts["table_reservations"]
+        cells = len(days) * counts["tables"]
+        for cell in range(cells):
+            if not remaining:
+                break
+            day, table = days[cell // counts["tables"]], cell % counts["tables"] + 1
+            # Kalan satırlar kalan hücrelere eşit yayılır
+            quota = min(per_cell, -(-remaining // (cells - cell)))
+            end = 8 * 60
+            for _ in range(quota):
+                start = end + rng.choice((0, 15, 30))
+                end = start + rng.choice((30, 60, 90))
+                student = 20000000 + rng.randrange(counts["users"])
+                f.write(
+                    f"{student},{table},{day},"
+                    f"{intervals.format_minutes(start)},{intervals.format_minutes(end)},"
+                    f"{counts['table_reservations'] - remaining + 1}\n"
+                )
+                remaining -= 1
+    return counts
+
+
+# Bir günün masa istekleri: [(öğrenci, grup, başlangıç, bitiş)]. Çoğu istek
+# tek kişilik; başlangıçlar öğlen civarında yoğunlaşır, süre 1-3 saattir.
+def table_requests(rng, count, users=1000, open_from=8 * 60, open_to=22 * 60):
+    requests = []
+    for _ in range(count):
+        group_size = rng.choices((1, 2, 3, 4, 5, 6, 8), (40, 22, 10, 12, 6, 6, 4))[0]
+        length = rng.choice((60, 90, 120, 180))
+        peak = rng.triangular(open_from, open_to - length, 13 * 60)
+        start = int(peak) // 15 * 15
+        requests.append(
+            (
+                str(20000000 + rng.randrange(users)),
+                group_size,
+                intervals.format_minutes(start),
+                intervals.format_minutes(start + length),
+            )
+        )
+    return requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sentetik veritabanı üretici")
+    parser.add_argument("folder")
+    parser.add_argument("--scale", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    for name, count in generate(args.folder, args.scale, args.seed).items():
+        print(f"{name}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+import collections
+import threading
+
+# Olay: (konu, işlem, kayıt). Konu koleksiyon adıdır ("books",
+# "table_reservations" ...). RELOAD ayrıntısı bilinmeyen bir değişikliği
+# bildirir (ör. SQLite'ta başka süreç yazdı); kayıt yerine None gelir.
+INSERT, DELETE, RELOAD = "insert", "delete", "reload"
+TOPICS = (
+    "users",
+    "books",
+    "tables",
+    "book_reservations",
+    "table_reservations",
+    "book_waitlist",
+    "table_waitlist",
+)
+
+
+# Süreç içi yayın/abone kanalı. Yayın depolama iş parçacığında, abonelik
+# Tk tarafında yapılır; abone listeleri kopyalanarak değiştirildiğinden
+# publish() kilit almaz ve abonesi olmayan konuda neredeyse bedavadır.
+class EventBus:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}  # konu -> geri çağrılar (değişmez demet)
+
+    def subscribe(self, topics, callback):
+        with self._lock:
+            for topic in topics:
+                self._subscribers[topic] = self._subscribers.get(topic, ()) + (
+                    callback,
+                )
+
+        def unsubscribe():
+            with self._lock:
+                for topic in topics:
+                    callbacks = self._subscribers.get(topic, ())
+                    if callback in callbacks:
+                        remaining = list(callbacks)
+                        remaining.remove(callback)
+                        self._subscribers[topic] = tuple(remaining)
+
+        return unsubscribe
+
+    def publish(self, topic, op, record=None):
+        for callback in self._subscribers.get(topic, ()):
+            callback(topic, op, record)
+
+
+# Koleksiyona ikincil indeks gibi takılır ve her eklemeyi / silmeyi
+# yayınlar. Diğer süreçlerin yazdıkları da sync() sırasında günlükten geri
+# oynatılırken buradan geçer. Anlık görüntü önbelleğine girdiği için
+# yalnızca konu adını tutar, kanala modül düzeyinden ulaşır.
+class Publisher:
+    def __init__(self, topic):
+        self.topic = topic
+
+    def add(self, seq, record):
+        BUS.publish(self.topic, INSERT, record)
+
+    def discard(self, seq, record):
+        BUS.publish(self.topic, DELETE, record)
+
+
+# Olayları biriktirip toplu teslim eden kutu. Aynı kaydın silinip yeniden
+# eklenmesi (ör. başka süreç dosyayı katlayınca baştan okuma) birbirini
+# götürür; aboneye yalnızca net değişiklik ulaşır.
+class Mailbox:
+    def __init__(self):
+        self._events = collections.deque()  # append/popleft iş parçacığı güvenli
+
+    def put(self, topic, op, record=None):
+        self._events.append((topic, op, record))
+
+    def drain(self):
+        net = {}
+        while self._events:
+            topic, op, record = self._events.popleft()
+            key = (topic, record)
+            if net.pop(key, op) == op:
+                net[key] = op
+        return [(topic, op, record) for (topic, record), op in net.items()]
+
+
+# Süreç genelindeki olay kanalı
+BUS = EventBus()
+subscribe = BUS.subscribe
+publish = BUS.publish
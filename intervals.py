@@ -0,0 +1,84 @@
+import bisect
+
+DAY_START = 0
+DAY_END = 23 * 60 + 59
+
+
+def to_minutes(time_str):
+    hour, minute = map(int, time_str.split(":"))
+    return hour * 60 + minute
+
+
+def format_minutes(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+# Masa rezervasyonları için (masa, tarih) başına sıralı aralık listesi.
+# Aralıklar dakika cinsinden tutulur. Eski dosyalarda aynı masada çakışan
+# rezervasyonlar bulunabildiğinden (eski çakışma kontrolü tarih biçimi
+# yüzünden hiç eşleşmiyordu) yalnızca komşuya bakmak yetmez; her konum
+# için o konuma kadarki en büyük bitiş de tutulur.
+class IntervalIndex:
+    def __init__(self):
+        self._slots = {}  # (masa, tarih) -> [(başlangıç, bitiş, sıra), ...]
+        self._max_ends = {}  # (masa, tarih) -> [ilk i+1 kaydın en büyük bitişi]
+
+    # i. konumdan sonrasının en büyük bitişlerini yeniden hesaplar
+    def _update(self, key, i):
+        entries, max_ends = self._slots[key], self._max_ends.setdefault(key, [])
+        del max_ends[i:]
+        running = max_ends[-1] if max_ends else 0
+        for _, end, _ in entries[i:]:
+            running = max(running, end)
+            max_ends.append(running)
+
+    def add(self, seq, record):
+        key = (record[1], record[2])
+        entry = (to_minutes(record[3]), to_minutes(record[4]), seq)
+        entries = self._slots.setdefault(key, [])
+        i = bisect.bisect_left(entries, entry)
+        entries.insert(i, entry)
+        self._update(key, i)
+
+    def discard(self, seq, record):
+        key = (record[1], record[2])
+        entries = self._slots.get(key)
+        if not entries:
+            return
+        entry = (to_minutes(record[3]), to_minutes(record[4]), seq)
+        i = bisect.bisect_left(entries, entry)
+        if i < len(entries) and entries[i] == entry:
+            del entries[i]
+            self._update(key, i)
+        if not entries:
+            del self._slots[key], self._max_ends[key]
+
+    def overlaps(self, table_id, date, start, end):
+        entries = self._slots.get((table_id, date))
+        if not entries:
+            return False
+        # Başlangıcı yeni aralığın bitişinden önce olan kayıtlardan biri
+        # yeni aralığın başlangıcından sonra bitiyorsa çakışır
+        i = bisect.bisect_left(entries, (end,))
+        return i > 0 and self._max_ends[(table_id, date)][i - 1] > start
+
+    def intervals(self, table_id, date):
+        return [(start, end) for start, end, _ in self._slots.get((table_id, date), ())]
+
+    def free_slots(self, table_id, date, day_start=DAY_START, day_end=DAY_END):
+        return free_slots(self.intervals(table_id, date), day_start, day_end)
+
+
+# Başlangıca göre sıralı dolu aralıklar arasındaki boşlukları döndürür
+def free_slots(busy, day_start=DAY_START, day_end=DAY_END):
+    free = []
+    cursor = day_start
+    for start, end in busy:
+        if start > cursor:
+            free.append((cursor, min(start, day_end)))
+        cursor = max(cursor, end)
+        if cursor >= day_end:
+            break
+    if cursor < day_end:
+        free.append((cursor, day_end))
+    return free
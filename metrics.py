@@ -0,0 +1,229 @@
+import bisect
+import contextlib
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import threading
+import time
+
+# Gecikme histogramlarının kova üst sınırları (saniye)
+BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+COLLECTIONS = (
+    "users",
+    "books",
+    "tables",
+    "book_reservations",
+    "table_reservations",
+    "book_waitlist",
+    "table_waitlist",
+)
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # son kova: +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+    # Prometheus'taki gibi birikimli kova sayıları
+    def cumulative(self):
+        running, result = 0, []
+        for count in self.counts:
+            running += count
+            result.append(running)
+        return result
+
+
+# İşlem başına çağrı sayaçları ve gecikme histogramları. Tk, depolama
+# iş parçacığı ve sunucu aynı anda kaydedebildiği için kilitle korunur.
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}  # (ad, etiketler) -> değer
+        self._timings = {}  # işlem -> Histogram
+        self._profile = None
+
+    def count(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, operation, seconds, outcome=None):
+        with self._lock:
+            histogram = self._timings.get(operation)
+            if histogram is None:
+                histogram = self._timings[operation] = Histogram()
+            histogram.observe(seconds)
+            if outcome is not None:
+                labels = (("operation", operation), ("outcome", outcome))
+                key = ("operations_total", labels)
+                self._counters[key] = self._counters.get(key, 0) + 1
+
+    # Süreyi ölçer ve sonucu sayar: "ok" ya da hatanın sınıf adı
+    # (ör. ConflictError; reddedilen istekler buradan izlenir)
+    @contextlib.contextmanager
+    def timer(self, operation):
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            yield
+        except BaseException as e:
+            outcome = type(e).__name__
+            raise
+        finally:
+            self.observe(operation, time.perf_counter() - started, outcome)
+
+    # timer() ile aynı; sık çağrılan fonksiyonlar için üreteçsiz ve daha ucuz
+    def timed(self, operation):
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                outcome = "ok"
+                try:
+                    return fn(*args, **kwargs)
+                except BaseException as e:
+                    outcome = type(e).__name__
+                    raise
+                finally:
+                    self.observe(operation, time.perf_counter() - started, outcome)
+
+            return wrapper
+
+        return decorate
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._timings.clear()
+
+    # cProfile çağıran iş parçacığını izler; bu yüzden depolama çağrılarıyla
+    # aynı iş parçacığında (worker / sunucu yürütücüsü) açılıp kapatılmalıdır
+    def start_profile(self):
+        if self._profile is None:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def stop_profile(self, limit=30):
+        profile, self._profile = self._profile, None
+        if profile is None:
+            return ""
+        profile.disable()
+        out = io.StringIO()
+        pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+    def profiling(self):
+        return self._profile is not None
+
+    # JSON'a çevrilebilir anlık durum; store verilirse dosya boyutu ve
+    # satır sayıları da eklenir
+    def snapshot(self, store=None):
+        with self._lock:
+            counters = dict(self._counters)
+            timings = {
+                operation: (histogram.cumulative(), histogram.total, histogram.count)
+                for operation, histogram in self._timings.items()
+            }
+        outcomes = {}
+        for (name, labels), value in counters.items():
+            labels = dict(labels)
+            if name == "operations_total":
+                outcomes.setdefault(labels["operation"], {})[labels["outcome"]] = value
+        operations = {}
+        for operation, (buckets, total, count) in sorted(timings.items()):
+            by_outcome = outcomes.get(operation, {})
+            operations[operation] = {
+                "count": count,
+                "sum_ms": total * 1000,
+                "mean_ms": total * 1000 / count if count else 0,
+                "buckets": buckets,
+                "outcomes": by_outcome,
+                "rejection_rate": (count - by_outcome.get("ok", 0)) / count,
+            }
+        return {
+            "buckets": list(BUCKETS),
+            "operations": operations,
+            "counters": [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(counters.items())
+                if name != "operations_total"
+            ],
+            "files": file_stats(store) if store is not None else {},
+            "profiling": self.profiling(),
+        }
+
+
+# Koleksiyon başına diskteki dosyaların toplam boyutu ve satır sayısı
+def file_stats(store):
+    stats = {}
+    for name in COLLECTIONS:
+        collection = getattr(store, name)
+        stats[name] = {
+            "bytes": sum(
+                os.path.getsize(path)
+                for path in collection.files()
+                if os.path.exists(path)
+            ),
+            "rows": len(collection),
+        }
+    return stats
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels.items()) + "}"
+
+
+# snapshot() çıktısını Prometheus metin biçimine çevirir. Aynı metriğin
+# tüm satırları, önünde tek bir TYPE satırıyla art arda yazılır.
+def prometheus(snapshot):
+    operations = snapshot["operations"]
+    lines = ["# TYPE library_operation_seconds histogram"]
+    bounds = [str(bound) for bound in snapshot["buckets"]] + ["+Inf"]
+    for operation, data in operations.items():
+        for bound, count in zip(bounds, data["buckets"]):
+            labels = _labels(operation=operation, le=bound)
+            lines.append(f"library_operation_seconds_bucket{labels} {count}")
+        labels = _labels(operation=operation)
+        seconds = data["sum_ms"] / 1000
+        lines.append(f"library_operation_seconds_sum{labels} {seconds}")
+        lines.append(f"library_operation_seconds_count{labels} {data['count']}")
+    lines.append("# TYPE library_operations_total counter")
+    for operation, data in operations.items():
+        for outcome, value in sorted(data["outcomes"].items()):
+            labels = _labels(operation=operation, outcome=outcome)
+            lines.append(f"library_operations_total{labels} {value}")
+    previous = None
+    for counter in snapshot["counters"]:
+        name = "library_" + counter["name"]
+        if name != previous:
+            lines.append(f"# TYPE {name} counter")
+            previous = name
+        lines.append(f"{name}{_labels(**counter['labels'])} {counter['value']}")
+    for metric, field in (("library_file_bytes", "bytes"), ("library_rows", "rows")):
+        lines.append(f"# TYPE {metric} gauge")
+        for name, data in snapshot["files"].items():
+            lines.append(f"{metric}{_labels(collection=name)} {data[field]}")
+    lines.append("# TYPE library_profiling gauge")
+    lines.append(f"library_profiling {int(snapshot['profiling'])}")
+    return "\n".join(lines) + "\n"
+
+
+def to_json(snapshot):
+    return json.dumps(snapshot, indent=2, ensure_ascii=False)
+
+
+# Süreç genelindeki ölçüm kaydı
+REGISTRY = Metrics()
+count = REGISTRY.count
+observe = REGISTRY.observe
+timer = REGISTRY.timer
+timed = REGISTRY.timed
@@ -0,0 +1,157 @@
+import heapq
+import re
+
+# Türkçe büyük/küçük harf dönüşümü: "I" -> "ı", "İ" -> "i" (str.lower()
+# "İ"yi "i̇" yapar, "I"yı da "i" yapar). Ardından harfler ASCII
+# karşılıklarına indirilir; "isik" yazan da "Işık"ı bulur.
+TURKISH_LOWER = str.maketrans({"I": "ı", "İ": "i"})
+ASCII_FOLD = str.maketrans("ıçğöşüâîû", "icgosuaiu")
+WORD = re.compile(r"\w+")
+
+
+def fold(text):
+    return text.translate(TURKISH_LOWER).lower().translate(ASCII_FOLD)
+
+
+def tokenize(text):
+    return WORD.findall(fold(text))
+
+
+# Kayıt sorguya uyuyor mu: her kelime kitap adı / yazardaki bir terimin
+# önekidir (BookSearchIndex.search ile aynı kural, tek kayıt için)
+def matches(query, record):
+    terms = tokenize(" ".join(record[:2]))
+    return all(any(term.startswith(word) for term in terms) for word in tokenize(query))
+
+
+class _TrieNode:
+    __slots__ = ("children", "term")
+
+    def __init__(self):
+        self.children = {}
+        self.term = None  # bu düğümde biten terim
+
+
+# Terimlerin önek ağacı; bir önekle başlayan tüm terimleri verir
+class PrefixTrie:
+    def __init__(self):
+        self._root = _TrieNode()
+
+    def add(self, term):
+        node = self._root
+        for char in term:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _TrieNode()
+            node = child
+        node.term = term
+
+    def discard(self, term):
+        path = [self._root]
+        for char in term:
+            node = path[-1].children.get(char)
+            if node is None:
+                return
+            path.append(node)
+        path[-1].term = None
+        # Boşalan dalları buda
+        for depth in range(len(term), 0, -1):
+            node = path[depth]
+            if node.term is not None or node.children:
+                break
+            del path[depth - 1].children[term[depth - 1]]
+
+    def terms(self, prefix):
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.term is not None:
+                yield node.term
+            stack.extend(node.children.values())
+
+
+# Kitap adı ve yazar üzerinde ters indeks (terim -> sıra numaraları) ve
+# önek ağacı. Collection.add_index ile bağlanır; ekleme, silme ve diğer
+# kiosklardan okunan değişiklikler indeksi kendiliğinden günceller.
+# Sorgudaki her kelime bir terim öneki olarak eşleşir ("kay se" ->
+# "Kayıp Sessiz ..."); sonuçlar katalog sırasıyla döner.
+class BookSearchIndex:
+    def __init__(self, collection):
+        self._collection = collection
+        self._records = {}  # sıra numarası -> kayıt
+        self._terms = {}  # sıra numarası -> terimler
+        self._postings = {}  # terim -> sıra numaraları
+        self._trie = PrefixTrie()
+
+    def add(self, seq, record):
+        terms = frozenset(tokenize(" ".join(record[:2])))
+        self._records[seq] = record
+        self._terms[seq] = terms
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = set()
+                self._trie.add(term)
+            postings.add(seq)
+
+    def discard(self, seq, record):
+        del self._records[seq]
+        for term in self._terms.pop(seq):
+            postings = self._postings[term]
+            postings.discard(seq)
+            if not postings:
+                del self._postings[term]
+                self._trie.discard(term)
+
+    # (toplam uzunluk, önek, önekle başlayan terimlerin listeleri); toplam
+    # limit'i aşarsa dolaşma yarıda kesilir ve None döner
+    def _postings_for(self, prefix, limit=None):
+        size, postings = 0, []
+        for term in self._trie.terms(prefix):
+            postings.append(self._postings[term])
+            size += len(postings[-1])
+            if limit is not None and size > limit:
+                return None
+        return size, prefix, postings
+
+    # (toplam eşleşme, ilk limit kayıt) döndürür
+    def search(self, query, limit=100):
+        self._collection.load()
+        words = set(tokenize(query))
+        if not words:
+            return len(self._records), self._collection.page(0, limit)
+        # Uzun önekler genelde daha seçicidir; önce onlar dolaşılır ve her
+        # kelime en küçük sonucu aştığı anda bırakılır ("eski 1" gibi
+        # sorgularda "1" ile başlayan binlerce terim gezilmez)
+        estimates, unexpanded = [], []
+        for word in sorted(words, key=len, reverse=True):
+            estimate = self._postings_for(word, estimates[0][0] if estimates else None)
+            if estimate is None:
+                unexpanded.append(word)
+            else:
+                estimates.append(estimate)
+                estimates.sort()
+        if not estimates[0][0]:
+            return 0, []
+        # En az kayda uyan kelimeden başlanır; diğerleri küme kesişimiyle ya da
+        # (listeleri adaylardan çok daha uzunsa) adaylar süzülerek uygulanır
+        candidates = set().union(*estimates[0][2])
+        filters = unexpanded
+        for size, word, postings in estimates[1:]:
+            if size <= 4 * len(candidates):
+                candidates &= set().union(*postings)
+            else:
+                filters.append(word)
+        for word in filters:
+            candidates = {
+                seq
+                for seq in candidates
+                if any(term.startswith(word) for term in self._terms[seq])
+            }
+        first = heapq.nsmallest(limit, candidates)
+        return len(candidates), [self._records[seq] for seq in first]
@@ -0,0 +1,254 @@
+import argparse
+import collections
+import getpass
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+
+# PBKDF2 tur sayısı (iş yükü); LIBRARY_PASSWORD_ITERATIONS ile ayarlanabilir
+DEFAULT_ITERATIONS = int(os.environ.get("LIBRARY_PASSWORD_ITERATIONS", "200000"))
+ALGORITHM = "pbkdf2_sha256"
+
+
+# Saklanan biçim: "pbkdf2_sha256$<tur>$<tuz>$<özet>" (tuz ve özet hex).
+# Virgül içermediği için .txt satırlarına olduğu gibi yazılabilir.
+def hash_password(password, iterations=None):
+    iterations = iterations or DEFAULT_ITERATIONS
+    salt = secrets.token_bytes(16)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+    return f"{ALGORITHM}${iterations}${salt.hex()}${digest.hex()}"
+
+
+def is_hashed(stored):
+    return stored.startswith(ALGORITHM + "$")
+
+
+def verify_password(password, stored):
+    if not is_hashed(stored):
+        # Eski kayıtlar düz metin; girişte özetlenmiş hâle yükseltilir
+        return hmac.compare_digest(password.encode(), stored.encode())
+    _, iterations, salt, digest = stored.split("$")
+    candidate = hashlib.pbkdf2_hmac(
+        "sha256", password.encode(), bytes.fromhex(salt), int(iterations)
+    )
+    return hmac.compare_digest(candidate, bytes.fromhex(digest))
+
+
+def needs_rehash(stored, iterations=None):
+    iterations = iterations or DEFAULT_ITERATIONS
+    return not is_hashed(stored) or int(stored.split("$")[1]) != iterations
+
+
+# Başarılı doğrulamaları kısa süre hatırlayan sınırlı (LRU + TTL) önbellek.
+# Aynı kioskta tekrar giriş yapan öğrenci PBKDF2 maliyetini yeniden ödemez.
+# Parolanın kendisi değil, süreç başına rastgele anahtarla HMAC'i tutulur;
+# anahtar saklanan özeti de içerdiğinden parola değişince kayıt geçersizleşir.
+class VerificationCache:
+    def __init__(self, max_size=1024, ttl=15 * 60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._key = secrets.token_bytes(32)
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def _token(self, password):
+        return hmac.new(self._key, password.encode(), hashlib.sha256).digest()
+
+    def check(self, student_id, stored, password):
+        with self._lock:
+            entry = self._entries.get((student_id, stored))
+            if entry is None:
+                return False
+            token, expires = entry
+            if expires < time.monotonic():
+                del self._entries[(student_id, stored)]
+                return False
+            self._entries.move_to_end((student_id, stored))
+        return hmac.compare_digest(token, self._token(password))
+
+    def remember(self, student_id, stored, password):
+        entry = (self._token(password), time.monotonic() + self.ttl)
+        with self._lock:
+            self._entries[(student_id, stored)] = entry
+            self._entries.move_to_end((student_id, stored))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Anahtar başına jeton kovası: en fazla capacity ani istek, sonra saniyede
+# rate istek. Kova boştayken dolar; dolu kova yeni açılan kovayla aynı
+# olduğundan, dolacak kadar (capacity / rate saniye) dokunulmayan anahtar
+# kayıpsız atılır. Tablo max_keys ile de sınırlıdır (en eski önce gider).
+class RateLimiter:
+    def __init__(self, capacity, rate, max_keys=10000):
+        self.capacity = capacity
+        self.rate = rate
+        self.max_keys = max_keys
+        self._buckets = collections.OrderedDict()  # anahtar -> (jeton, zaman)
+        self._lock = threading.Lock()
+
+    # Jeton alındıysa 0, alınamadıysa yeni jeton için beklenecek saniye
+    def take(self, key, cost=1):
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.pop(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - last) * self.rate)
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / self.rate
+            self._buckets[key] = (tokens, now)
+            idle = self.capacity / self.rate
+            while self._buckets:
+                oldest, (_, last) = next(iter(self._buckets.items()))
+                if len(self._buckets) <= self.max_keys and now - last < idle:
+                    break
+                del self._buckets[oldest]
+        return wait
+
+
+# Başarısız giriş tablosu: anahtar -> (ardışık başarısızlık, kilit bitişi,
+# son deneme). threshold başarısızlıktan sonra anahtar kilitlenir; kilit
+# her yeni başarısızlıkta ikiye katlanır (en fazla maximum saniye). ttl
+# boyunca denenmeyen kayıt atılır; kilit sürerken atılmasın diye ttl en az
+# maximum kadardır.
+class FailedAttempts:
+    def __init__(
+        self, threshold=5, base=30, maximum=15 * 60, ttl=60 * 60, max_keys=10000
+    ):
+        self.threshold = threshold
+        self.base = base
+        self.maximum = maximum
+        self.ttl = max(ttl, maximum)
+        self.max_keys = max_keys
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    # Kilidin bitmesine kalan saniye (kilitli değilse 0)
+    def locked(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+        return max(0.0, entry[1] - time.monotonic()) if entry else 0.0
+
+    # Başarısızlığı kaydeder; anahtar kilitlendiyse kilit süresini döndürür
+    def failed(self, key):
+        now = time.monotonic()
+        with self._lock:
+            count, _, _ = self._entries.pop(key, (0, now, now))
+            count += 1
+            lock = 0
+            if count >= self.threshold:
+                lock = min(self.maximum, self.base * 2 ** (count - self.threshold))
+            self._entries[key] = (count, now + lock, now)
+            while self._entries:
+                oldest, (_, _, last) = next(iter(self._entries.items()))
+                if len(self._entries) <= self.max_keys and now - last < self.ttl:
+                    break
+                del self._entries[oldest]
+        return lock
+
+    def succeeded(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+# Oturum belirteçleri: belirteç -> (kimlik, rol, son kullanım). ttl
+# boyunca kullanılmayan oturum düşer; tablo max_sessions ile sınırlıdır
+# (en uzun süre kullanılmayan önce gider).
+class Sessions:
+    def __init__(self, ttl=8 * 60 * 60, max_sessions=10000):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._sessions = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def issue(self, subject, role):
+        token = secrets.token_urlsafe(32)
+        now = time.monotonic()
+        with self._lock:
+            self._sessions[token] = (subject, role, now)
+            while self._sessions:
+                oldest, (_, _, last) = next(iter(self._sessions.items()))
+                if len(self._sessions) <= self.max_sessions and now - last < self.ttl:
+                    break
+                del self._sessions[oldest]
+        return token
+
+    # (kimlik, rol); oturum yoksa ya da süresi dolduysa None
+    def get(self, token):
+        now = time.monotonic()
+        with self._lock:
+            session = self._sessions.pop(token, None) if token else None
+            if session is None or now - session[2] >= self.ttl:
+                return None
+            self._sessions[token] = (session[0], session[1], now)
+        return session[0], session[1]
+
+    def revoke(self, token):
+        with self._lock:
+            self._sessions.pop(token, None)
+
+
+# Admin hesapları veritabanı klasöründe "kullanıcı,parola özeti" satırları
+# olarak tutulur ve "python security.py admin <kullanıcı>" ile eklenir /
+# değiştirilir. Dosya yoksa yalnızca LIBRARY_ADMIN_USER ve
+# LIBRARY_ADMIN_PASSWORD ikisi de verilmişse onlarla oluşturulur; aksi
+# hâlde hiçbir admin hesabı yoktur (varsayılan parola yok).
+ADMIN_FILE = "admins.txt"
+
+
+def load_admins(path, iterations=None):
+    if not os.path.exists(path):
+        username = os.environ.get("LIBRARY_ADMIN_USER")
+        password = os.environ.get("LIBRARY_ADMIN_PASSWORD")
+        if not username or not password:
+            return {}
+        set_admin(path, username, password, iterations)
+    admins = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            username, _, stored = line.strip().partition(",")
+            if username:
+                admins[username] = stored
+    return admins
+
+
+# Hesabı ekler ya da parolasını değiştirir; dosya atomik olarak yeniden yazılır
+def set_admin(path, username, password, iterations=None):
+    if not username or "," in username or not password:
+        raise ValueError("Geçersiz admin kullanıcı adı veya şifresi.")
+    admins = load_admins(path) if os.path.exists(path) else {}
+    admins[username] = hash_password(password, iterations)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for name, stored in admins.items():
+            f.write(f"{name},{stored}\n")
+    os.replace(tmp_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Admin hesapları")
+    parser.add_argument("--database", default="database")
+    commands = parser.add_subparsers(dest="command", required=True)
+    admin = commands.add_parser("admin", help="admin ekle ya da parolasını değiştir")
+    admin.add_argument("username")
+    args = parser.parse_args()
+
+    password = getpass.getpass("Yeni şifre: ")
+    if password != getpass.getpass("Şifre (tekrar): "):
+        parser.error("Şifreler eşleşmiyor.")
+    os.makedirs(args.database, exist_ok=True)
+    set_admin(os.path.join(args.database, ADMIN_FILE), args.username, password)
+    print(f"{args.username} kaydedildi.")
+
+
+if __name__ == "__main__":
+    main()
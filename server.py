@@ -0,0 +1,199 @@
+import argparse
+import asyncio
+import concurrent.futures
+import inspect
+import json
+import os
+import traceback
+
+import security
+import service
+import storage
+
+# Depo tek bir iş parçacığında çalışır; olay döngüsü disk beklerken
+# diğer istemcilere cevap vermeye devam eder.
+STORE_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    401: "Unauthorized",
+    403: "Forbidden",
+    404: "Not Found",
+    409: "Conflict",
+    429: "Too Many Requests",
+    500: "Internal Server Error",
+}
+
+
+# Tüm çağrılar "POST /api/<metot>" biçimindedir; gövde metot argümanlarını
+# içeren bir JSON nesnesidir. Cevap {"ok": ..., "result"/"error": ...}.
+# login / admin_login cevabında "token" döner; diğer çağrılar bunu
+# "Authorization: Bearer <belirteç>" başlığında gönderir. "logout" oturumu
+# kapatır.
+class ReservationServer:
+    def __init__(self, library, sessions=None):
+        self.library = library
+        self.sessions = sessions or security.Sessions()
+
+    # Öğrenci oturumunda student_id parametresi her zaman oturumun
+    # sahibidir; gövdede başka numara gönderilse de onun adına işlem yapılmaz
+    def authorize(self, method, params, token):
+        if method in service.LibraryService.PUBLIC:
+            return
+        session = self.sessions.get(token)
+        if session is None:
+            raise service.AuthError("Oturum açmanız gerekiyor.")
+        subject, role = session
+        if role == "admin":
+            return
+        if method in service.LibraryService.ADMIN:
+            raise service.ForbiddenError("Bu işlem için yetkiniz yok.")
+        signature = inspect.signature(getattr(service.LibraryService, method))
+        if "student_id" in signature.parameters:
+            params["student_id"] = subject
+
+    # Hız sınırları kiosk olarak istemci adresine göre de tutulur
+    async def call(self, method, params, kiosk="local", token=None):
+        if method == "logout":
+            self.sessions.revoke(token)
+            return 200, {"ok": True, "result": None}
+        if method not in service.LibraryService.API:
+            return 404, {"ok": False, "error": f"Bilinmeyen metot: {method}"}
+        try:
+            self.authorize(method, params, token)
+        except service.ServiceError as e:
+            return e.status, {"ok": False, "error": str(e)}
+
+        def run():
+            self.library.kiosk = kiosk
+            return getattr(self.library, method)(**params)
+
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(STORE_EXECUTOR, run)
+        except service.ServiceError as e:
+            return e.status, {"ok": False, "error": str(e)}
+        except (TypeError, ValueError) as e:
+            return 400, {"ok": False, "error": str(e)}
+        except Exception:
+            # Beklenmeyen hata (ör. depodan OSError): bağlantı koparılmaz,
+            # ayrıntı istemciye değil sunucu çıktısına yazılır
+            traceback.print_exc()
+            return 500, {"ok": False, "error": "Sunucu hatası"}
+        if method in ("login", "admin_login"):
+            role = "admin" if method == "admin_login" else "student"
+            token = self.sessions.issue(result, role)
+            return 200, {"ok": True, "result": result, "token": token}
+        return 200, {"ok": True, "result": result}
+
+    async def handle(self, reader, writer):
+        peer = writer.get_extra_info("peername")
+        kiosk = peer[0] if peer else "local"
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                verb, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                content_type = "application/json; charset=utf-8"
+                authorization = headers.get("authorization", "")
+                token = authorization.partition("Bearer ")[2] or None
+                if verb == "GET" and path == "/metrics":
+                    # Prometheus'un çektiği metin biçimi; /api/metrics_text
+                    # gibi admin belirteci ister
+                    status, payload = await self.call("metrics_text", {}, kiosk, token)
+                    if status == 200:
+                        payload = payload["result"]
+                        content_type = "text/plain; version=0.0.4; charset=utf-8"
+                elif verb != "POST" or not path.startswith("/api/"):
+                    status, payload = 404, {"ok": False, "error": "Bulunamadı"}
+                else:
+                    try:
+                        params = json.loads(body or b"{}")
+                    except ValueError:
+                        params = None
+                    if not isinstance(params, dict):
+                        status, payload = 400, {"ok": False, "error": "Geçersiz JSON"}
+                    else:
+                        status, payload = await self.call(
+                            path[5:], params, kiosk, token
+                        )
+
+                if isinstance(payload, str):
+                    data = payload.encode()
+                else:
+                    data = json.dumps(payload).encode()
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                    "\r\n".encode() + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    # Geçmiş rezervasyonları açılışta ve her interval saniyede bir arşivle
+    async def archive_periodically(self, interval):
+        loop = asyncio.get_running_loop()
+        while True:
+            moved = await loop.run_in_executor(STORE_EXECUTOR, self.library.archive_past)
+            print(f"Arşivlendi: {moved}")
+            await asyncio.sleep(interval)
+
+    async def serve(self, host, port, archive_interval=0):
+        server = await asyncio.start_server(self.handle, host, port)
+        if archive_interval:
+            self.archive_task = asyncio.create_task(
+                self.archive_periodically(archive_interval)
+            )
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rezervasyon HTTP/JSON sunucusu")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--database", default="database")
+    parser.add_argument(
+        "--storage",
+        choices=storage.BACKENDS,
+        default=os.environ.get("LIBRARY_STORAGE", "text"),
+    )
+    parser.add_argument(
+        "--archive-hours",
+        type=float,
+        default=24,
+        help="geçmiş rezervasyonları arşivleme aralığı (0: kapalı)",
+    )
+    args = parser.parse_args()
+
+    store = storage.open_store(args.database, args.storage, import_text=True)
+    store.load_cache()
+    server = ReservationServer(service.LibraryService(store))
+    print(f"Sunucu http://{args.host}:{args.port} adresinde çalışıyor")
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.archive_hours * 3600))
+    finally:
+        STORE_EXECUTOR.submit(store.save_cache).result()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,621 @@
+import datetime
+import itertools
+import math
+import os
+
+import allocation
+import analytics
+import archive
+import availability
+import metrics
+import security
+import storage
+import waitlist
+
+
+class ServiceError(Exception):
+    status = 400
+
+
+class ConflictError(ServiceError):
+    status = 409
+
+
+class RateLimitError(ServiceError):
+    status = 429
+
+
+class AuthError(ServiceError):
+    status = 401
+
+
+class ForbiddenError(ServiceError):
+    status = 403
+
+
+# Jeton kovaları (kapasite, saniyede dolum), öğrenci ve kiosk başına ayrı.
+# "login" giriş denemeleri, "write" kayıt ve rezervasyon istekleri içindir.
+RATE_LIMITS = {
+    ("login", "student"): (5, 1 / 10),
+    ("login", "kiosk"): (30, 1),
+    ("write", "student"): (20, 1),
+    ("write", "kiosk"): (120, 5),
+}
+BOOKING_DAYS = 14  # bugünden en fazla kaç gün sonrası için rezervasyon yapılır
+# Ardışık başarısız girişte kilit: (eşik, ilk kilit sn, en uzun kilit sn)
+LOCKOUT = (5, 30, 15 * 60)
+
+
+def parse_time(time_str):
+    hour, minute = map(int, time_str.split(":"))
+    if not (0 <= hour <= 23 and 0 <= minute <= 59):
+        raise ValueError
+    return hour, minute
+
+
+def check_time_range(start_time, end_time):
+    try:
+        if parse_time(start_time) >= parse_time(end_time):
+            raise ValueError
+    except ValueError:
+        raise ServiceError(
+            "Geçersiz saat formatı veya aralığı. Lütfen HH:MM formatında girin ve başlangıç saatinin bitiş saatinden önce olduğundan emin olun."
+        )
+
+
+def parse_group_size(group_size):
+    try:
+        group_size = int(group_size)
+    except (TypeError, ValueError):
+        raise ServiceError("Kapasite sayı olmalıdır.")
+    if group_size < 1:
+        raise ServiceError("Grup en az bir kişi olmalıdır.")
+    return group_size
+
+
+def parse_priority(priority):
+    try:
+        return int(priority)
+    except (TypeError, ValueError):
+        raise ServiceError("Öncelik sayı olmalıdır.")
+
+
+# Numara ve adlar kayıtlarda metin olarak saklanır; HTTP'den JSON sayısı
+# olarak gelen değer de metne çevrilir ki çakışma ve tekrar kontrolleri
+# aynı anahtarı arasın
+def parse_key(value):
+    return None if value is None else str(value)
+
+
+def parse_date(date_str):
+    if not date_str:
+        raise ServiceError("Lütfen bir tarih seçin.")
+    try:
+        date = datetime.date.fromisoformat(storage.normalize_date(date_str))
+    except (TypeError, ValueError):
+        raise ServiceError("Geçersiz tarih.")
+    return date.isoformat()
+
+
+# Rezervasyon ve bekleme tarihleri bugün ile BOOKING_DAYS gün sonrası
+# arasında olmalıdır (takvim de yalnızca bunları seçtirir)
+def parse_booking_date(date_str):
+    date = parse_date(date_str)
+    today = datetime.date.today()
+    last = today + datetime.timedelta(days=BOOKING_DAYS)
+    if not today.isoformat() <= date <= last.isoformat():
+        raise ServiceError(
+            f"Tarih bugün ile {BOOKING_DAYS} gün sonrası arasında olmalıdır."
+        )
+    return date
+
+
+# Arayüzden bağımsız rezervasyon çekirdeği. Tkinter uygulaması ve HTTP
+# sunucusu aynı metotları çağırır; hatalar ServiceError olarak bildirilir.
+class LibraryService:
+    # HTTP üzerinden çağrılabilen metotlar
+    API = (
+        "register_user",
+        "login",
+        "admin_login",
+        "list_books",
+        "search_books",
+        "list_tables",
+        "add_book",
+        "add_table",
+        "delete_book",
+        "delete_table",
+        "check_book_conflict",
+        "check_table_conflict",
+        "free_table_slots",
+        "free_tables",
+        "best_table",
+        "reserve_best_table",
+        "allocate_tables",
+        "table_availability",
+        "reserve_book",
+        "reserve_table",
+        "reserve_batch",
+        "user_reservations",
+        "list_reservations",
+        "cancel_reservation",
+        "wait_for_book",
+        "wait_for_table",
+        "user_waitlist",
+        "leave_waitlist",
+        "page",
+        "archive_past",
+        "archived_reservations",
+        "analytics",
+        "analytics_csv",
+        "metrics",
+        "metrics_text",
+        "profile",
+    )
+
+    # HTTP'de oturumsuz çağrılabilenler; ADMIN yalnızca admin oturumuyla,
+    # diğerleri öğrenci oturumuyla çağrılır ve student_id oturumdan gelir
+    PUBLIC = ("register_user", "login", "admin_login")
+    ADMIN = (
+        "add_book",
+        "add_table",
+        "delete_book",
+        "delete_table",
+        "allocate_tables",
+        "list_reservations",
+        "page",
+        "archive_past",
+        "archived_reservations",
+        "analytics",
+        "analytics_csv",
+        "metrics",
+        "metrics_text",
+        "profile",
+    )
+
+    # Sayfalı listelerde kullanılabilecek koleksiyonlar
+    PAGED = ("books", "tables", "book_reservations", "table_reservations")
+
+    # Çağrıyı yapan kiosk; HTTP sunucusu her çağrıdan önce istemci adresini
+    # yazar (çağrılar tek depolama iş parçacığında sırayla çalışır)
+    kiosk = "local"
+
+    # limits=False hız sınırlarını ve kilitlemeyi kapatır (ölçümler için)
+    def __init__(self, store, password_iterations=None, limits=True):
+        self.store = store
+        self.password_iterations = password_iterations
+        self.login_cache = security.VerificationCache()
+        self.limiters = {}
+        self.failures = None
+        if limits:
+            self.limiters = {
+                key: security.RateLimiter(capacity, rate)
+                for key, (capacity, rate) in RATE_LIMITS.items()
+            }
+            self.failures = security.FailedAttempts(*LOCKOUT)
+        self.admins_path = os.path.join(
+            os.path.dirname(store.users.path), security.ADMIN_FILE
+        )
+        self.history = analytics.Analytics(store)
+
+    def _reservations(self, kind):
+        if kind == "book":
+            return self.store.book_reservations
+        if kind == "table":
+            return self.store.table_reservations
+        raise ServiceError(f"Bilinmeyen rezervasyon türü: {kind}")
+
+    def _waitlist(self, kind):
+        self._reservations(kind)
+        return getattr(self.store, f"{kind}_waitlist")
+
+    # İstek öğrencinin ve kioskun kovasından birer jeton alır; biri boşsa
+    # depoya hiç gidilmez. Öğrencisi olmayan çağrılar (admin, yerel) yalnızca
+    # kioskun kovasından alır.
+    def _limit(self, action, student_id):
+        for scope, key in (("student", student_id), ("kiosk", self.kiosk)):
+            if key is None:
+                continue
+            limiter = self.limiters.get((action, scope))
+            wait = limiter.take(key) if limiter else 0
+            if wait:
+                metrics.count("rate_limited_total", action=action, scope=scope)
+                raise RateLimitError(
+                    f"Çok fazla istek. {math.ceil(wait)} saniye sonra tekrar deneyin."
+                )
+
+    def _check_lockout(self, key):
+        remaining = self.failures.locked(key) if self.failures else 0
+        if remaining:
+            raise RateLimitError(
+                "Çok fazla hatalı giriş. "
+                f"{math.ceil(remaining)} saniye sonra tekrar deneyin."
+            )
+
+    # HTTP istemcisi arayüzün listelemediği kitap ya da masayı da
+    # gönderebilir; rezervasyon yazan işlem içinde çağrılır
+    def _check_book(self, book_name):
+        if not self.store.books.contains(book_name):
+            raise ServiceError(f"Böyle bir kitap yok: {book_name}")
+
+    def _check_table(self, table_id):
+        if not self.store.tables.contains(table_id):
+            raise ServiceError(f"Böyle bir masa yok: {table_id}")
+
+    def _failed_login(self, key, message):
+        if self.failures and self.failures.failed(key):
+            metrics.count("login_lockouts_total")
+        raise ServiceError(message)
+
+    def _logged_in(self, key):
+        if self.failures:
+            self.failures.succeeded(key)
+
+    def register_user(self, student_id, password):
+        student_id = parse_key(student_id)
+        self._limit("write", student_id)
+        if not student_id or not password:
+            raise ServiceError("Öğrenci numarası ve şifre gerekli.")
+        password_hash = security.hash_password(password, self.password_iterations)
+        if self.store.register_user(student_id, password_hash) is None:
+            raise ConflictError("Kullanıcı zaten kayıtlı.")
+        return student_id
+
+    # Olmayan numaraya yapılan denemeler de sayılır; cevap aynıdır
+    def login(self, student_id, password):
+        student_id = parse_key(student_id)
+        self._check_lockout(student_id)
+        self._limit("login", student_id)
+        self.store.users.refresh()
+        user = self.store.users.get(student_id)
+        if user is None:
+            self._failed_login(student_id, "Hatalı öğrenci numarası veya şifre.")
+        stored = user[1]
+        if self.login_cache.check(student_id, stored, password):
+            self._logged_in(student_id)
+            return student_id
+        if not security.verify_password(password, stored):
+            self._failed_login(student_id, "Hatalı öğrenci numarası veya şifre.")
+        # Düz metin ya da eski iş yüküyle saklanan parolayı yükselt
+        if security.needs_rehash(stored, self.password_iterations):
+            stored = security.hash_password(password, self.password_iterations)
+            self.store.update_user_password(student_id, stored)
+        self.login_cache.remember(student_id, stored, password)
+        self._logged_in(student_id)
+        return student_id
+
+    # Admin hesapları veritabanı klasöründeki özetli dosyadadır (bkz.
+    # security.load_admins); öğrenci girişiyle aynı sınırlar uygulanır
+    def admin_login(self, username, password):
+        username = parse_key(username)
+        key = ("admin", username)
+        self._check_lockout(key)
+        self._limit("login", key)
+        admins = security.load_admins(self.admins_path, self.password_iterations)
+        if not admins:
+            raise ServiceError(
+                "Admin hesabı yok; 'python security.py admin <kullanıcı>' ile"
+                " oluşturun."
+            )
+        stored = admins.get(username)
+        if stored is None or not security.verify_password(password, stored):
+            self._failed_login(key, "Geçersiz admin bilgileri!")
+        if security.needs_rehash(stored, self.password_iterations):
+            security.set_admin(
+                self.admins_path, username, password, self.password_iterations
+            )
+        self._logged_in(key)
+        return username
+
+    def list_books(self):
+        self.store.refresh()
+        return self.store.books.all()
+
+    # Yazarken arama: her tuşta çağrılır, yalnızca ilk limit kayıt döner
+    def search_books(self, query, limit=100):
+        self.store.books.refresh()
+        total, rows = self.store.search_books(query, limit)
+        return {"total": total, "rows": rows}
+
+    def list_tables(self):
+        self.store.refresh()
+        return self.store.tables.all()
+
+    def add_book(self, book_name, author_name):
+        if not book_name or not author_name:
+            raise ServiceError("Kitap adı ve yazar adı gerekli.")
+        return self.store.books.insert((book_name, author_name))
+
+    def add_table(self, capacity):
+        if not capacity:
+            raise ServiceError("Masa kapasitesi gerekli.")
+        try:
+            capacity = int(capacity)
+        except ValueError:
+            raise ServiceError("Kapasite sayı olmalıdır.")
+        return self.store.add_table(capacity)
+
+    def delete_book(self, book):
+        return self.store.books.remove(book)
+
+    def delete_table(self, table):
+        return self.store.tables.remove(table)
+
+    def check_book_conflict(self, book_name, date):
+        return self.store.check_book_conflict(parse_key(book_name), parse_date(date))
+
+    def check_table_conflict(self, table_id, date, start_time, end_time):
+        return self.store.check_table_conflict(
+            table_id, parse_date(date), start_time, end_time
+        )
+
+    def free_table_slots(self, table_id, date):
+        return self.store.free_table_slots(table_id, parse_date(date))
+
+    def free_tables(self, date, start_time, end_time, min_capacity=1):
+        date = parse_date(date)
+        check_time_range(start_time, end_time)
+        try:
+            min_capacity = int(min_capacity)
+        except ValueError:
+            raise ServiceError("Kapasite sayı olmalıdır.")
+        self.store.refresh()
+        return self.store.free_tables(date, start_time, end_time, min_capacity)
+
+    # Grubun sığdığı boş masalardan en uygunu (en küçük yeterli kapasite);
+    # yoksa None
+    def best_table(self, date, start_time, end_time, group_size):
+        date = parse_date(date)
+        check_time_range(start_time, end_time)
+        self.store.refresh()
+        return allocation.best_table(
+            self.store, date, start_time, end_time, parse_group_size(group_size)
+        )
+
+    # Masayı öğrenci seçmez: grup büyüklüğüne göre en uygun boş masa ayrılır
+    def reserve_best_table(self, student_id, date, start_time, end_time, group_size):
+        student_id = parse_key(student_id)
+        self._limit("write", student_id)
+        date = parse_booking_date(date)
+        check_time_range(start_time, end_time)
+        reservation = allocation.reserve_best_table(
+            self.store,
+            student_id,
+            date,
+            start_time,
+            end_time,
+            parse_group_size(group_size),
+        )
+        if reservation is None:
+            raise ConflictError("Bu saat aralığında grubunuza uygun boş masa yok.")
+        return reservation
+
+    # Bir günün grup isteklerini [(öğrenci, grup, başlangıç, bitiş)] toplu
+    # yerleştirir (bkz. allocation.pack). Yerleşenler yazılır, rejected
+    # yerleşemeyen isteklerin sıra numaralarıdır.
+    def allocate_tables(self, date, requests, strategy="optimized"):
+        self._limit("write", None)
+        date = parse_booking_date(date)
+        if strategy not in allocation.STRATEGIES:
+            raise ServiceError(f"Bilinmeyen yerleştirme: {strategy}")
+        requests = [
+            (parse_key(student_id), parse_group_size(group_size), start_time, end_time)
+            for student_id, group_size, start_time, end_time in requests
+        ]
+        for _, _, start_time, end_time in requests:
+            check_time_range(start_time, end_time)
+        reservations, rejected = allocation.allocate_day(
+            self.store, date, requests, strategy
+        )
+        if rejected:
+            metrics.count("allocation_rejected_total", len(rejected))
+        return {"reservations": reservations, "rejected": rejected}
+
+    # Isı haritası: dilim uzunluğu ve masa başına dolu dilimler
+    def table_availability(self, date):
+        date = parse_date(date)
+        self.store.refresh()
+        return {
+            "slot_minutes": availability.SLOT_MINUTES,
+            "rows": self.store.table_availability(date),
+        }
+
+    def reserve_book(self, student_id, book_name, date):
+        student_id, book_name = parse_key(student_id), parse_key(book_name)
+        self._limit("write", student_id)
+        date = parse_booking_date(date)
+        with self.store.transaction():
+            self._check_book(book_name)
+            reservation = self.store.reserve_book(student_id, book_name, date)
+        if reservation is None:
+            raise ConflictError("Bu kitap zaten o tarihte rezerve edilmiş!")
+        return reservation
+
+    def reserve_table(self, student_id, table_id, date, start_time, end_time):
+        student_id, table_id = parse_key(student_id), parse_key(table_id)
+        self._limit("write", student_id)
+        date = parse_booking_date(date)
+        check_time_range(start_time, end_time)
+        with self.store.transaction():
+            self._check_table(table_id)
+            reservation = self.store.reserve_table(
+                student_id, table_id, date, start_time, end_time
+            )
+        if reservation is None:
+            raise ConflictError("Bu masa zaten belirtilen saat aralığında dolu!")
+        return reservation
+
+    # Birden çok gün/masa için tek seferde rezervasyon. items: kitapta
+    # [(kitap, tarih)], masada [(masa, tarih, başlangıç, bitiş)]. Ya hepsi
+    # yazılır ya hiçbiri; conflicts çakışan öğelerin sıra numaralarıdır.
+    def reserve_batch(self, student_id, kind, items):
+        student_id = parse_key(student_id)
+        self._limit("write", student_id)
+        self._reservations(kind)
+        if not items:
+            raise ServiceError("Rezervasyon listesi boş.")
+        if kind == "book":
+            items = [
+                (parse_key(book_name), parse_booking_date(date))
+                for book_name, date in items
+            ]
+            with self.store.transaction():
+                for book_name, _ in items:
+                    self._check_book(book_name)
+                reservations, conflicts = self.store.reserve_books(student_id, items)
+        else:
+            items = [
+                (parse_key(table_id), parse_booking_date(date), start_time, end_time)
+                for table_id, date, start_time, end_time in items
+            ]
+            for _, _, start_time, end_time in items:
+                check_time_range(start_time, end_time)
+            with self.store.transaction():
+                for table_id, _, _, _ in items:
+                    self._check_table(table_id)
+                reservations, conflicts = self.store.reserve_tables(student_id, items)
+        if conflicts:
+            metrics.count("batch_conflicts_total", len(conflicts), kind=kind)
+        return {"reservations": reservations, "conflicts": conflicts}
+
+    def user_reservations(self, kind, student_id):
+        self.store.refresh()
+        return self.store.user_reservations(
+            self._reservations(kind), parse_key(student_id)
+        )
+
+    def list_reservations(self, kind):
+        self.store.refresh()
+        return self._reservations(kind).all()
+
+    def page(self, name, offset, limit):
+        if name not in self.PAGED:
+            raise ServiceError(f"Bilinmeyen liste: {name}")
+        collection = getattr(self.store, name)
+        if offset == 0:
+            collection.refresh()
+        return {"total": len(collection), "rows": collection.page(offset, limit)}
+
+    # Rezervasyonun kalıcı kimliği kaydın son alanıdır. İptaller raporlar
+    # için arşivdeki iptal günlüğüne yazılır.
+    # student_id verilirse başkasının kaydı iptal edilemez (HTTP
+    # sunucusu öğrenci oturumlarında bunu oturumdan doldurur)
+    def cancel_reservation(self, kind, reservation_id, student_id=None):
+        student_id = parse_key(student_id)
+        self._limit("write", student_id)
+        reservation = self.store.cancel_reservation(
+            self._reservations(kind), str(reservation_id), student_id
+        )
+        if reservation is not None:
+            archive.record_cancellation(
+                self.store, f"{kind}_reservations", reservation
+            )
+        return reservation is not None
+
+    # Dolu kitap günü / masa saati için sıraya girer; kaynak bu arada
+    # boşaldıysa doğrudan rezerve edilir. Sıradaki bekleyen, kaynak iptalle
+    # boşaldığı anda otomatik olarak rezervasyon alır. Küçük öncelik önce.
+    def _waited(self, result):
+        reservation, entry = result
+        if reservation is None and entry is None:
+            raise ConflictError("Zaten bekleme listesindesiniz.")
+        return {"reservation": reservation, "waiting": entry}
+
+    def wait_for_book(
+        self, student_id, book_name, date, priority=waitlist.DEFAULT_PRIORITY
+    ):
+        student_id, book_name = parse_key(student_id), parse_key(book_name)
+        self._limit("write", student_id)
+        date = parse_booking_date(date)
+        priority = parse_priority(priority)
+        with self.store.transaction():
+            self._check_book(book_name)
+            result = self.store.wait_for_book(student_id, book_name, date, priority)
+        return self._waited(result)
+
+    def wait_for_table(
+        self,
+        student_id,
+        table_id,
+        date,
+        start_time,
+        end_time,
+        priority=waitlist.DEFAULT_PRIORITY,
+    ):
+        student_id, table_id = parse_key(student_id), parse_key(table_id)
+        self._limit("write", student_id)
+        date = parse_booking_date(date)
+        check_time_range(start_time, end_time)
+        priority = parse_priority(priority)
+        with self.store.transaction():
+            self._check_table(table_id)
+            result = self.store.wait_for_table(
+                student_id, table_id, date, start_time, end_time, priority
+            )
+        return self._waited(result)
+
+    def user_waitlist(self, kind, student_id):
+        self.store.refresh()
+        return self.store.user_reservations(
+            self._waitlist(kind), parse_key(student_id)
+        )
+
+    def leave_waitlist(self, kind, entry_id, student_id=None):
+        student_id = parse_key(student_id)
+        self._limit("write", student_id)
+        entry = self.store.cancel_reservation(
+            self._waitlist(kind), str(entry_id), student_id
+        )
+        return entry is not None
+
+    # Bugünden önceki rezervasyonları aylık gzip arşivlerine taşır
+    def archive_past(self):
+        return archive.archive_past(self.store)
+
+    # Arşivdeki rezervasyonlar (admin raporları); en fazla limit kayıt
+    def archived_reservations(
+        self, kind, date_from=None, date_to=None, student_id=None, limit=1000
+    ):
+        self._reservations(kind)
+        records = archive.query(
+            self.store,
+            f"{kind}_reservations",
+            parse_date(date_from) if date_from else None,
+            parse_date(date_to) if date_to else None,
+            parse_key(student_id),
+        )
+        return list(itertools.islice(records, limit))
+
+    # Sıcak dosyalar ve arşiv üzerinden rezervasyon istatistikleri; en
+    # fazla top kitap ve kullanıcı
+    def analytics(self, top=20):
+        return analytics.report(self.history.summary(), len(self.store.tables), top)
+
+    # Aynı rapor CSV olarak
+    def analytics_csv(self, top=100):
+        return analytics.to_csv(self.analytics(top))
+
+    # İşlem süreleri, sonuç sayıları, dosya boyutları ve satır sayıları
+    def metrics(self):
+        return metrics.REGISTRY.snapshot(self.store)
+
+    # Prometheus metin biçimi
+    def metrics_text(self):
+        return metrics.prometheus(self.metrics())
+
+    # cProfile'ı açar; kapatırken en pahalı limit çağrının dökümünü döndürür.
+    # Servis çağrıları depolama iş parçacığında çalıştığından o izlenir.
+    def profile(self, enabled, limit=30):
+        if enabled:
+            metrics.REGISTRY.start_profile()
+            return ""
+        return metrics.REGISTRY.stop_profile(limit)
+
+
+# Her API çağrısının süresi ve sonucu (ok / hata türü) ölçülür
+for _name in LibraryService.API:
+    setattr(
+        LibraryService,
+        _name,
+        metrics.timed("service." + _name)(getattr(LibraryService, _name)),
+    )
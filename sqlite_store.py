@@ -0,0 +1,804 @@
+import contextlib
+import datetime
+import os
+import sqlite3
+import sys
+import threading
+
+import availability
+import events
+import intervals
+import metrics
+import search
+import storage
+import waitlist
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    student_id TEXT NOT NULL UNIQUE,
+    password TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS books (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    author TEXT NOT NULL,
+    terms TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS books_name ON books (name);
+CREATE TABLE IF NOT EXISTS study_tables (
+    id INTEGER PRIMARY KEY,
+    table_id TEXT NOT NULL UNIQUE,
+    capacity TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS book_reservations (
+    id INTEGER PRIMARY KEY,
+    student_id TEXT NOT NULL,
+    book_name TEXT NOT NULL,
+    date TEXT NOT NULL,
+    UNIQUE (book_name, date)
+);
+CREATE INDEX IF NOT EXISTS book_reservations_student
+    ON book_reservations (student_id);
+CREATE TABLE IF NOT EXISTS table_reservations (
+    id INTEGER PRIMARY KEY,
+    student_id TEXT NOT NULL,
+    table_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    end_time TEXT NOT NULL,
+    start_min INTEGER NOT NULL,
+    end_min INTEGER NOT NULL,
+    CHECK (start_min < end_min)
+);
+CREATE INDEX IF NOT EXISTS table_reservations_slot
+    ON table_reservations (table_id, date, start_min);
+CREATE INDEX IF NOT EXISTS table_reservations_student
+    ON table_reservations (student_id);
+CREATE TRIGGER IF NOT EXISTS table_reservations_overlap
+BEFORE INSERT ON table_reservations
+WHEN EXISTS (
+    SELECT 1 FROM table_reservations
+    WHERE table_id = NEW.table_id
+      AND date = NEW.date
+      AND start_min < NEW.end_min
+      AND end_min > NEW.start_min
+)
+BEGIN
+    SELECT RAISE(ABORT, 'table reservation overlap');
+END;
+CREATE TABLE IF NOT EXISTS book_waitlist (
+    id INTEGER PRIMARY KEY,
+    student_id TEXT NOT NULL,
+    book_name TEXT NOT NULL,
+    date TEXT NOT NULL,
+    priority INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS book_waitlist_queue
+    ON book_waitlist (book_name, date, priority, id);
+CREATE INDEX IF NOT EXISTS book_waitlist_student ON book_waitlist (student_id);
+CREATE TABLE IF NOT EXISTS table_waitlist (
+    id INTEGER PRIMARY KEY,
+    student_id TEXT NOT NULL,
+    table_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    end_time TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    start_min INTEGER NOT NULL,
+    end_min INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS table_waitlist_queue
+    ON table_waitlist (table_id, date, priority, id);
+CREATE INDEX IF NOT EXISTS table_waitlist_student ON table_waitlist (student_id);
+"""
+
+
+class _Rollback(Exception):
+    pass
+
+
+# Kitap aramasında kullanılan katlanmış terimler: " kayip sehir 0 yazar 0".
+# Baştaki boşluk sayesinde "LIKE '% önek%'" yalnızca kelime başlarında eşleşir.
+def search_terms(text):
+    return " " + " ".join(search.tokenize(text))
+
+
+# storage.Collection ile aynı arayüzü sunan SQLite tablosu.
+# Kayıtlar metin dosyalarındaki satırlarla aynı biçimde (str demetleri) döner.
+# id_column verilirse kaydın son alanı o sütundaki kalıcı kimliktir.
+class SqliteCollection:
+    def __init__(
+        self,
+        store,
+        topic,
+        path,
+        table,
+        columns,
+        key_columns,
+        extra=None,
+        id_column=None,
+    ):
+        self.topic = topic  # olay konusu (koleksiyon adı)
+        self.path = path
+        self._store = store
+        self._table = table
+        self._columns = columns
+        self._key_columns = key_columns
+        self._extra = extra  # kayıttan türetilen ek sütunlar (ad -> fonksiyon)
+        self._id_column = id_column
+        self._selected = ", ".join(columns + ((id_column,) if id_column else ()))
+
+    def _select(self, where="", params=(), limit=""):
+        cursor = self._store.connect().execute(
+            f"SELECT {self._selected} FROM {self._table} {where}"
+            f" ORDER BY rowid {limit}",
+            params,
+        )
+        return [tuple(map(str, row)) for row in cursor]
+
+    def load(self):
+        self._store.connect()
+
+    # Veri her sorguda veritabanından okunur; eşitlenecek bellek yok
+    def refresh(self):
+        pass
+
+    # Tüm tablolar aynı veritabanı dosyasındadır
+    def files(self):
+        return [self._store.db_path, self._store.db_path + "-wal"]
+
+    def __len__(self):
+        return self._store.connect().execute(
+            f"SELECT COUNT(*) FROM {self._table}"
+        ).fetchone()[0]
+
+    def all(self):
+        return self._select()
+
+    def page(self, offset, limit):
+        return self._select(params=(limit, offset), limit="LIMIT ? OFFSET ?")
+
+    def where(self, column, value):
+        return self._select(f"WHERE {column} = ?", (value,))
+
+    def find(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        condition = " AND ".join(f"{c} = ?" for c in self._key_columns)
+        return self._select(f"WHERE {condition}", key)
+
+    def get(self, key):
+        records = self.find(key)
+        return records[0] if records else None
+
+    def contains(self, key):
+        return bool(self.find(key))
+
+    def _row(self, record):
+        record = tuple(map(str, record))
+        names = list(self._columns)
+        values = list(record[: len(self._columns)])
+        if self._id_column and len(record) > len(self._columns):
+            names.append(self._id_column)
+            values.append(record[len(self._columns)])
+        for name, derive in (self._extra or {}).items():
+            names.append(name)
+            values.append(derive(record))
+        return record, names, values
+
+    def _insert(self, conn, record):
+        record, names, values = self._row(record)
+        cursor = conn.execute(
+            f"INSERT INTO {self._table} ({', '.join(names)}) "
+            f"VALUES ({', '.join('?' for _ in names)})",
+            values,
+        )
+        if self._id_column and len(record) == len(self._columns):
+            record += (str(cursor.lastrowid),)
+        self._store.publish(self.topic, events.INSERT, record)
+        return record
+
+    def insert(self, record):
+        with self._store.transaction() as conn:
+            return self._insert(conn, record)
+
+    # Metin deposundaki gibi: kayıtları tek işlemde ekleyip döndürür
+    def insert_group(self, records):
+        with self._store.transaction() as conn:
+            return [self._insert(conn, record) for record in records]
+
+    # Tek işlemde (ya hepsi ya hiçbiri) ekler; records tembel bir dizi olabilir
+    def insert_many(self, records):
+        count = 0
+        with self._store.transaction() as conn:
+            for record in records:
+                self._insert(conn, record)
+                count += 1
+        return count
+
+    def __iter__(self):
+        cursor = self._store.connect().execute(
+            f"SELECT {self._selected} FROM {self._table} ORDER BY rowid"
+        )
+        return (tuple(map(str, row)) for row in cursor)
+
+    # Silinen satırları (olay olarak yayınlanmak üzere) döndürür
+    def _delete(self, conn, where, params):
+        cursor = conn.execute(
+            f"DELETE FROM {self._table} WHERE {where} RETURNING {self._selected}",
+            params,
+        )
+        deleted = [tuple(map(str, row)) for row in cursor]
+        for record in deleted:
+            self._store.publish(self.topic, events.DELETE, record)
+        return deleted
+
+    # Kimliği olan kayıt yalnızca kendi satırıyla eşleşir (metin deposundaki
+    # gibi); aynı değerli başka bir kitap ya da masa satırı silinmez
+    def remove_many(self, records):
+        width = len(self._columns)
+        removed = 0
+        with self._store.transaction() as conn:
+            for record in records:
+                record = tuple(map(str, record))
+                columns = self._columns
+                if self._id_column and len(record) > width:
+                    columns += (self._id_column,)
+                condition = " AND ".join(f"{c} = ?" for c in columns)
+                removed += len(self._delete(conn, condition, record[: len(columns)]))
+        return removed
+
+    def remove(self, record):
+        return self.remove_many([record]) > 0
+
+
+class SqliteStore:
+    def __init__(
+        self,
+        db_path,
+        users,
+        books,
+        tables,
+        book_reservations,
+        table_reservations,
+        book_waitlist=None,
+        table_waitlist=None,
+    ):
+        folder = os.path.dirname(users)
+        self.db_path = db_path
+        self._conn = None
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._pending = []  # işlem onaylanınca yayınlanacak olaylar
+        self._data_version = None
+        # Her kaydın son alanı satırın kalıcı kimliğidir (id sütunu)
+        self.users = SqliteCollection(
+            self,
+            "users",
+            users,
+            "users",
+            ("student_id", "password"),
+            ("student_id",),
+            id_column="id",
+        )
+        self.books = SqliteCollection(
+            self,
+            "books",
+            books,
+            "books",
+            ("name", "author"),
+            ("name",),
+            extra={"terms": lambda book: search_terms(" ".join(book[:2]))},
+            id_column="id",
+        )
+        self.tables = SqliteCollection(
+            self,
+            "tables",
+            tables,
+            "study_tables",
+            ("table_id", "capacity"),
+            ("table_id",),
+            id_column="id",
+        )
+        self.book_reservations = SqliteCollection(
+            self,
+            "book_reservations",
+            book_reservations,
+            "book_reservations",
+            ("student_id", "book_name", "date"),
+            ("book_name", "date"),
+            id_column="id",
+        )
+        self.table_reservations = SqliteCollection(
+            self,
+            "table_reservations",
+            table_reservations,
+            "table_reservations",
+            ("student_id", "table_id", "date", "start_time", "end_time"),
+            ("table_id", "date"),
+            extra={
+                "start_min": lambda res: intervals.to_minutes(res[3]),
+                "end_min": lambda res: intervals.to_minutes(res[4]),
+            },
+            id_column="id",
+        )
+        self.book_waitlist = SqliteCollection(
+            self,
+            "book_waitlist",
+            book_waitlist or os.path.join(folder, "book_waitlist.txt"),
+            "book_waitlist",
+            ("student_id", "book_name", "date", "priority"),
+            ("book_name", "date"),
+            id_column="id",
+        )
+        self.table_waitlist = SqliteCollection(
+            self,
+            "table_waitlist",
+            table_waitlist or os.path.join(folder, "table_waitlist.txt"),
+            "table_waitlist",
+            (
+                "student_id",
+                "table_id",
+                "date",
+                "start_time",
+                "end_time",
+                "priority",
+            ),
+            ("table_id", "date"),
+            extra={
+                "start_min": lambda entry: intervals.to_minutes(entry[3]),
+                "end_min": lambda entry: intervals.to_minutes(entry[4]),
+            },
+            id_column="id",
+        )
+        self._by_path = {
+            c.path: c
+            for c in (
+                self.users,
+                self.books,
+                self.tables,
+                self.book_reservations,
+                self.table_reservations,
+                self.book_waitlist,
+                self.table_waitlist,
+            )
+        }
+
+    def connect(self):
+        if self._conn is None:
+            # Kilitli veritabanında hata vermek yerine bekle
+            self._conn = sqlite3.connect(
+                self.db_path, timeout=30, isolation_level=None, check_same_thread=False
+            )
+            self._conn.executescript(SCHEMA)
+            # Arama sütunu sonradan eklendi; eski veritabanlarında doldurulur
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(books)")]
+            if "terms" not in columns:
+                self._conn.create_function("search_terms", 1, search_terms)
+                self._conn.executescript(
+                    "BEGIN IMMEDIATE;"
+                    "ALTER TABLE books ADD COLUMN terms TEXT NOT NULL DEFAULT '';"
+                    "UPDATE books SET terms = search_terms(name || ' ' || author);"
+                    "COMMIT;"
+                )
+            # Eski users tablosunda kalıcı kimlik yoktu; rowid'lerle taşınır
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(users)")]
+            if "id" not in columns:
+                self._conn.executescript(
+                    "BEGIN IMMEDIATE;"
+                    "ALTER TABLE users RENAME TO users_old;"
+                    "CREATE TABLE users (id INTEGER PRIMARY KEY,"
+                    " student_id TEXT NOT NULL UNIQUE, password TEXT NOT NULL);"
+                    "INSERT INTO users (id, student_id, password)"
+                    " SELECT rowid, student_id, password FROM users_old;"
+                    "DROP TABLE users_old;"
+                    "COMMIT;"
+                )
+        return self._conn
+
+    # BEGIN IMMEDIATE yazma kilidini hemen alır; kontrol ve yazma adımları
+    # diğer kiosklara karşı tek parça çalışır. İç içe çağrılabilir.
+    @contextlib.contextmanager
+    def transaction(self):
+        with self._lock:
+            conn = self.connect()
+            if self._depth:
+                self._depth += 1
+                try:
+                    yield conn
+                finally:
+                    self._depth -= 1
+                return
+            conn.execute("BEGIN IMMEDIATE")
+            self._depth = 1
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                self._pending.clear()
+                raise
+            else:
+                conn.execute("COMMIT")
+                pending, self._pending = self._pending, []
+                for event in pending:
+                    events.publish(*event)
+            finally:
+                self._depth = 0
+
+    # Geri alınan işlemin olayları hiç yayınlanmaz
+    def publish(self, topic, op, record):
+        self._pending.append((topic, op, record))
+
+    # Başka bir süreç yazdıysa (data_version değişir) hangi satırların
+    # değiştiği bilinmez; açık pencereler RELOAD olayıyla yeniden yükler
+    def poll_changes(self):
+        with self._lock:
+            version = self.connect().execute("PRAGMA data_version").fetchone()[0]
+        if self._data_version is not None and version != self._data_version:
+            for topic in events.TOPICS:
+                events.publish(topic, events.RELOAD)
+        self._data_version = version
+
+    # Veriler bellekte tutulmadığından anlık görüntü önbelleği yoktur
+    def save_cache(self):
+        pass
+
+    def load_cache(self):
+        return False
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def collection(self, file_path):
+        return self._by_path[file_path]
+
+    # Metin deposuyla uyum için; SQLite kendi dosyasını yönetir
+    def refresh(self):
+        pass
+
+    def compact(self):
+        pass
+
+    # Tarihi geçmiş bekleyenler artık yer alamaz
+    def evict_past(self, today=None):
+        today = storage.normalize_date(today or datetime.date.today())
+        with self.transaction() as conn:
+            for collection in (self.book_waitlist, self.table_waitlist):
+                collection._delete(conn, "date < ?", (today,))
+
+    # Rezervasyon çakışma kontrolleri
+    @metrics.timed("storage.check_book_conflict")
+    def check_book_conflict(self, book_name, date):
+        return self.book_reservations.contains((book_name, storage.normalize_date(date)))
+
+    @metrics.timed("storage.check_table_conflict")
+    def check_table_conflict(self, table_id, date, start_time, end_time):
+        row = self.connect().execute(
+            "SELECT EXISTS (SELECT 1 FROM table_reservations"
+            " WHERE table_id = ? AND date = ? AND start_min < ? AND end_min > ?)",
+            (
+                str(table_id),
+                storage.normalize_date(date),
+                intervals.to_minutes(end_time),
+                intervals.to_minutes(start_time),
+            ),
+        ).fetchone()
+        return bool(row[0])
+
+    def free_table_slots(self, table_id, date):
+        busy = self.connect().execute(
+            "SELECT start_min, end_min FROM table_reservations"
+            " WHERE table_id = ? AND date = ? ORDER BY start_min",
+            (str(table_id), storage.normalize_date(date)),
+        ).fetchall()
+        return [
+            (intervals.format_minutes(start), intervals.format_minutes(end))
+            for start, end in intervals.free_slots(busy)
+        ]
+
+    # Kitap adı/yazarda önekli arama: (toplam, ilk limit kayıt).
+    # terms sütunu taranır; metin deposundaki bellek indeksi kadar hızlı
+    # değildir ama katlama kuralları aynıdır.
+    def search_books(self, query, limit=100):
+        words = search.tokenize(query)
+        if not words:
+            return len(self.books), self.books.page(0, limit)
+        condition = "WHERE " + " AND ".join("terms LIKE ? ESCAPE '!'" for _ in words)
+        params = ["% " + word.replace("_", "!_") + "%" for word in words]
+        total = self.connect().execute(
+            f"SELECT COUNT(*) FROM books {condition}", params
+        ).fetchone()[0]
+        return total, self.books._select(condition, params + [limit], "LIMIT ?")
+
+    def free_tables(self, date, start_time, end_time, min_capacity=1):
+        rows = self.connect().execute(
+            "SELECT table_id FROM study_tables WHERE CAST(capacity AS INTEGER) >= ?"
+            " AND table_id NOT IN (SELECT table_id FROM table_reservations"
+            " WHERE date = ? AND start_min < ? AND end_min > ?)",
+            (
+                min_capacity,
+                storage.normalize_date(date),
+                intervals.to_minutes(end_time),
+                intervals.to_minutes(start_time),
+            ),
+        )
+        return sorted((row[0] for row in rows), key=storage._table_order)
+
+    def day_tables(self, date, table_ids=None):
+        date = storage.normalize_date(date)
+        conn = self.connect()
+        capacities = {
+            table[0]: availability.capacity(table)
+            for table in conn.execute("SELECT table_id, capacity FROM study_tables")
+        }
+        if table_ids is None:
+            table_ids = sorted(capacities, key=storage._table_order)
+        busy = {}
+        for table_id, start, end in conn.execute(
+            "SELECT table_id, start_min, end_min FROM table_reservations"
+            " WHERE date = ? ORDER BY start_min",
+            (date,),
+        ):
+            busy.setdefault(table_id, []).append((start, end))
+        return {
+            table_id: (capacities[table_id], busy.get(table_id, []))
+            for table_id in table_ids
+        }
+
+    def table_availability(self, date):
+        busy = {}
+        for table_id, start, end in self.connect().execute(
+            "SELECT table_id, start_min, end_min FROM table_reservations WHERE date = ?",
+            (storage.normalize_date(date),),
+        ):
+            slots = busy.setdefault(table_id, [0] * availability.SLOTS)
+            first, last = availability.slot_range(start, end)
+            for slot in range(first, last):
+                slots[slot] = 1
+        tables = sorted(
+            self.tables.all(), key=lambda table: storage._table_order(table[0])
+        )
+        return [
+            (
+                table[0],
+                table[1],
+                "".join(map(str, busy.get(table[0], [0] * availability.SLOTS))),
+            )
+            for table in tables
+        ]
+
+    def reservations_before(self, collection, date):
+        return collection._select("WHERE date < ?", (storage.normalize_date(date),))
+
+    def user_reservations(self, collection, student_id):
+        return collection.where("student_id", student_id)
+
+    # Boşalan kitap günü / masa saati aynı işlem içinde bekleyenlere verilir
+    def cancel_reservation(self, collection, reservation_id, student_id=None):
+        where, params = "id = ?", (str(reservation_id),)
+        if student_id is not None:
+            where, params = where + " AND student_id = ?", params + (student_id,)
+        with self.transaction() as conn:
+            deleted = collection._delete(conn, where, params)
+            promoted = []
+            for reservation in deleted:
+                if collection is self.book_reservations:
+                    promoted += self._promote_book(conn, *reservation[1:3])
+                elif collection is self.table_reservations:
+                    promoted += self._promote_tables(conn, *reservation[1:3])
+            if promoted:
+                metrics.count("waitlist_promotions_total", len(promoted))
+        return deleted[0] if deleted else None
+
+    # Sıradaki bekleyen: (öncelik, kimlik) sırasında koşula uyan ilk satır.
+    # Sıra indeksi sayesinde tablo taranmaz.
+    def _first_waiter(self, collection, where, params):
+        row = self.connect().execute(
+            f"SELECT {collection._selected} FROM {collection._table} AS w"
+            f" WHERE {where} ORDER BY priority, id LIMIT 1",
+            params,
+        ).fetchone()
+        return tuple(map(str, row)) if row else None
+
+    def wait_for_book(
+        self, student_id, book_name, date, priority=waitlist.DEFAULT_PRIORITY
+    ):
+        date = storage.normalize_date(date)
+        with self.transaction():
+            reservation = self.reserve_book(student_id, book_name, date)
+            if reservation is not None:
+                return reservation, None
+            if self._first_waiter(
+                self.book_waitlist,
+                "student_id = ? AND book_name = ? AND date = ?",
+                (student_id, book_name, date),
+            ):
+                return None, None
+            return None, self.book_waitlist.insert(
+                (student_id, book_name, date, priority)
+            )
+
+    def wait_for_table(
+        self,
+        student_id,
+        table_id,
+        date,
+        start_time,
+        end_time,
+        priority=waitlist.DEFAULT_PRIORITY,
+    ):
+        slot = (str(table_id), storage.normalize_date(date), start_time, end_time)
+        with self.transaction():
+            reservation = self.reserve_table(student_id, *slot)
+            if reservation is not None:
+                return reservation, None
+            if self._first_waiter(
+                self.table_waitlist,
+                "student_id = ? AND table_id = ? AND date = ?"
+                " AND start_time = ? AND end_time = ?",
+                (student_id,) + slot,
+            ):
+                return None, None
+            return None, self.table_waitlist.insert((student_id,) + slot + (priority,))
+
+    # Önce bekleme kaydı silinir, sonra rezervasyon eklenir (aynı işlemde)
+    def _promote(self, conn, waiting, reservations, waiter):
+        waiting._delete(conn, "id = ?", (waiter[-1],))
+        return reservations._insert(conn, waiter[: len(reservations._columns)])
+
+    def _promote_book(self, conn, book_name, date):
+        if self.check_book_conflict(book_name, date):
+            return []
+        waiter = self._first_waiter(
+            self.book_waitlist, "book_name = ? AND date = ?", (book_name, date)
+        )
+        if waiter is None:
+            return []
+        return [self._promote(conn, self.book_waitlist, self.book_reservations, waiter)]
+
+    # Artık sığan bekleyenlerden en öndeki alır; sığan kalmayana kadar
+    def _promote_tables(self, conn, table_id, date):
+        promoted = []
+        while True:
+            waiter = self._first_waiter(
+                self.table_waitlist,
+                "table_id = ? AND date = ? AND NOT EXISTS ("
+                " SELECT 1 FROM table_reservations AS r"
+                " WHERE r.table_id = w.table_id AND r.date = w.date"
+                " AND r.start_min < w.end_min AND r.end_min > w.start_min)",
+                (table_id, date),
+            )
+            if waiter is None:
+                return promoted
+            promoted.append(
+                self._promote(
+                    conn, self.table_waitlist, self.table_reservations, waiter
+                )
+            )
+
+    # Kontrol + yazma işlemleri; çakışma varsa None döner
+    def register_user(self, student_id, password):
+        try:
+            return self.users.insert((student_id, password))
+        except sqlite3.IntegrityError:
+            return None
+
+    def update_user_password(self, student_id, password):
+        with self.transaction() as conn:
+            old = self.users.get(student_id)
+            conn.execute(
+                "UPDATE users SET password = ? WHERE student_id = ?",
+                (password, student_id),
+            )
+            new = self.users.get(student_id)
+            if old is not None:
+                self.publish("users", events.DELETE, old)
+                self.publish("users", events.INSERT, new)
+        return new
+
+    def add_table(self, capacity):
+        with self.transaction():
+            return self.tables.insert((storage.next_table_id(self.tables), capacity))
+
+    def reserve_book(self, student_id, book_name, date):
+        try:
+            return self.book_reservations.insert(
+                (student_id, book_name, storage.normalize_date(date))
+            )
+        except sqlite3.IntegrityError:
+            return None
+
+    def reserve_table(self, student_id, table_id, date, start_time, end_time):
+        try:
+            return self.table_reservations.insert(
+                (student_id, table_id, storage.normalize_date(date), start_time, end_time)
+            )
+        except sqlite3.IntegrityError:
+            return None
+
+    # Toplu rezervasyon: tek işlemde eklenir; kısıta takılan her öğe
+    # kaydedilir ve herhangi biri takılırsa işlem geri alınır
+    def _reserve_many(self, collection, records):
+        conflicts, inserted = [], []
+        try:
+            with self.transaction() as conn:
+                for i, record in enumerate(records):
+                    try:
+                        inserted.append(collection._insert(conn, record))
+                    except sqlite3.IntegrityError:
+                        conflicts.append(i)
+                if conflicts:
+                    raise _Rollback
+        except _Rollback:
+            return [], conflicts
+        return inserted, []
+
+    def reserve_books(self, student_id, items):
+        return self._reserve_many(
+            self.book_reservations,
+            [
+                (student_id, book_name, storage.normalize_date(date))
+                for book_name, date in items
+            ],
+        )
+
+    def reserve_tables(self, student_id, items):
+        return self._reserve_many(
+            self.table_reservations,
+            [
+                (student_id, table_id, storage.normalize_date(date), start_time, end_time)
+                for table_id, date, start_time, end_time in items
+            ],
+        )
+
+    # Mevcut .txt dosyalarını tek seferde veritabanına aktarır.
+    # Kısıtlara takılan (yinelenen veya çakışan) satırlar atlanıp sayılır.
+    def import_text_files(self):
+        source = storage.Store(
+            users=self.users.path,
+            books=self.books.path,
+            tables=self.tables.path,
+            book_reservations=self.book_reservations.path,
+            table_reservations=self.table_reservations.path,
+        )
+        counts = {}
+        for name in (
+            "users",
+            "books",
+            "tables",
+            "book_reservations",
+            "table_reservations",
+            "book_waitlist",
+            "table_waitlist",
+        ):
+            target = getattr(self, name)
+            imported = skipped = 0
+            with self.transaction() as conn:
+                for record in getattr(source, name).all():
+                    try:
+                        target._insert(conn, record)
+                        imported += 1
+                    except (sqlite3.IntegrityError, ValueError, IndexError):
+                        skipped += 1
+            counts[name] = (imported, skipped)
+        return counts
+
+
+if __name__ == "__main__":
+    # Kullanım: python sqlite_store.py [veritabanı klasörü]
+    folder = sys.argv[1] if len(sys.argv) > 1 else "database"
+    store = SqliteStore(
+        os.path.join(folder, "library.db"),
+        users=os.path.join(folder, "users.txt"),
+        books=os.path.join(folder, "books.txt"),
+        tables=os.path.join(folder, "tables.txt"),
+        book_reservations=os.path.join(folder, "book_reservations.txt"),
+        table_reservations=os.path.join(folder, "table_reservations.txt"),
+    )
+    started = datetime.datetime.now()
+    for name, (imported, skipped) in store.import_text_files().items():
+        print(f"{name}: {imported} aktarıldı, {skipped} atlandı")
+    print(f"Süre: {datetime.datetime.now() - started}")
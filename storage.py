@@ -0,0 +1,1169 @@
+import contextlib
+import datetime
+import gc
+import hashlib
+import itertools
+import operator
+import os
+import pickle
+import sys
+import threading
+
+import availability
+import events
+import intervals
+import metrics
+import search
+import waitlist
+
+
+CACHE_VERSION = 3  # önbellekteki durumun biçimi değişince artırılır
+
+
+# Takvimden gelen "dd.mm.yyyy" tarihleri dosyadaki "yyyy-mm-dd" biçimine çevir
+def normalize_date(date):
+    if isinstance(date, datetime.date):
+        return date.isoformat()
+    date = str(date)
+    if "." in date:
+        return datetime.datetime.strptime(date, "%d.%m.%Y").date().isoformat()
+    return date
+
+
+# Alanlardaki "\\", "," ve satır sonu kaçışlanır; kitap adında virgül olabilir.
+# Kaçış içermeyen satırlar (neredeyse hepsi) doğrudan bölünür.
+def parse_line(line):
+    if "\\" not in line:
+        return tuple(line.split(","))
+    fields, field, chars = [], [], iter(line)
+    for char in chars:
+        if char == "\\":
+            char = next(chars, "")
+            field.append("\n" if char == "n" else char)
+        elif char == ",":
+            fields.append("".join(field))
+            field = []
+        else:
+            field.append(char)
+    fields.append("".join(field))
+    return tuple(fields)
+
+
+def _escape(value):
+    value = str(value)
+    if "\\" in value or "," in value or "\n" in value:
+        value = value.replace("\\", "\\\\").replace(",", "\\,").replace("\n", "\\n")
+    return value
+
+
+def format_record(record):
+    return ",".join(map(_escape, record))
+
+
+# Önbellekler paylaşılan veritabanı klasörüne değil bu makinede
+# kullanıcıya özel klasöre yazılır: pickle okumak kod çalıştırabilir ve
+# veritabanı klasörüne diğer kiosklar da yazar. Dosya adı klasörün mutlak
+# yolundan türetilir; LIBRARY_CACHE_DIR ile yer değiştirilebilir.
+def local_cache_path(folder, name):
+    root = os.environ.get("LIBRARY_CACHE_DIR")
+    if not root:
+        base = (
+            os.environ.get("LOCALAPPDATA")
+            or os.environ.get("XDG_CACHE_HOME")
+            or os.path.join(os.path.expanduser("~"), ".cache")
+        )
+        root = os.path.join(base, "kutuphane")
+    digest = hashlib.sha256(os.path.abspath(folder).encode()).hexdigest()[:16]
+    return os.path.join(root, f"{digest}-{name}")
+
+
+def _file_identity(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None, 0
+    return (stat.st_dev, stat.st_ino), stat.st_size
+
+
+# Dosyayı geçici bir kopyaya yazıp tek adımda yerine koyar; okuyan başka
+# bir süreç hiçbir zaman yarım yazılmış dosya görmez. header (sabit
+# genişlikte satır döndüren fonksiyon) verilirse ilk satıra önce yer
+# tutucu yazılır, satırlar tükendikten sonra başa dönülüp üzerine yazılır;
+# böylece tembel satırlar belleğe alınmadan başlık onlara göre hesaplanır.
+def atomic_write(path, lines, header=None):
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            if header is not None:
+                f.write(header() + "\n")
+            for line in lines:
+                f.write(line + "\n")
+            if header is not None:
+                f.seek(0)
+                f.write(header() + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+
+
+def _lock_file(f):
+    if os.name == "nt":
+        import msvcrt
+
+        f.seek(0)
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+    else:
+        import fcntl
+
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+
+def _unlock_file(f):
+    if os.name == "nt":
+        import msvcrt
+
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+# Aynı veritabanı klasörünü kullanan tüm süreçler (kiosklar) arasında
+# paylaşılan özel kilit. Aynı süreç içinde iç içe alınabilir.
+class FileLock:
+    def __init__(self, path):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._file = open(self.path, "a+")
+                _lock_file(self._file)
+            except BaseException:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0:
+            _unlock_file(self._file)
+            self._file.close()
+            self._file = None
+        self._thread_lock.release()
+
+
+# Kayıtları ve anahtar / satır indekslerini bellekte tutan ortak taban.
+# Dosyanın okunması (_scan) ve yazılması alt sınıflardadır: metin satırları
+# (Collection) ya da sabit genişlikli yuvalar (binfile.BinaryCollection).
+class MemoryCollection:
+    def __init__(self, path, key=None, lock=None):
+        self.path = path
+        self.key = key
+        self._lock = lock or contextlib.nullcontext()
+        self._records = {}  # sıra numarası -> kayıt
+        self._by_row = {}  # kayıt -> sıra numaraları
+        self._by_key = {}  # anahtar -> sıra numaraları
+        self._indexes = []  # add/discard çağrılan ikincil indeksler
+        self._next_seq = 0
+        self._loaded = False
+        self._identity = None
+
+    def add_index(self, index):
+        self._indexes.append(index)
+        return index
+
+    # Anlık görüntü önbelleğine kilitsiz yazılır; Store kilidi geri takar
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_lock"] = None
+        return state
+
+    def _load(self):
+        if not self._loaded:
+            self.sync()
+
+    # Kilit beklemesi de ölçülür: kiosklar arasındaki çekişme burada görünür
+    @metrics.timed("storage.sync")
+    def sync(self):
+        with self._lock:
+            self._loaded = True
+            self._scan()
+
+    # Koleksiyonun diskteki dosyaları (ölçümler için)
+    def files(self):
+        return [self.path]
+
+    # Yüklenmiş koleksiyonu diskteki son hâle getirir
+    def refresh(self):
+        if self._loaded:
+            self.sync()
+
+    def _reset(self):
+        for seq in list(self._records):
+            self._discard(seq)
+        self._identity = None
+
+    def _add(self, record):
+        seq = self._next_seq
+        self._next_seq += 1
+        self._records[seq] = record
+        self._by_row.setdefault(record, set()).add(seq)
+        if self.key is not None:
+            self._by_key.setdefault(self.key(record), set()).add(seq)
+        for index in self._indexes:
+            index.add(seq, record)
+        return seq
+
+    def _discard(self, seq):
+        record = self._records.pop(seq)
+        keyed = [(self._by_row, record)]
+        if self.key is not None:
+            keyed.append((self._by_key, self.key(record)))
+        for index, key in keyed:
+            seqs = index[key]
+            seqs.discard(seq)
+            if not seqs:
+                del index[key]
+        for index in self._indexes:
+            index.discard(seq, record)
+        return record
+
+    def load(self):
+        self._load()
+
+    def __len__(self):
+        self._load()
+        return len(self._records)
+
+    # Kayıtları kopyalamadan gezer; dışa aktarma sırasında koleksiyon
+    # değişmesin diye çağıran taraf kilidi (Store.transaction) tutmalıdır
+    def __iter__(self):
+        self._load()
+        return iter(self._records.values())
+
+    def all(self):
+        self._load()
+        return list(self._records.values())
+
+    # Yalnızca istenen penceredeki kayıtları döndürür (sayfalı listeler için)
+    def page(self, offset, limit):
+        self._load()
+        return list(itertools.islice(self._records.values(), offset, offset + limit))
+
+    def find(self, key):
+        self._load()
+        return [self._records[seq] for seq in sorted(self._by_key.get(key, ()))]
+
+    def get(self, key):
+        records = self.find(key)
+        return records[0] if records else None
+
+    def contains(self, key):
+        self._load()
+        return key in self._by_key
+
+    # Kaydı dosyaya yazılacak biçime getirir (kilit altında çağrılır)
+    def _prepare(self, record):
+        return tuple(map(str, record))
+
+    # Kaydı yenisiyle değiştirir; eski kayıt yoksa None
+    def replace(self, old, new):
+        with self._lock:
+            if not self.remove(old):
+                return None
+            return self.insert(new)
+
+
+# Tek bir veri dosyasını bellekte tutan koleksiyon.
+# Dosya ilk erişimde bir kez okunur, eklemeler dosyanın sonuna yazılır.
+# Başka süreçlerin yaptığı değişiklikler sync() ile (kilit altında) okunur:
+# dosya yerinde büyümüşse yalnızca yeni satırlar, değiştirilmişse tamamı.
+class Collection(MemoryCollection):
+    def __init__(self, path, key=None, lock=None):
+        super().__init__(path, key, lock)
+        self._offset = 0
+
+    def _reset(self):
+        super()._reset()
+        self._offset = 0
+
+    def _scan(self):
+        identity, size = _file_identity(self.path)
+        if identity != self._identity or size < self._offset:
+            self._reset()
+            self._identity = identity
+        if identity is None or size == self._offset:
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read()
+        # Kilit altında okunduğundan sonu satır sonuyla bitmeyen kısım elle
+        # düzenlenmiş bir dosyadan gelir; kayıt sayılır ve satır tamamlanır.
+        if not data.endswith(b"\n"):
+            with open(self.path, "ab") as f:
+                f.write(b"\n")
+            data += b"\n"
+        self._offset += len(data)
+        for line in data.decode().splitlines():
+            line = line.strip()
+            if line:
+                self._add(parse_line(line))
+
+    @metrics.timed("storage.rewrite")
+    def _rewrite(self, lines=None):
+        if lines is None:
+            lines = map(format_record, self._records.values())
+        atomic_write(self.path, lines)
+        self._identity, self._offset = _file_identity(self.path)
+
+    def insert(self, record):
+        with self._lock:
+            self.sync()
+            record = self._prepare(record)
+            with open(self.path, "a") as f:
+                f.write(format_record(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._identity, self._offset = _file_identity(self.path)
+            self._add(record)
+        return record
+
+    def _insert_stream(self, records, added):
+        for record in records:
+            record = self._prepare(record)
+            added.append(self._add(record))
+            yield format_record(record)
+
+    # Çok sayıda kaydı tek yazmada ekler: mevcut kayıtlar ve yenileri geçici
+    # dosyaya akıtılıp atomik olarak yerine konur (ya hepsi ya hiçbiri).
+    # records tembel bir dizi olabilir; kilit altında tüketildiğinden
+    # içindeki contains() kontrolleri bu toplu eklemedeki kayıtları da görür.
+    def insert_many(self, records):
+        added = []
+        with self._lock:
+            self.sync()
+            existing = map(format_record, list(self._records.values()))
+            try:
+                self._rewrite(
+                    itertools.chain(existing, self._insert_stream(records, added))
+                )
+            except BaseException:
+                for seq in added:
+                    self._discard(seq)
+                raise
+        return len(added)
+
+    # Verilen kayıtların hepsini tek yeniden yazmayla siler
+    def remove_many(self, records):
+        with self._lock:
+            self.sync()
+            removed = 0
+            for record in records:
+                for seq in list(self._by_row.get(tuple(map(str, record)), ())):
+                    self._discard(seq)
+                    removed += 1
+            if removed:
+                self._rewrite()
+        return removed
+
+    # Kayda birebir eşit tüm satırları siler
+    def remove(self, record):
+        record = tuple(map(str, record))
+        with self._lock:
+            self.sync()
+            seqs = self._by_row.get(record)
+            if not seqs:
+                return False
+            for seq in list(seqs):
+                self._discard(seq)
+            self._rewrite()
+        return True
+
+
+# Bir alana göre ikincil indeks: değer -> {sıra numarası: kayıt}.
+# Ör. öğrenci numarası -> rezervasyonları; listeleme koleksiyon boyutundan
+# bağımsız olarak yalnızca o değerin kayıt sayısı kadar sürer.
+class FieldIndex:
+    def __init__(self, position):
+        self.position = position
+        self._records = {}
+
+    def add(self, seq, record):
+        self._records.setdefault(record[self.position], {})[seq] = record
+
+    def discard(self, seq, record):
+        records = self._records.get(record[self.position])
+        if records is None:
+            return
+        records.pop(seq, None)
+        if not records:
+            del self._records[record[self.position]]
+
+    def records(self, value):
+        return list(self._records.get(value, {}).values())
+
+
+# Kitap rezervasyonları için tarihe göre kovalanmış çakışma indeksi:
+# tarih -> {kitap adı: kayıt sayısı}. Takvim yalnızca bugünden itibaren
+# 14 gün seçtirdiğinden geçmiş tarihlerin kovaları bellekten atılabilir;
+# atılmış bir tarih sorulursa koleksiyon taranarak cevaplanır.
+class DateBucketIndex:
+    def __init__(self, collection):
+        self._collection = collection
+        self._buckets = {}
+        self._evicted_before = None
+
+    def _is_evicted(self, date):
+        return self._evicted_before is not None and date < self._evicted_before
+
+    def add(self, seq, record):
+        book, date = record[1], record[2]
+        if self._is_evicted(date):
+            return
+        bucket = self._buckets.setdefault(date, {})
+        bucket[book] = bucket.get(book, 0) + 1
+
+    def discard(self, seq, record):
+        book, date = record[1], record[2]
+        bucket = self._buckets.get(date)
+        if bucket is None or book not in bucket:
+            return
+        bucket[book] -= 1
+        if not bucket[book]:
+            del bucket[book]
+        if not bucket:
+            del self._buckets[date]
+
+    def contains(self, book, date):
+        self._collection.load()
+        if self._is_evicted(date):
+            return any(
+                res[1] == book and res[2] == date for res in self._collection.all()
+            )
+        return book in self._buckets.get(date, ())
+
+    def evict_before(self, date):
+        self._collection.load()
+        self._evicted_before = max(self._evicted_before or date, date)
+        for old in [d for d in self._buckets if d < self._evicted_before]:
+            del self._buckets[old]
+
+
+# Rezervasyon dosyaları için eklemeli günlük (journal).
+# Ekleme ve iptal, günlüğe tek satır + fsync olarak yazılır; günlük belirli
+# bir uzunluğa ulaşınca anlık görüntüye (asıl .txt dosyası) katlanır.
+# Günlük satırı: "<lsn>,+,alanlar" (ekleme) veya "<lsn>,-,alanlar" (silme).
+# Anlık görüntünün ilk satırı "#lsn,<n>" ise n'e kadarki kayıtlar zaten
+# görüntüye işlenmiştir, tekrar oynatılmaz.
+# fields verilirse (kimlik hariç alan sayısı) her kayda son alan olarak
+# kalıcı bir kimlik eklenir. Kimlik, lsn sayacından alınır; bu yüzden
+# süreçler arasında tekildir ve silinen bir kaydın kimliği tekrar verilmez.
+class JournalCollection(Collection):
+    def __init__(
+        self, path, key=None, lock=None, compact_threshold=1000, fields=None
+    ):
+        super().__init__(path, key, lock)
+        self.log_path = os.path.splitext(path)[0] + ".log"
+        self.compact_threshold = compact_threshold
+        self.fields = fields
+        self._lsn = 0
+        self._log_entries = 0
+        self._log_offset = 0
+        self._missing_ids = 0  # kimliği olmayan (eski biçim) kayıt sayısı
+
+    def _prepare(self, record):
+        record = super()._prepare(record)
+        if self.fields is not None and len(record) == self.fields:
+            self._lsn += 1
+            record += (str(self._lsn),)
+        return record
+
+    def _add(self, record):
+        if self.fields is not None and len(record) == self.fields:
+            self._missing_ids += 1
+        return super()._add(record)
+
+    def _discard(self, seq):
+        record = super()._discard(seq)
+        if self.fields is not None and len(record) == self.fields:
+            self._missing_ids -= 1
+        return record
+
+    def sync(self):
+        with self._lock:
+            super().sync()
+            if self._missing_ids:
+                self._assign_ids()
+
+    def files(self):
+        return [self.path, self.log_path]
+
+    # Eski biçimdeki kayıtlara kimlik verip dosyayı yeniden yazar. Sıra
+    # korunsun diye tüm kayıtlar aynı sırayla yeniden eklenir.
+    def _assign_ids(self):
+        records = list(self._records.values())
+        for seq in list(self._records):
+            self._discard(seq)
+        for record in records:
+            self._add(self._prepare(record))
+        self._rewrite()
+
+    def _reset(self):
+        super()._reset()
+        self._lsn = 0
+        self._log_entries = 0
+        self._log_offset = 0
+
+    def _scan(self):
+        identity, size = _file_identity(self.path)
+        log_size = _file_identity(self.log_path)[1]
+        if identity != self._identity or log_size < self._log_offset:
+            # Anlık görüntü değişti (başka bir süreç katladı): baştan oku
+            self._reset()
+            self._identity = identity
+            if identity is not None:
+                self._read_snapshot()
+        if log_size > self._log_offset:
+            self._replay()
+
+    def _read_snapshot(self):
+        with open(self.path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("#lsn,"):
+                    self._lsn = int(line[5:])
+                elif line:
+                    self._add(parse_line(line))
+
+    def _replay(self):
+        snapshot_lsn = self._lsn
+        with open(self.log_path, "rb") as f:
+            f.seek(self._log_offset)
+            data = f.read()
+        lines = data.split(b"\n")[:-1]  # son parça: boş ya da yarım satır
+        consumed = i = 0
+        while i < len(lines):
+            # "[,<n>" başlığından sonraki n satır bir gruptur; grubun tamamı
+            # yazılmamışsa hiçbiri uygulanmaz
+            count = int(lines[i][2:]) if lines[i].startswith(b"[,") else 0
+            group = lines[i : i + 1 + count]
+            if len(group) < 1 + count:
+                break
+            for raw in group[1:] if count else group:
+                lsn, op, rest = raw.decode().split(",", 2)
+                lsn = int(lsn)
+                self._log_entries += 1
+                if lsn <= snapshot_lsn:
+                    continue
+                self._lsn = lsn
+                self._apply(op, parse_line(rest))
+            consumed += sum(len(raw) + 1 for raw in group)
+            i += len(group)
+        self._log_offset += consumed
+        # Yarım kalmış son satır ya da grup (çökme) kilit altında güvenle kesilebilir
+        if consumed < len(data):
+            with open(self.log_path, "r+b") as f:
+                f.truncate(self._log_offset)
+
+    def _apply(self, op, record):
+        if op == "+":
+            self._add(record)
+        else:
+            for seq in list(self._by_row.get(record, ())):
+                self._discard(seq)
+
+    # Birden çok kayıt "[,<n>" başlıklı tek grup olarak yazılır; çökmede
+    # ya hepsi ya hiçbiri geri oynatılır
+    @metrics.timed("storage.journal_write")
+    def _append(self, entries):
+        lines = [f"[,{len(entries)}\n"] if len(entries) > 1 else []
+        for op, record in entries:
+            self._lsn += 1
+            lines.append(f"{self._lsn},{op},{format_record(record)}\n")
+        with open(self.log_path, "a") as f:
+            f.write("".join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+            self._log_offset = f.tell()
+        self._log_entries += len(entries)
+
+    def _maybe_compact(self):
+        if self._log_entries >= self.compact_threshold:
+            self.compact()
+
+    def insert(self, record):
+        with self._lock:
+            self.sync()
+            record = self._prepare(record)
+            self._append([("+", record)])
+            self._add(record)
+            self._maybe_compact()
+        return record
+
+    # Birkaç kaydı günlüğe tek grup olarak ekler (toplu rezervasyon).
+    # Büyük içe aktarmalar için akışlı insert_many daha uygundur.
+    def insert_group(self, records):
+        with self._lock:
+            self.sync()
+            records = [self._prepare(record) for record in records]
+            self._append([("+", record) for record in records])
+            for record in records:
+                self._add(record)
+            self._maybe_compact()
+        return records
+
+    def remove(self, record):
+        record = tuple(map(str, record))
+        with self._lock:
+            self.sync()
+            if record not in self._by_row:
+                return False
+            self._append([("-", record)])
+            self._apply("-", record)
+            self._maybe_compact()
+        return True
+
+    # Günlüğü anlık görüntüye katla: önce görüntü atomik olarak yazılır,
+    # sonra günlük boşaltılır. Arada çökme olursa lsn başlığı sayesinde
+    # günlükteki kayıtlar ikinci kez uygulanmaz. Toplu eklemede satırlar
+    # yazılırken _prepare kimlik verip lsn'i ilerletir; başlık bu yüzden
+    # sabit genişlikte yazılır ve akış bitince son lsn ile düzeltilir.
+    @metrics.timed("storage.rewrite")
+    def _rewrite(self, lines=None):
+        if lines is None:
+            lines = map(format_record, self._records.values())
+        atomic_write(self.path, lines, header=lambda: f"#lsn,{self._lsn:020d}")
+        with open(self.log_path, "w") as f:
+            f.flush()
+            os.fsync(f.fileno())
+        self._identity = _file_identity(self.path)[0]
+        self._log_offset = 0
+        self._log_entries = 0
+
+    def compact(self):
+        with self._lock:
+            self.sync()
+            self._rewrite()
+
+
+class Store:
+    def __init__(
+        self,
+        users,
+        books,
+        tables,
+        book_reservations,
+        table_reservations,
+        book_waitlist=None,
+        table_waitlist=None,
+    ):
+        folder, extension = os.path.dirname(users), os.path.splitext(users)[1]
+        self.lock = FileLock(os.path.join(folder, ".lock"))
+        self.cache_path = local_cache_path(
+            folder, f"{type(self).__name__.lower()}.cache"
+        )
+        # Her kaydın son alanı kalıcı kimliğidir (bkz. JournalCollection)
+        # Anahtar fonksiyonları itemgetter'dır: anlık görüntü önbelleği
+        # (pickle) lambda'ları kaydedemez
+        first, last = operator.itemgetter(0), operator.itemgetter(-1)
+        self.users = self._collection("users", users, first, 2)
+        self.books = self._collection("books", books, first, 2)
+        self.book_search = self.books.add_index(search.BookSearchIndex(self.books))
+        self.tables = self._collection("tables", tables, first, 2)
+        self.table_bits = availability.TableBits()
+        self.table_capacities = self.tables.add_index(
+            availability.CapacityIndex(self.table_bits)
+        )
+        # Rezervasyonların anahtarı kalıcı kimliktir
+        self.book_reservations = self._collection(
+            "book_reservations", book_reservations, last, 3
+        )
+        self.book_dates = self.book_reservations.add_index(
+            DateBucketIndex(self.book_reservations)
+        )
+        self.table_reservations = self._collection(
+            "table_reservations", table_reservations, last, 5
+        )
+        self.table_intervals = self.table_reservations.add_index(
+            intervals.IntervalIndex()
+        )
+        # IntervalIndex'ten sonra eklenmeli: silmede kalan aralıkları oradan okur
+        self.table_grid = self.table_reservations.add_index(
+            availability.AvailabilityGrid(self.table_bits, self.table_intervals)
+        )
+        # Bekleme listeleri: (öğrenci, kaynak..., öncelik, kimlik); sıra
+        # kitapta (kitap, tarih), masada (masa, tarih, saat aralığı) başına
+        self.book_waitlist = self._collection(
+            "book_waitlist",
+            book_waitlist or os.path.join(folder, "book_waitlist" + extension),
+            last,
+            4,
+        )
+        self.book_queue = self.book_waitlist.add_index(
+            waitlist.WaitQueue(operator.itemgetter(1, 2))
+        )
+        self.table_waitlist = self._collection(
+            "table_waitlist",
+            table_waitlist or os.path.join(folder, "table_waitlist" + extension),
+            last,
+            6,
+        )
+        self.table_queue = self.table_waitlist.add_index(
+            waitlist.WaitQueue(
+                operator.itemgetter(1, 2, 3, 4), group=operator.itemgetter(1, 2)
+            )
+        )
+        self._by_student = {
+            c.path: c.add_index(FieldIndex(0))
+            for c in (
+                self.book_reservations,
+                self.table_reservations,
+                self.book_waitlist,
+                self.table_waitlist,
+            )
+        }
+        # Her ekleme / silme açık pencerelere olay olarak bildirilir
+        for name in events.TOPICS:
+            getattr(self, name).add_index(events.Publisher(name))
+        self._stamps = None  # poll_changes() için dosya boyut / zamanları
+        self._by_path = {
+            c.path: c
+            for c in (
+                self.users,
+                self.books,
+                self.tables,
+                self.book_reservations,
+                self.table_reservations,
+                self.book_waitlist,
+                self.table_waitlist,
+            )
+        }
+
+    # fields: kimlik hariç alan sayısı
+    def _collection(self, name, path, key, fields):
+        return JournalCollection(path, key=key, lock=self.lock, fields=fields)
+
+    def collection(self, file_path):
+        return self._by_path[file_path]
+
+    # Diğer süreçlerin yazdıklarını okuyup belleği güncelle
+    def refresh(self):
+        with self.lock:
+            for collection in self._by_path.values():
+                collection.refresh()
+
+    # Kontrol ve yazma adımlarını tüm süreçlere karşı tek parça yapar
+    @contextlib.contextmanager
+    def transaction(self):
+        with self.lock:
+            self.refresh()
+            yield self
+
+    def compact(self):
+        with self.lock:
+            for collection in self._by_path.values():
+                collection.compact()
+
+    # Tüm veri dosyalarının (değişiklik zamanı, boyut) bilgisi
+    def _file_stamps(self):
+        stamps = {}
+        for collection in self._by_path.values():
+            for path in collection.files():
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    stamps[path] = None
+                else:
+                    stamps[path] = (stat.st_mtime_ns, stat.st_size)
+        return stamps
+
+    # Diğer süreçlerin yazdıklarını okur; sync() günlüğü geri oynatırken
+    # değişiklikler olay olarak yayınlanır. Açık pencereler bunu aralıkla
+    # çağırır; dosyalar son bakıştan beri değişmediyse kilit alınmaz.
+    def poll_changes(self):
+        stamps = self._file_stamps()
+        if stamps != self._stamps:
+            self._stamps = stamps
+            self.refresh()
+
+    # Önbelleğin geçerli olduğu koşullar: kod ve tüm veri dosyalarının
+    # boyutu / değişiklik zamanı kaydedildiği andakiyle aynı olmalı
+    def _cache_key(self):
+        modules = [
+            sys.modules[type(self).__module__],
+            availability,
+            events,
+            intervals,
+            search,
+            waitlist,
+        ]
+        return (
+            CACHE_VERSION,
+            sys.version_info[:2],
+            [os.stat(module.__file__).st_mtime_ns for module in modules],
+            self._file_stamps(),
+        )
+
+    # Bellekteki kayıtları ve indeksleri pickle ile kaydeder; yeniden
+    # açılışta dosyaları ayrıştırıp indeksleri kurmak yerine bu okunur.
+    # Önbellek yalnızca bu makinede yazılır (bkz. local_cache_path).
+    def save_cache(self):
+        with self.lock:
+            self.refresh()
+            # Dosyalar önbellek yazıldığından beri değişmediyse yazmaya gerek yok
+            try:
+                with open(self.cache_path, "rb") as f:
+                    if pickle.load(f) == self._cache_key():
+                        return
+            except (OSError, EOFError, pickle.UnpicklingError):
+                pass
+            state = {
+                name: value for name, value in self.__dict__.items() if name != "lock"
+            }
+            os.makedirs(os.path.dirname(self.cache_path), mode=0o700, exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(self._cache_key(), f, pickle.HIGHEST_PROTOCOL)
+                pickle.dump(state, f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_path)
+
+    # Önbellek geçerliyse bellekteki durumu onunla değiştirir. Diğer
+    # koleksiyon işlemlerinden önce (açılışta) çağrılmalıdır.
+    def load_cache(self):
+        with self.lock:
+            try:
+                with open(self.cache_path, "rb") as f:
+                    if pickle.load(f) != self._cache_key():
+                        return False
+                    # Çok sayıda küçük nesne: yükleme sırasında GC taraması
+                    # süreyi katlarca uzatır
+                    gc.disable()
+                    try:
+                        state = pickle.load(f)
+                    finally:
+                        gc.enable()
+            except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+                return False
+            self.__dict__.update(state)
+            for collection in self._by_path.values():
+                collection._lock = self.lock
+        return True
+
+    # Bugünden önceki tarihlerin çakışma kovalarını bellekten at
+    def evict_past(self, today=None):
+        today = normalize_date(today or datetime.date.today())
+        self.book_dates.evict_before(today)
+        # Tarihi geçmiş bekleyenler artık yer alamaz
+        with self.transaction():
+            for collection in (self.book_waitlist, self.table_waitlist):
+                stale = [entry for entry in collection if entry[2] < today]
+                if stale:
+                    collection.remove_many(stale)
+
+    # Rezervasyon çakışma kontrolleri
+    @metrics.timed("storage.check_book_conflict")
+    def check_book_conflict(self, book_name, date):
+        return self.book_dates.contains(book_name, normalize_date(date))
+
+    @metrics.timed("storage.check_table_conflict")
+    def check_table_conflict(self, table_id, date, start_time, end_time):
+        self.table_reservations.load()
+        return self.table_intervals.overlaps(
+            str(table_id),
+            normalize_date(date),
+            intervals.to_minutes(start_time),
+            intervals.to_minutes(end_time),
+        )
+
+    def free_table_slots(self, table_id, date):
+        self.table_reservations.load()
+        return [
+            (intervals.format_minutes(start), intervals.format_minutes(end))
+            for start, end in self.table_intervals.free_slots(
+                str(table_id), normalize_date(date)
+            )
+        ]
+
+    # D günü başlangıç-bitiş arası boş, kapasitesi en az min_capacity olan masalar
+    def free_tables(self, date, start_time, end_time, min_capacity=1):
+        self.tables.load()
+        self.table_reservations.load()
+        date = normalize_date(date)
+        start, end = intervals.to_minutes(start_time), intervals.to_minutes(end_time)
+        sure, edges = self.table_grid.busy(date, start, end)
+        free = self.table_capacities.at_least(min_capacity) & ~sure
+        return sorted(
+            (
+                table_id
+                for table_id in self.table_bits.tables(free)
+                if not (edges & self.table_bits.bit(table_id))
+                or not self.table_intervals.overlaps(table_id, date, start, end)
+            ),
+            key=_table_order,
+        )
+
+    # Isı haritası satırları: (masa, kapasite, dilim başına "0"/"1")
+    def table_availability(self, date):
+        self.table_reservations.load()
+        tables = sorted(self.tables.all(), key=lambda table: _table_order(table[0]))
+        rows = self.table_grid.day_rows(normalize_date(date), [t[0] for t in tables])
+        return [(table[0], table[1], rows[table[0]]) for table in tables]
+
+    # Masa sırasıyla masa -> (kapasite, o günkü dolu aralıklar); table_ids
+    # verilirse yalnızca onlar (masa yerleştirme, bkz. allocation)
+    def day_tables(self, date, table_ids=None):
+        self.tables.load()
+        self.table_reservations.load()
+        date = normalize_date(date)
+        if table_ids is None:
+            table_ids = sorted((table[0] for table in self.tables), key=_table_order)
+        return {
+            table_id: (
+                availability.capacity(self.tables.get(table_id)),
+                self.table_intervals.intervals(table_id, date),
+            )
+            for table_id in table_ids
+        }
+
+    # Kitap adı/yazarda önekli arama: (toplam, ilk limit kayıt)
+    def search_books(self, query, limit=100):
+        return self.book_search.search(query, limit)
+
+    # Tarihi verilen günden önce olan rezervasyonlar (arşivleme için)
+    def reservations_before(self, collection, date):
+        date = normalize_date(date)
+        return [res for res in collection if res[2] < date]
+
+    def user_reservations(self, collection, student_id):
+        collection.load()
+        return self._by_student[collection.path].records(student_id)
+
+    # Rezervasyonu (ya da bekleme kaydını) kalıcı kimliğiyle iptal eder;
+    # silinen kaydı (yoksa None) döndürür. student_id verilirse yalnızca o
+    # öğrencinin kaydı silinir. Boşalan kitap günü / masa saati aynı işlem
+    # içinde sıradaki bekleyenlere verilir.
+    def cancel_reservation(self, collection, reservation_id, student_id=None):
+        with self.transaction():
+            reservation = collection.get(str(reservation_id))
+            if reservation is None or student_id not in (None, reservation[0]):
+                return None
+            if not collection.remove(reservation):
+                return None
+            if collection is self.book_reservations:
+                promoted = self._promote_book(*reservation[1:3])
+            elif collection is self.table_reservations:
+                promoted = self._promote_tables(*reservation[1:3])
+            else:
+                promoted = []
+            if promoted:
+                metrics.count("waitlist_promotions_total", len(promoted))
+        return reservation
+
+    # Bekleme listesine ekler; kaynak şu an boşsa doğrudan rezerve eder.
+    # (rezervasyon, bekleme kaydı) döner, biri None'dır. Öğrenci aynı
+    # kaynağı zaten bekliyorsa ikisi de None.
+    def wait_for_book(
+        self, student_id, book_name, date, priority=waitlist.DEFAULT_PRIORITY
+    ):
+        date = normalize_date(date)
+        with self.transaction():
+            self.book_waitlist.load()
+            if not self.check_book_conflict(book_name, date):
+                reservation = (student_id, book_name, date)
+                return self.book_reservations.insert(reservation), None
+            queued = self.book_queue.waiting((book_name, date))
+            if any(entry[0] == student_id for entry in queued):
+                return None, None
+            return None, self.book_waitlist.insert(
+                (student_id, book_name, date, priority)
+            )
+
+    def wait_for_table(
+        self,
+        student_id,
+        table_id,
+        date,
+        start_time,
+        end_time,
+        priority=waitlist.DEFAULT_PRIORITY,
+    ):
+        slot = (str(table_id), normalize_date(date), start_time, end_time)
+        with self.transaction():
+            self.table_waitlist.load()
+            if not self.check_table_conflict(*slot):
+                return self.table_reservations.insert((student_id,) + slot), None
+            queued = self.table_queue.waiting(slot)
+            if any(entry[0] == student_id for entry in queued):
+                return None, None
+            return None, self.table_waitlist.insert((student_id,) + slot + (priority,))
+
+    # Sıradaki bekleyen rezervasyona dönüştürülür. Önce bekleme kaydı silinir:
+    # arada çökülürse öğrenci sırasını kaybeder ama çift rezervasyon oluşmaz.
+    def _promote(self, waiting, reservations, waiter):
+        waiting.remove(waiter)
+        return reservations.insert(waiter[: reservations.fields])
+
+    def _promote_book(self, book_name, date):
+        self.book_waitlist.load()
+        waiter = self.book_queue.first((book_name, date))
+        if waiter is None or self.check_book_conflict(book_name, date):
+            return []
+        return [self._promote(self.book_waitlist, self.book_reservations, waiter)]
+
+    # Masada yalnızca her saat aralığının başındaki bekleyene bakılır (aynı
+    # aralığı bekleyen diğerleri de sığmaz); sığanlardan en öndeki alır,
+    # sığan kalmayana kadar tekrarlanır
+    def _promote_tables(self, table_id, date):
+        self.table_waitlist.load()
+        promoted = []
+        while True:
+            heads = [
+                self.table_queue.first(key)
+                for key in self.table_queue.keys((table_id, date))
+            ]
+            fits = [w for w in heads if not self.check_table_conflict(*w[1:5])]
+            if not fits:
+                return promoted
+            waiter = min(fits, key=waitlist.order)
+            promoted.append(
+                self._promote(self.table_waitlist, self.table_reservations, waiter)
+            )
+
+    # Kontrol + yazma işlemleri; çakışma varsa None döner
+    def register_user(self, student_id, password):
+        with self.transaction():
+            if self.users.contains(student_id):
+                return None
+            return self.users.insert((student_id, password))
+
+    # Kullanıcının parola alanını değiştirir (ör. özete yükseltme)
+    def update_user_password(self, student_id, password):
+        with self.transaction():
+            user = self.users.get(student_id)
+            if user is None:
+                return None
+            return self.users.replace(user, (student_id, password) + tuple(user[2:]))
+
+    def add_table(self, capacity):
+        with self.transaction():
+            return self.tables.insert((next_table_id(self.tables), capacity))
+
+    def reserve_book(self, student_id, book_name, date):
+        date = normalize_date(date)
+        with self.transaction():
+            if self.check_book_conflict(book_name, date):
+                return None
+            return self.book_reservations.insert((student_id, book_name, date))
+
+    def reserve_table(self, student_id, table_id, date, start_time, end_time):
+        date = normalize_date(date)
+        with self.transaction():
+            if self.check_table_conflict(table_id, date, start_time, end_time):
+                return None
+            return self.table_reservations.insert(
+                (student_id, table_id, date, start_time, end_time)
+            )
+
+    # Toplu rezervasyon: tüm istekler tek geçişte indekse ve birbirine karşı
+    # kontrol edilir. Biri bile çakışırsa hiçbiri yazılmaz; aksi hâlde hepsi
+    # günlüğe tek grup olarak eklenir. (kayıtlar, çakışan sıra numaraları) döner.
+    def reserve_books(self, student_id, items):
+        items = [(book_name, normalize_date(date)) for book_name, date in items]
+        with self.transaction():
+            seen, conflicts = set(), []
+            for i, item in enumerate(items):
+                if item in seen or self.check_book_conflict(*item):
+                    conflicts.append(i)
+                seen.add(item)
+            if conflicts:
+                return [], conflicts
+            return self.book_reservations.insert_group(
+                [(student_id,) + item for item in items]
+            ), []
+
+    def reserve_tables(self, student_id, items):
+        records = [
+            (student_id, str(table_id), normalize_date(date), start_time, end_time)
+            for table_id, date, start_time, end_time in items
+        ]
+        with self.transaction():
+            batch = intervals.IntervalIndex()
+            conflicts = []
+            for i, record in enumerate(records):
+                span = (
+                    record[1],
+                    record[2],
+                    intervals.to_minutes(record[3]),
+                    intervals.to_minutes(record[4]),
+                )
+                if self.check_table_conflict(*record[1:]) or batch.overlaps(*span):
+                    conflicts.append(i)
+                batch.add(i, record)
+            if conflicts:
+                return [], conflicts
+            return self.table_reservations.insert_group(records), []
+
+
+# Yeni masaya verilecek numara: en büyük sayısal numaranın bir fazlası
+# (silinen masalar yüzünden kayıt sayısı + 1 mevcut bir masayla çakışabilir)
+def next_table_id(tables):
+    return max((int(table[0]) for table in tables if table[0].isdigit()), default=0) + 1
+
+
+# Masa numaraları sayısal sırayla listelenir ("10", "9"dan sonra gelir)
+def _table_order(table_id):
+    return (0, int(table_id), "") if table_id.isdigit() else (1, 0, table_id)
+
+
+# Depolama türleri: .txt dosyaları, SQLite, sabit genişlikli ikili dosyalar
+BACKENDS = ("text", "sqlite", "binary")
+
+
+# Klasördeki veritabanını seçilen depolama türüyle açar. import_text verilirse
+# SQLite / ikili depo ilk kez açılırken mevcut .txt verileri bir kez aktarılır
+# (hem masaüstü uygulaması hem sunucu ilk açılışta aynı veriyle başlar).
+def open_store(folder, backend="text", import_text=False):
+    paths = dict(
+        users=os.path.join(folder, "users.txt"),
+        books=os.path.join(folder, "books.txt"),
+        tables=os.path.join(folder, "tables.txt"),
+        book_reservations=os.path.join(folder, "book_reservations.txt"),
+        table_reservations=os.path.join(folder, "table_reservations.txt"),
+    )
+    if backend == "sqlite":
+        import sqlite_store
+
+        db_path = os.path.join(folder, "library.db")
+        first_start = not os.path.exists(db_path)
+        store = sqlite_store.SqliteStore(db_path, **paths)
+    elif backend == "binary":
+        import binfile
+
+        first_start = not os.path.exists(os.path.join(folder, "users.bin"))
+        store = binfile.BinaryStore(**paths)
+    else:
+        return Store(**paths)
+    if import_text and first_start:
+        os.makedirs(folder, exist_ok=True)
+        store.import_text_files()
+    return store
@@ -0,0 +1,112 @@
+import argparse
+import multiprocessing
+import random
+import sys
+import tempfile
+
+import intervals
+import storage
+
+DATES = ["2026-01-05", "2026-01-06"]
+BOOKS = [f"Kitap {i}" for i in range(5)]
+TABLES = ["1", "2", "3"]
+
+
+def open_store(backend, folder):
+    store = storage.open_store(folder, backend)
+    if backend != "text":
+        return store
+    # Katlama da yarışın içinde sınansın
+    store.book_reservations.compact_threshold = 25
+    store.table_reservations.compact_threshold = 25
+    return store
+
+
+# Her süreç kendi deposunu açar ve rastgele rezervasyon dener;
+# başarılı olan her yazma sonradan doğrulanmak üzere geri döndürülür.
+def worker(args):
+    backend, folder, worker_id, iterations = args
+    rng = random.Random(worker_id)
+    store = open_store(backend, folder)
+    done = {"users": [], "books": [], "tables": []}
+    for i in range(iterations):
+        student_id = f"{worker_id}-{i}"
+        if store.register_user(student_id, "sifre") is not None:
+            done["users"].append(student_id)
+        res = store.reserve_book(student_id, rng.choice(BOOKS), rng.choice(DATES))
+        if res is not None:
+            done["books"].append(res)
+        start = rng.randrange(8 * 60, 20 * 60, 30)
+        res = store.reserve_table(
+            student_id,
+            rng.choice(TABLES),
+            rng.choice(DATES),
+            intervals.format_minutes(start),
+            intervals.format_minutes(start + rng.choice((30, 60, 90))),
+        )
+        if res is not None:
+            done["tables"].append(res)
+        # Toplu rezervasyon: aynı masa her iki günde de (ya hepsi ya hiçbiri)
+        start = rng.randrange(8 * 60, 20 * 60, 30)
+        slot = (intervals.format_minutes(start), intervals.format_minutes(start + 30))
+        reserved, _ = store.reserve_tables(
+            student_id, [(rng.choice(TABLES), date) + slot for date in DATES]
+        )
+        done["tables"] += reserved
+    return done
+
+
+def check(store, results):
+    errors = []
+    users = {user[0] for user in store.users.all()}
+    books = store.book_reservations.all()
+    tables = store.table_reservations.all()
+    for done in results:
+        errors += [f"kayıp kullanıcı: {u}" for u in done["users"] if u not in users]
+        errors += [f"kayıp kitap rezervasyonu: {r}" for r in done["books"] if r not in books]
+        errors += [f"kayıp masa rezervasyonu: {r}" for r in done["tables"] if r not in tables]
+    seen = set()
+    for res in books:
+        if (res[1], res[2]) in seen:
+            errors.append(f"çift kitap rezervasyonu: {res}")
+        seen.add((res[1], res[2]))
+    slots = {}
+    for res in tables:
+        slots.setdefault((res[1], res[2]), []).append(
+            (intervals.to_minutes(res[3]), intervals.to_minutes(res[4]))
+        )
+    for key, busy in slots.items():
+        busy.sort()
+        for (_, prev_end), (start, _) in zip(busy, busy[1:]):
+            if start < prev_end:
+                errors.append(f"çift masa rezervasyonu: {key}")
+    return errors, len(users), len(books), len(tables)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Aynı veritabanı klasöründe çok süreçli rezervasyon yarışı"
+    )
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--backend", choices=storage.BACKENDS, default="text")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        jobs = [(args.backend, folder, n, args.iterations) for n in range(args.processes)]
+        with multiprocessing.Pool(args.processes) as pool:
+            results = pool.map(worker, jobs)
+        errors, users, books, tables = check(open_store(args.backend, folder), results)
+
+    print(
+        f"{args.processes} süreç x {args.iterations} deneme: "
+        f"{users} kullanıcı, {books} kitap, {tables} masa rezervasyonu"
+    )
+    for error in errors:
+        print(error)
+    print("Hata yok." if not errors else f"{len(errors)} hata!")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
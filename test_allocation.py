@@ -0,0 +1,19 @@
+import unittest
+
+import allocation
+
+
+class ScheduleTest(unittest.TestCase):
+    # Eski dosyalardan gelen çakışan aralıklar tek aralık sayılır
+    def test_overlapping_busy_intervals(self):
+        schedule = allocation.Schedule(4, [(9 * 60, 12 * 60), (10 * 60, 10 * 60 + 30)])
+        self.assertFalse(schedule.fits(11 * 60, 11 * 60 + 30))
+        self.assertTrue(schedule.fits(12 * 60, 13 * 60))
+        assigned, rejected = allocation.pack(
+            {"1": schedule}, [(2, 11 * 60, 11 * 60 + 30)], "first_fit"
+        )
+        self.assertEqual((assigned, rejected), ({}, [0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
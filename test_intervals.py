@@ -0,0 +1,75 @@
+import datetime
+import os
+import tempfile
+import unittest
+
+import intervals
+import service
+import storage
+
+
+def record(table_id, date, start, end):
+    return ("s1", table_id, date, start, end)
+
+
+class IntervalIndexTest(unittest.TestCase):
+    def test_overlap_behind_shorter_predecessor(self):
+        index = intervals.IntervalIndex()
+        index.add(1, record("1", "2026-10-20", "09:00", "12:00"))
+        index.add(2, record("1", "2026-10-20", "10:00", "10:30"))
+        start, end = intervals.to_minutes("11:00"), intervals.to_minutes("11:30")
+        self.assertTrue(index.overlaps("1", "2026-10-20", start, end))
+        start = intervals.to_minutes("10:45")
+        self.assertTrue(index.overlaps("1", "2026-10-20", start, end))
+        self.assertFalse(index.overlaps("1", "2026-10-20", 12 * 60, 13 * 60))
+
+    def test_discard_updates_max_end(self):
+        index = intervals.IntervalIndex()
+        long_one = record("1", "2026-10-20", "09:00", "12:00")
+        index.add(1, long_one)
+        index.add(2, record("1", "2026-10-20", "10:00", "10:30"))
+        index.discard(1, long_one)
+        self.assertFalse(index.overlaps("1", "2026-10-20", 11 * 60, 11 * 60 + 30))
+        self.assertTrue(index.overlaps("1", "2026-10-20", 10 * 60, 10 * 60 + 15))
+
+
+# Eski sürümün yazdığı, aynı masada çakışan kimliksiz satırlar
+class LegacyOverlapTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+        self.date = (datetime.date.today() + datetime.timedelta(days=2)).isoformat()
+        path = lambda name: os.path.join(self.folder.name, name + ".txt")
+        for name in ("users", "books", "book_reservations"):
+            open(path(name), "w").close()
+        with open(path("tables"), "w") as f:
+            f.write("1,4\n")
+        with open(path("table_reservations"), "w") as f:
+            f.write(f"s1,1,{self.date},09:00,12:00\n")
+            f.write(f"s2,1,{self.date},10:00,10:30\n")
+
+    def check(self, backend):
+        store = storage.open_store(self.folder.name, backend)
+        if backend != "text":
+            store.import_text_files()
+        library = service.LibraryService(store, limits=False)
+        for start in ("11:00", "10:45"):
+            self.assertTrue(
+                library.check_table_conflict("1", self.date, start, "11:30")
+            )
+        with self.assertRaises(service.ConflictError):
+            library.reserve_table("s3", "1", self.date, "11:00", "11:30")
+        self.assertEqual(library.free_tables(self.date, "11:00", "11:30"), [])
+
+    def test_text(self):
+        self.check("text")
+
+    def test_binary(self):
+        self.check("binary")
+
+    def test_sqlite(self):
+        self.check("sqlite")
+
+
+if __name__ == "__main__":
+    unittest.main()
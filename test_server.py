@@ -0,0 +1,131 @@
+import asyncio
+import datetime
+import os
+import socket
+import tempfile
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from unittest import mock
+
+import client
+import security
+import server
+import service
+import storage
+
+
+# HTTP sunucusu arka planda çalışır; istemciler gerçek RemoteService'tir
+class AuthTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.folder = tempfile.TemporaryDirectory()
+        for name in ("users", "books", "tables", "book_reservations"):
+            open(os.path.join(cls.folder.name, name + ".txt"), "w").close()
+        open(os.path.join(cls.folder.name, "table_reservations.txt"), "w").close()
+        store = storage.open_store(cls.folder.name)
+        security.set_admin(
+            os.path.join(cls.folder.name, security.ADMIN_FILE), "yonetici", "gizli", 1
+        )
+        library = service.LibraryService(store, password_iterations=1, limits=False)
+        for student_id in ("s1", "s2"):
+            library.register_user(student_id, "sifre")
+        library.add_book("Kitap", "Yazar")
+        library.add_book("1984", "Orwell")
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        cls.library = library
+        app = server.ReservationServer(library)
+        threading.Thread(
+            target=lambda: asyncio.run(app.serve("127.0.0.1", port)), daemon=True
+        ).start()
+        cls.url = f"http://127.0.0.1:{port}"
+        cls.date = (datetime.date.today() + datetime.timedelta(days=1)).isoformat()
+        for _ in range(50):
+            try:
+                socket.create_connection(("127.0.0.1", port)).close()
+                break
+            except OSError:
+                threading.Event().wait(0.05)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.folder.cleanup()
+
+    def student(self, student_id):
+        remote = client.RemoteService(self.url)
+        remote.login(student_id, "sifre")
+        return remote
+
+    def test_calls_require_a_session(self):
+        anonymous = client.RemoteService(self.url)
+        with self.assertRaises(service.AuthError):
+            anonymous.add_table(4)
+        with self.assertRaises(service.AuthError):
+            anonymous.list_books()
+
+    def test_admin_methods_reject_students(self):
+        with self.assertRaises(service.ForbiddenError):
+            self.student("s1").add_table(4)
+        admin = client.RemoteService(self.url)
+        admin.admin_login("yonetici", "gizli")
+        table = admin.add_table(4)
+        self.assertTrue(admin.delete_table(table))
+
+    def test_student_id_comes_from_the_session(self):
+        s1, s2 = self.student("s1"), self.student("s2")
+        reservation = s1.reserve_book("s2", "Kitap", self.date)
+        self.assertEqual(reservation[0], "s1")
+        self.assertFalse(s2.cancel_reservation("book", reservation[-1]))
+        self.assertTrue(s1.cancel_reservation("book", reservation[-1]))
+
+    # JSON sayısı olarak gelen numara ve adlar metin kayıtlarla çakışmalı
+    def test_numeric_params_hit_the_same_records(self):
+        anonymous = client.RemoteService(self.url)
+        anonymous.register_user("123", "sifre")
+        with self.assertRaises(service.ConflictError):
+            anonymous.register_user(123, "baska")
+        s1, s2 = self.student("s1"), self.student("s2")
+        reservation = s1.reserve_book("s1", "1984", self.date)
+        with self.assertRaises(service.ConflictError):
+            s2.reserve_book("s2", 1984, self.date)
+        self.assertTrue(s1.cancel_reservation("book", int(reservation[-1])))
+
+    def test_metrics_endpoint_requires_admin(self):
+        def scrape(token):
+            request = urllib.request.Request(self.url + "/metrics")
+            if token:
+                request.add_header("Authorization", f"Bearer {token}")
+            with urllib.request.urlopen(request) as response:
+                return response.read().decode()
+
+        for token in (None, self.student("s1").token):
+            with self.assertRaises(urllib.error.HTTPError):
+                scrape(token)
+        admin = client.RemoteService(self.url)
+        admin.admin_login("yonetici", "gizli")
+        self.assertIn("library_rows", scrape(admin.token))
+
+    def test_unexpected_errors_return_500(self):
+        admin = client.RemoteService(self.url)
+        admin.admin_login("yonetici", "gizli")
+        with mock.patch.object(
+            self.library, "list_tables", side_effect=OSError("disk")
+        ), mock.patch("traceback.print_exc"):
+            with self.assertRaisesRegex(service.ServiceError, "Sunucu hatası"):
+                admin.list_tables()
+        self.assertTrue(admin.list_tables() is not None)
+
+    def test_logout_revokes_the_token(self):
+        remote = self.student("s1")
+        token = remote.token
+        remote.logout()
+        remote.token = token
+        with self.assertRaises(service.AuthError):
+            remote.list_books()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+import datetime
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import security
+import service
+import storage
+
+
+class ParseDateTest(unittest.TestCase):
+    def test_rejects_free_text_and_invalid_dates(self):
+        for value in ("yarın", "2026-13-01", "31.02.2026", ""):
+            with self.assertRaises(service.ServiceError):
+                service.parse_date(value)
+
+    def test_normalizes_both_formats(self):
+        self.assertEqual(service.parse_date("19.10.2026"), "2026-10-19")
+        self.assertEqual(service.parse_date("2026-10-19"), "2026-10-19")
+
+    def test_booking_window(self):
+        today = datetime.date.today()
+        last = today + datetime.timedelta(days=service.BOOKING_DAYS)
+        for day in (today, last):
+            self.assertEqual(service.parse_booking_date(day), day.isoformat())
+        for day in (today - datetime.timedelta(days=1), last + datetime.timedelta(1)):
+            with self.assertRaises(service.ServiceError):
+                service.parse_booking_date(day)
+
+
+# admins.txt yoksa varsayılan bir admin hesabı oluşmamalı
+class AdminSetupTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+        store = storage.open_store(self.folder.name)
+        self.library = service.LibraryService(store, password_iterations=1)
+        self.path = os.path.join(self.folder.name, security.ADMIN_FILE)
+
+    @mock.patch.dict(os.environ, {}, clear=True)
+    def test_no_default_admin(self):
+        with self.assertRaises(service.ServiceError):
+            self.library.admin_login("admin", "admin123")
+        self.assertFalse(os.path.exists(self.path))
+
+    @mock.patch.dict(
+        os.environ, {"LIBRARY_ADMIN_USER": "yonetici", "LIBRARY_ADMIN_PASSWORD": "x"}
+    )
+    def test_bootstrap_from_environment(self):
+        self.assertEqual(self.library.admin_login("yonetici", "x"), "yonetici")
+        self.assertTrue(os.path.exists(self.path))
+
+
+class WriteLimitTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+        store = storage.open_store(self.folder.name)
+        self.library = service.LibraryService(store, password_iterations=1)
+
+    # İptal ve sıradan çıkma da öğrencinin yazma kovasından jeton alır
+    def test_cancel_and_leave_waitlist_are_limited(self):
+        capacity = service.RATE_LIMITS[("write", "student")][0]
+        for i in range(capacity // 2):
+            self.assertFalse(self.library.cancel_reservation("book", i, "s1"))
+            self.assertFalse(self.library.leave_waitlist("book", i, "s1"))
+        with self.assertRaises(service.RateLimitError):
+            self.library.cancel_reservation("book", 0, "s1")
+        with self.assertRaises(service.RateLimitError):
+            self.library.leave_waitlist("table", 0, "s1")
+        self.assertFalse(self.library.cancel_reservation("book", 0, "s2"))
+
+
+# Arayüzün listelemediği kitap ve masalar reddedilir
+class UnknownResourceTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+        store = storage.open_store(self.folder.name)
+        self.library = service.LibraryService(store, limits=False)
+        self.library.add_book("Kitap", "Yazar")
+        self.table = self.library.add_table(4)[0]
+        self.date = (datetime.date.today() + datetime.timedelta(days=1)).isoformat()
+
+    def test_unknown_book(self):
+        with self.assertRaises(service.ServiceError):
+            self.library.reserve_book("s1", "Olmayan Kitap", self.date)
+        with self.assertRaises(service.ServiceError):
+            self.library.wait_for_book("s1", "Olmayan Kitap", self.date)
+        with self.assertRaises(service.ServiceError):
+            self.library.reserve_batch(
+                "s1", "book", [("Kitap", self.date), ("Olmayan Kitap", self.date)]
+            )
+        self.assertTrue(self.library.reserve_book("s1", "Kitap", self.date))
+
+    def test_unknown_table(self):
+        with self.assertRaises(service.ServiceError):
+            self.library.reserve_table("s1", "999", self.date, "10:00", "11:00")
+        with self.assertRaises(service.ServiceError):
+            self.library.wait_for_table("s1", "999", self.date, "10:00", "11:00")
+        self.assertTrue(
+            self.library.reserve_table("s1", self.table, self.date, "10:00", "11:00")
+        )
+
+
+# Önekli arama Türkçe harfleri katlar: "isik" "Işık"ı, "ilh" "İlhan"ı bulur
+class SearchBooksTest(unittest.TestCase):
+    BOOKS = (
+        ("Işık Yolu", "Ömer Şahin"),
+        ("Kayıp Sessiz Gece", "İlhan Ünal"),
+        ("Eski Defter", "Ali Çelik"),
+    )
+
+    def check(self, backend):
+        with tempfile.TemporaryDirectory() as folder:
+            store = storage.open_store(folder, backend)
+            library = service.LibraryService(store, limits=False)
+            for book in self.BOOKS:
+                library.add_book(*book)
+
+            def names(query, limit=100):
+                return [row[0] for row in library.search_books(query, limit)["rows"]]
+
+            self.assertEqual(names("isik"), ["Işık Yolu"])
+            self.assertEqual(names("IŞI"), ["Işık Yolu"])
+            self.assertEqual(names("omer sah"), ["Işık Yolu"])
+            self.assertEqual(names("ilh"), ["Kayıp Sessiz Gece"])
+            self.assertEqual(names("kay se"), ["Kayıp Sessiz Gece"])
+            self.assertEqual(names("celik"), ["Eski Defter"])
+            self.assertEqual(names("kay yol"), [])
+            self.assertEqual(library.search_books("", 2)["total"], 3)
+            self.assertEqual(len(names("", 2)), 2)
+            book = library.search_books("isik")["rows"][0]
+            self.assertTrue(library.delete_book(book))
+            self.assertEqual(names("isik"), [])
+
+    def test_text(self):
+        self.check("text")
+
+    def test_binary(self):
+        self.check("binary")
+
+    def test_sqlite(self):
+        self.check("sqlite")
+
+
+# İptal edilen kitap günü / masa saati aynı işlemde sıradakine geçer
+class WaitlistTest(unittest.TestCase):
+    def check(self, backend):
+        with tempfile.TemporaryDirectory() as folder:
+            store = storage.open_store(folder, backend)
+            library = service.LibraryService(store, limits=False)
+            library.add_book("Kitap", "Yazar")
+            table = library.add_table(4)[0]
+            date = (datetime.date.today() + datetime.timedelta(days=1)).isoformat()
+
+            # Boş kitap beklenmez, doğrudan ayrılır
+            taken = library.wait_for_book("s1", "Kitap", date)["reservation"]
+            self.assertIsNotNone(taken)
+            self.assertIsNotNone(library.wait_for_book("s2", "Kitap", date)["waiting"])
+            library.wait_for_book("s3", "Kitap", date, priority=0)
+            with self.assertRaises(service.ConflictError):
+                library.wait_for_book("s2", "Kitap", date)
+            self.assertTrue(library.cancel_reservation("book", taken[-1], "s1"))
+            self.assertEqual(
+                [res[0] for res in library.list_reservations("book")], ["s3"]
+            )
+            self.assertEqual(library.user_waitlist("book", "s3"), [])
+            self.assertEqual(len(library.user_waitlist("book", "s2")), 1)
+
+            booked = library.reserve_table("s1", table, date, "10:00", "12:00")
+            for student_id, start, end in (
+                ("s2", "10:00", "11:00"),
+                ("s3", "11:00", "12:00"),
+                ("s4", "10:30", "11:30"),
+            ):
+                library.wait_for_table(student_id, table, date, start, end)
+            entry = library.user_waitlist("table", "s4")[0]
+            self.assertTrue(library.leave_waitlist("table", entry[-1], "s4"))
+            self.assertTrue(library.cancel_reservation("table", booked[-1]))
+            promoted = library.user_reservations("table", "s2")
+            promoted += library.user_reservations("table", "s3")
+            spans = [res[3:5] for res in promoted]
+            self.assertEqual(spans, [("10:00", "11:00"), ("11:00", "12:00")])
+            self.assertEqual(library.user_waitlist("table", "s2"), [])
+
+    def test_text(self):
+        self.check("text")
+
+    def test_binary(self):
+        self.check("binary")
+
+    def test_sqlite(self):
+        self.check("sqlite")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,236 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import bulk
+import security
+import service
+import storage
+
+
+# Aynı dosyayı açan iki koleksiyon iki kiosk gibidir
+class JournalTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+        self.path = os.path.join(self.folder.name, "book_reservations.txt")
+
+    def open(self, compact_threshold=1000):
+        return storage.JournalCollection(
+            self.path, compact_threshold=compact_threshold, fields=3
+        )
+
+    def test_other_process_replays_the_log(self):
+        first, second = self.open(), self.open()
+        a = first.insert(("s1", "Kitap", "2026-10-20"))
+        b = first.insert(("s2", "Kitap", "2026-10-21"))
+        first.remove(a)
+        self.assertEqual(second.all(), [b])
+        c = second.insert(("s3", "Kitap", "2026-10-22"))
+        self.assertEqual(len({a[-1], b[-1], c[-1]}), 3)
+        first.refresh()
+        self.assertEqual(first.all(), [b, c])
+
+    def test_compaction_keeps_records_and_ids(self):
+        collection = self.open(compact_threshold=3)
+        records = [
+            collection.insert(("s1", "Kitap", f"2026-10-2{i}")) for i in range(5)
+        ]
+        collection.remove(records[0])
+        with open(self.path) as f:
+            self.assertTrue(f.readline().startswith("#lsn,"))
+        self.assertLess(os.path.getsize(collection.log_path), 100)
+        reopened = self.open()
+        self.assertEqual(reopened.all(), records[1:])
+        added = reopened.insert(("s2", "Kitap", "2026-10-29"))
+        self.assertNotIn(added[-1], [record[-1] for record in records])
+
+    # Görüntü yazıldı ama günlük boşaltılamadan çökülürse kayıtlar iki kez
+    # uygulanmamalı
+    def test_log_entries_before_snapshot_lsn_are_skipped(self):
+        collection = self.open()
+        records = [
+            collection.insert(("s1", "Kitap", f"2026-10-2{i}")) for i in range(3)
+        ]
+        with open(collection.log_path) as f:
+            log = f.read()
+        collection.compact()
+        with open(collection.log_path, "w") as f:
+            f.write(log)
+        self.assertEqual(self.open().all(), records)
+
+    def test_torn_group_is_not_applied(self):
+        collection = self.open()
+        kept = collection.insert(("s1", "Kitap", "2026-10-20"))
+        with open(collection.log_path, "a") as f:
+            f.write("[,2\n9,+,s2,Kitap,2026-10-21,9\n")
+        reopened = self.open()
+        self.assertEqual(reopened.all(), [kept])
+        with open(collection.log_path) as f:
+            self.assertNotIn("[,2", f.read())
+
+
+class BulkImportIdTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+
+    # Toplu ekleme sonrası yeniden açılan depo, verilmiş kimlikleri
+    # tekrar vermemelidir (lsn başlığı son kimliği göstermeli)
+    def test_ids_unique_after_reopen(self):
+        store = storage.open_store(self.folder.name, "text")
+        first = store.books.insert(("Kitap 1", "Yazar"))
+        path = os.path.join(self.folder.name, "books.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("name,author\nKitap 2,Yazar\nKitap 3,Yazar\nKitap 4,Yazar\n")
+        bulk.import_file(store, "books", path)
+
+        store = storage.open_store(self.folder.name, "text")
+        added = store.books.insert(("Kitap 5", "Yazar"))
+        ids = [record[-1] for record in store.books.all()]
+        self.assertEqual(len(ids), 5)
+        self.assertEqual(len(set(ids)), 5)
+        self.assertGreater(int(added[-1]), int(first[-1]))
+
+
+class BulkTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+
+    def write(self, name, text):
+        path = os.path.join(self.folder.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def open(self, name, backend):
+        folder = os.path.join(self.folder.name, name)
+        os.makedirs(folder)
+        return storage.open_store(folder, backend)
+
+    def check_import(self, backend):
+        store = self.open(backend, backend)
+        store.books.insert(("Var Olan", "Yazar"))
+        path = self.write(
+            "books.csv",
+            "name,author\nYeni,Yazar\nVar Olan,Yazar\n,Yazarsız\nYeni,Başka\n",
+        )
+        stats = bulk.import_file(store, "books", path)
+        self.assertEqual(
+            [stats[key] for key in ("read", "imported", "duplicate", "invalid")],
+            [4, 1, 2, 1],
+        )
+        self.assertEqual(store.books.all()[-1][:2], ("Yeni", "Yazar"))
+        with self.assertRaises(ValueError):
+            bulk.import_file(store, "books", path, strict=True)
+        self.assertEqual(len(store.books), 2)
+
+        path = self.write("tables.jsonl", '{"capacity": 4}\n{"capacity": 2}\n')
+        bulk.import_file(store, "tables", path)
+        tables = [table[:2] for table in store.tables.all()]
+        self.assertEqual(tables, [("1", "4"), ("2", "2")])
+
+        path = self.write("users.jsonl", '{"student_id": "s1", "password": "sifre"}\n')
+        bulk.import_file(store, "users", path, password_iterations=1)
+        self.assertTrue(security.is_hashed(store.users.get("s1")[1]))
+        library = service.LibraryService(store, password_iterations=1, limits=False)
+        self.assertEqual(library.login("s1", "sifre"), "s1")
+
+        # Dışa aktarılan dosya boş bir depoya aynen geri yüklenir
+        for fmt in ("csv", "jsonl"):
+            out = os.path.join(self.folder.name, f"{backend}-books.{fmt}")
+            self.assertEqual(bulk.export_file(store, "books", out)["exported"], 2)
+            fresh = self.open(f"{backend}-{fmt}", backend)
+            bulk.import_file(fresh, "books", out)
+            self.assertEqual(
+                [book[:2] for book in fresh.books.all()],
+                [book[:2] for book in store.books.all()],
+            )
+
+    def test_text(self):
+        self.check_import("text")
+
+    def test_binary(self):
+        self.check_import("binary")
+
+    def test_sqlite(self):
+        self.check_import("sqlite")
+
+    # Satırlar okunurken geçici dosya zaten yazılıyor olmalı: içe aktarma
+    # dosyayı belleğe almadan akıtır
+    def test_import_streams_rows(self):
+        store = storage.open_store(self.folder.name, "text")
+        tmp_path = store.books.path + ".tmp"
+        seen = []
+
+        def rows(path, fmt):
+            for i in range(3):
+                seen.append(os.path.exists(tmp_path))
+                yield i + 2, {"name": f"Kitap {i}", "author": "Yazar"}
+
+        with mock.patch.object(bulk, "read_rows", rows):
+            bulk.import_file(store, "books", "kitaplar.csv")
+        self.assertEqual(seen, [True, True, True])
+        self.assertEqual(len(store.books), 3)
+
+
+# Aynı değerli iki satırdan yalnızca kimliği verilen silinir
+class RemoveByIdTest(unittest.TestCase):
+    def check(self, backend):
+        with tempfile.TemporaryDirectory() as folder:
+            store = storage.open_store(folder, backend)
+            first = store.books.insert(("Kitap", "Yazar"))
+            second = store.books.insert(("Kitap", "Yazar"))
+            self.assertTrue(store.books.remove(first))
+            self.assertEqual(store.books.all(), [second])
+
+    def test_text(self):
+        self.check("text")
+
+    def test_binary(self):
+        self.check("binary")
+
+    def test_sqlite(self):
+        self.check("sqlite")
+
+
+# Pickle önbelleği paylaşılan veritabanı klasörüne yazılmaz
+class LocalCacheTest(unittest.TestCase):
+    def test_cache_outside_database_folder(self):
+        folder, cache = tempfile.TemporaryDirectory(), tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.addCleanup(cache.cleanup)
+        with mock.patch.dict(os.environ, {"LIBRARY_CACHE_DIR": cache.name}):
+            store = storage.open_store(folder.name, "text")
+            store.books.insert(("Kitap", "Yazar"))
+            store.save_cache()
+            self.assertEqual(os.path.dirname(store.cache_path), cache.name)
+            self.assertFalse([n for n in os.listdir(folder.name) if "cache" in n])
+            fresh = storage.open_store(folder.name, "text")
+            self.assertTrue(fresh.load_cache())
+            self.assertEqual(len(fresh.books), 1)
+
+
+# SQLite / ikili depo ilk açılışta .txt verilerini bir kez aktarır
+class FirstStartImportTest(unittest.TestCase):
+    def check(self, backend):
+        with tempfile.TemporaryDirectory() as folder:
+            storage.open_store(folder, "text").books.insert(("Kitap", "Yazar"))
+            store = storage.open_store(folder, backend, import_text=True)
+            books = [book[:2] for book in store.books.all()]
+            self.assertEqual(books, [("Kitap", "Yazar")])
+            store.books.remove(store.books.all()[0])
+            store = storage.open_store(folder, backend, import_text=True)
+            self.assertEqual(store.books.all(), [])
+
+    def test_binary(self):
+        self.check("binary")
+
+    def test_sqlite(self):
+        self.check("sqlite")
+
+
+if __name__ == "__main__":
+    unittest.main()
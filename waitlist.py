@@ -0,0 +1,67 @@
+import heapq
+
+DEFAULT_PRIORITY = 1  # küçük sayı önce; aynı öncelikte ilk gelen önce
+
+
+# Bekleme kaydı: (öğrenci, kaynak alanları..., öncelik, kimlik).
+# Sıralama anahtarı önceliktir, eşitlikte kimlik (lsn sırası = geliş sırası).
+def order(record):
+    return int(record[-2]), int(record[-1])
+
+
+# Bekleme listesi indeksi: anahtar (ör. (kitap, tarih) ya da (masa, tarih,
+# başlangıç, bitiş)) başına bir yığın. Sıradaki bekleyen O(1) okunur, sıradan
+# çıkan O(log n) atılır. Silinen kayıtlar yığından hemen çıkarılmaz; başa
+# geldiklerinde ya da yığının yarısından fazlası ölü olunca temizlenir.
+# group verilirse aynı gruptaki anahtarlar (ör. bir masanın o günkü tüm
+# saat aralıkları) birlikte bulunabilir.
+class WaitQueue:
+    def __init__(self, key, group=None):
+        self.key = key
+        self.group = group
+        self._heaps = {}  # anahtar -> [(öncelik, kimlik, sıra no, kayıt)]
+        self._live = {}  # anahtar -> canlı sıra numaraları
+        self._groups = {}  # grup -> anahtarlar
+
+    def add(self, seq, record):
+        key = self.key(record)
+        heap = self._heaps.get(key)
+        if heap is None:
+            heap = self._heaps[key] = []
+            self._live[key] = set()
+            if self.group is not None:
+                self._groups.setdefault(self.group(record), set()).add(key)
+        heapq.heappush(heap, order(record) + (seq, record))
+        self._live[key].add(seq)
+
+    def discard(self, seq, record):
+        key = self.key(record)
+        live = self._live[key]
+        live.discard(seq)
+        heap = self._heaps[key]
+        if len(heap) > 2 * len(live):
+            heap[:] = [entry for entry in heap if entry[2] in live]
+            heapq.heapify(heap)
+        while heap and heap[0][2] not in live:
+            heapq.heappop(heap)
+        if not heap:
+            del self._heaps[key], self._live[key]
+            if self.group is not None:
+                keys = self._groups[self.group(record)]
+                keys.discard(key)
+                if not keys:
+                    del self._groups[self.group(record)]
+
+    # Sıradaki bekleyen (yoksa None)
+    def first(self, key):
+        heap = self._heaps.get(key)
+        return heap[0][3] if heap else None
+
+    def keys(self, group):
+        return list(self._groups.get(group, ()))
+
+    # Anahtardaki bekleyenler sırasıyla
+    def waiting(self, key):
+        live = self._live.get(key, ())
+        entries = sorted(self._heaps.get(key, ()))
+        return [entry[3] for entry in entries if entry[2] in live]
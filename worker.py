@@ -0,0 +1,121 @@
+import concurrent.futures
+import time
+import tkinter as tk
+from tkinter import ttk
+
+import events
+import metrics
+
+POLL_MS = 30
+WATCH_MS = 1000  # açık pencerelerin diğer süreçlerin yazdıklarına bakma aralığı
+
+# Tüm depolama çağrıları bu tek iş parçacığında sırayla çalışır; bellekteki
+# indeksler tek iş parçacığından değiştirildiği için ek kilide gerek kalmaz.
+EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="storage"
+)
+
+
+def _exists(widget):
+    try:
+        return bool(widget.winfo_exists())
+    except tk.TclError:
+        return False
+
+
+# fn'i arka planda çalıştırır; sonuç Tk iş parçacığına after() ile taşınır.
+# Pencere sonuç gelmeden kapanırsa geri çağrılar hiç çalıştırılmaz.
+def run(widget, fn, on_done=None, on_error=None):
+    started = time.perf_counter()
+    future = EXECUTOR.submit(fn)
+
+    def check():
+        if not _exists(widget):
+            return
+        if not future.done():
+            widget.after(POLL_MS, check)
+            return
+        # Kuyruk + çalışma + after() gecikmesi: kullanıcının beklediği süre
+        metrics.observe("ui.call", time.perf_counter() - started)
+        try:
+            result = future.result()
+        except Exception as e:
+            if on_error is None:
+                raise
+            on_error(e)
+        else:
+            if on_done is not None:
+                on_done(result)
+
+    widget.after(POLL_MS, check)
+    return future
+
+
+# run() ile aynı, ancak iş sürerken pencerede hareketli bir ilerleme
+# çubuğu gösterir ve verilen düğmeleri devre dışı bırakır.
+def run_with_progress(window, fn, on_done=None, on_error=None, buttons=()):
+    # place(), pencerenin pack/grid düzeninden bağımsızdır
+    progress = ttk.Progressbar(window, mode="indeterminate")
+    progress.place(relx=0, rely=1, relwidth=1, anchor="sw")
+    progress.start(10)
+    for button in buttons:
+        button.config(state=tk.DISABLED)
+
+    def finish(callback):
+        def handler(value):
+            progress.destroy()
+            for button in buttons:
+                if button.winfo_exists():
+                    button.config(state=tk.NORMAL)
+            if callback is not None:
+                callback(value)
+
+        return handler
+
+    return run(window, fn, finish(on_done), finish(on_error))
+
+
+# Pencere açık kaldıkça topics konularındaki olayları Tk iş parçacığına
+# taşır. load() ile abonelik aynı depolama görevinde yapılır; ilk görüntü
+# ile sonraki olaylar arasında değişiklik kaçmaz ya da iki kez gelmez.
+# on_changes net değişikliklerin listesini [(konu, işlem, kayıt)] alır;
+# RELOAD gelirse load() yeniden çalıştırılıp on_load çağrılır. poll
+# verilirse (ör. store.poll_changes) diğer süreçlerin yazdıkları da okunur.
+def watch(widget, topics, load, on_load, on_changes, on_error=None, poll=None):
+    mailbox = events.Mailbox()
+    subscriptions = []
+
+    def start():
+        result = load()
+        if not subscriptions:
+            subscriptions.append(events.subscribe(topics, mailbox.put))
+        return result
+
+    # Abonelik depolama iş parçacığında, start()'tan sonra kaldırılır
+    def stop():
+        for unsubscribe in subscriptions:
+            unsubscribe()
+        subscriptions.append(None)
+
+    def loaded(result):
+        on_load(result)
+        ready.append(True)
+
+    # İlk görüntü gelene kadar olaylar kutuda bekler
+    def deliver(elapsed=0):
+        if not _exists(widget):
+            EXECUTOR.submit(stop)
+            return
+        if poll is not None and elapsed >= WATCH_MS:
+            EXECUTOR.submit(poll)
+            elapsed = 0
+        changes = mailbox.drain() if ready else []
+        if any(op == events.RELOAD for _, op, _ in changes):
+            run(widget, start, on_load, on_error)
+        elif changes:
+            on_changes(changes)
+        widget.after(POLL_MS, deliver, elapsed + POLL_MS)
+
+    ready = []
+    widget.after(POLL_MS, deliver)
+    return run(widget, start, loaded, on_error)